@@ -0,0 +1,194 @@
+"""
+LLM 응답 캐시 모듈 (근무 희망 문장 분석용)
+- 키: 분석기 종류 + 프롬프트 버전 + 정규화된 요청 문장 + 년/월 + 부가 컨텍스트(주말/공휴일, 간호사 스키마 등)의 sha256
+- 값: 구조화 출력(shiftAnalyzer / preferenceAnalyzer 의 model_dump) + 생성 모델명 + 토큰 수
+- 로컬 SQLite 파일에 저장, TTL 만료 + 최대 항목 수 초과 시 오래 안 쓰인 항목부터 삭제
+- 적중률과 절약 토큰/비용(_compute_cost 결과 누적)은 /health/llm-cache 로 노출
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import unicodedata
+from typing import Dict, Optional
+
+_TRAILING_NOISE = re.compile(r"[\s.!?~…ㅎㅋㅠㅜ]+$")
+
+
+def normalize_request_text(text: str) -> str:
+    """같은 의미의 문장이 같은 키가 되도록 정규화 (NFKC, 소문자, 공백 축약, 끝 문장부호/ㅎㅎ 제거)"""
+    # NFKC 가 호환 자모(ㅎ)를 조합형 자모로 바꾸므로 끝 잡음은 정규화 전에 먼저 제거
+    text = _TRAILING_NOISE.sub("", str(text or ""))
+    text = unicodedata.normalize("NFKC", text).lower()
+    return _TRAILING_NOISE.sub("", " ".join(text.split()))
+
+
+def make_cache_key(kind: str, prompt_version: str, text: str, year: int, month: int, context=None) -> str:
+    payload = json.dumps(
+        [kind, prompt_version, normalize_request_text(text), int(year or 0), int(month or 0), context],
+        ensure_ascii=False, sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite 기반 LLM 구조화 응답 캐시 (프로세스 간 공유, 통계는 프로세스 단위)"""
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int, enabled: bool = True):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._ready = False
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+        self.saved_usd = 0.0
+        self.saved_krw = 0
+        self.by_kind: Dict[str, Dict[str, int]] = {}
+
+    def _connect(self):
+        if not self._ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " cache_key TEXT PRIMARY KEY, kind TEXT NOT NULL, model TEXT, response TEXT NOT NULL,"
+                " prompt_tokens INTEGER DEFAULT 0, completion_tokens INTEGER DEFAULT 0,"
+                " created_at REAL NOT NULL, last_access REAL NOT NULL, hit_count INTEGER DEFAULT 0)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_access ON llm_cache(last_access)")
+            self._ready = True
+        return conn
+
+    def _count(self, kind: str, field: str):
+        self.by_kind.setdefault(kind, {"hits": 0, "misses": 0})[field] += 1
+
+    def get(self, kind: str, key: str) -> Optional[Dict]:
+        """캐시 항목 조회 → {"response", "model", "prompt_tokens", "completion_tokens"} 또는 None"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                try:
+                    row = conn.execute(
+                        "SELECT response, model, prompt_tokens, completion_tokens, created_at"
+                        " FROM llm_cache WHERE cache_key = ?", (key,)
+                    ).fetchone()
+                    if row is not None and now - row[4] > self.ttl_seconds:
+                        conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+                        conn.commit()
+                        row = None
+                    if row is not None:
+                        conn.execute("UPDATE llm_cache SET last_access = ?, hit_count = hit_count + 1"
+                                     " WHERE cache_key = ?", (now, key))
+                        conn.commit()
+                finally:
+                    conn.close()
+                self._count(kind, "hits" if row is not None else "misses")
+                if row is None:
+                    self.misses += 1
+                    return None
+                self.hits += 1
+            return {"response": json.loads(row[0]), "model": row[1],
+                    "prompt_tokens": row[2], "completion_tokens": row[3]}
+        except Exception as e:
+            print(f"[llm_cache] 조회 실패: {e}")
+            return None
+
+    def set(self, kind: str, key: str, response: Dict, model: str, prompt_tokens: int = 0, completion_tokens: int = 0):
+        if not self.enabled:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                try:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO llm_cache (cache_key, kind, model, response, prompt_tokens,"
+                        " completion_tokens, created_at, last_access, hit_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                        (key, kind, model, json.dumps(response, ensure_ascii=False), int(prompt_tokens),
+                         int(completion_tokens), now, now),
+                    )
+                    self._writes += 1
+                    if self._writes % 100 == 1:
+                        self._evict(conn, now)
+                    conn.commit()
+                finally:
+                    conn.close()
+        except Exception as e:
+            print(f"[llm_cache] 저장 실패: {e}")
+
+    def _evict(self, conn, now: float):
+        conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        overflow = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            conn.execute("DELETE FROM llm_cache WHERE cache_key IN"
+                         " (SELECT cache_key FROM llm_cache ORDER BY last_access LIMIT ?)", (overflow,))
+
+    def record_saving(self, cost_info: Dict):
+        """적중으로 생략한 호출의 _compute_cost 결과를 누적"""
+        with self._lock:
+            self.saved_tokens += int(cost_info.get("usage", {}).get("total_tokens", 0))
+            self.saved_usd += float(cost_info.get("cost_usd", {}).get("total", 0.0))
+            self.saved_krw += int(cost_info.get("cost_krw", {}).get("total", 0))
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM llm_cache")
+                conn.commit()
+            finally:
+                conn.close()
+
+    def stats(self) -> Dict[str, object]:
+        entries = None
+        if self.enabled:
+            try:
+                with self._lock:
+                    conn = self._connect()
+                    try:
+                        entries = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+                    finally:
+                        conn.close()
+            except Exception:
+                entries = None
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "path": self.path,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "by_kind": {k: dict(v) for k, v in self.by_kind.items()},
+            "saved_tokens": self.saved_tokens,
+            "saved_cost_usd": round(self.saved_usd, 6),
+            "saved_cost_krw": self.saved_krw,
+        }
+
+
+llm_response_cache = LLMResponseCache(
+    path=os.getenv("LLM_CACHE_PATH", os.path.join(tempfile.gettempdir(), "roster_llm_cache.sqlite3")),
+    ttl_seconds=int(os.getenv("LLM_CACHE_TTL_SECONDS", str(90 * 24 * 3600))),
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000")),
+    enabled=os.getenv("LLM_CACHE_ENABLED", "1") == "1",
+)
+
+
+def get_llm_cache_stats() -> Dict[str, object]:
+    """LLM 응답 캐시 적중률/절약 토큰 통계"""
+    return llm_response_cache.stats()
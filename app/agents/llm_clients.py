@@ -0,0 +1,76 @@
+"""
+LLM 클라이언트 풀 모듈
+- ChatOpenAI / ChatAnthropic / ChatGoogleGenerativeAI 인스턴스를 프로세스 전역으로 1개씩만 만들어 재사용
+  (인스턴스가 보유한 SDK 클라이언트의 HTTP 커넥션 풀도 함께 공유된다)
+- with_structured_output 래퍼도 (모델, 출력 스키마) 단위로 캐시
+- 분석기들은 문장마다 클라이언트를 새로 만들지 않고 fallback_models() 로 같은 순서의 목록을 받아 사용
+"""
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from langchain_anthropic import ChatAnthropic
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_openai import ChatOpenAI
+
+# 1차 → 2차 → 3차 백업 순서 (provider, model)
+DEFAULT_FALLBACK_MODELS: List[Tuple[str, str]] = [
+    ("openai", "gpt-4.1-mini-2025-04-14"),
+    ("anthropic", "claude-3-7-sonnet-20250219"),
+    ("google", "gemini-2.0-flash"),
+]
+
+_clients: Dict[tuple, object] = {}
+_structured: Dict[tuple, object] = {}
+_lock = threading.Lock()
+
+
+def _create_client(provider: str, model: str, temperature: Optional[float]):
+    extra = {} if temperature is None else {"temperature": temperature}
+    if provider == "openai":
+        return ChatOpenAI(model=model, openai_api_key=os.getenv("OPENAI_API_KEY"), **extra)
+    if provider == "anthropic":
+        return ChatAnthropic(model=model, anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"), **extra)
+    if provider == "google":
+        return ChatGoogleGenerativeAI(model=model, google_api_key=os.getenv("GOOGLE_API_KEY"), **extra)
+    raise ValueError(f"지원하지 않는 LLM provider: {provider}")
+
+
+def get_chat_model(provider: str, model: str, temperature: Optional[float] = None):
+    """(provider, model, temperature) 별 공유 클라이언트를 반환 (최초 호출 시 생성)"""
+    key = (provider, model, temperature)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = _create_client(provider, model, temperature)
+    return client
+
+
+def get_structured_model(client, schema):
+    """client.with_structured_output(schema) 결과를 캐시해 재사용 (Runnable 은 상태가 없어 공유 가능)"""
+    key = (id(client), schema)
+    runnable = _structured.get(key)
+    if runnable is None:
+        with _lock:
+            runnable = _structured.get(key)
+            if runnable is None:
+                runnable = _structured[key] = client.with_structured_output(schema)
+    return runnable
+
+
+def fallback_models(models: Optional[List[Tuple[str, str]]] = None) -> list:
+    """백업 순서대로 공유 클라이언트 목록을 반환"""
+    return [get_chat_model(provider, model) for provider, model in (models or DEFAULT_FALLBACK_MODELS)]
+
+
+
+def model_label(client) -> str:
+    """클라이언트의 모델명 (ChatOpenAI 는 model_name 필드에 보관)"""
+    return getattr(client, "model", None) or getattr(client, "model_name", None) or type(client).__name__
+
+
+def structured_candidates(clients: list, schema) -> list:
+    """헤지 호출용 [(모델명, 구조화 출력 runnable), ...]"""
+    return [(model_label(client), get_structured_model(client, schema)) for client in clients]
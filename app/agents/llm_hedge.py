@@ -0,0 +1,197 @@
+"""
+LLM 헤지(hedged) 호출 모듈
+- 1차 모델을 먼저 호출하고, 그 모델의 지연 백분위(기본 p90)만큼 기다려도 응답이 없으면 다음 모델을 추가로 호출
+- 호출이 오류로 끝나면 다른 호출이 진행 중이어도 지연을 기다리지 않고 즉시 다음 모델을 호출 (기존 순차 fallback 의미 유지)
+- 헤지 지연 백분위는 성공뿐 아니라 실패·시간 초과 호출의 소요 시간도 포함해 계산 (느린 실패가 p90 을 낮추지 않게)
+- 가장 먼저 도착한 유효한 구조화 응답을 채택하고 나머지 호출은 취소
+- 모델별 지연 히스토그램/성공·실패·취소 수는 /health/llm-cache 로 노출
+- 후보는 ainvoke(messages) 를 가진 임의 객체면 되므로 로컬 fake 모델로 테스트 가능 (langchain 비의존)
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)
+
+HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.9"))
+HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "3.0"))   # 표본이 부족할 때 지연
+HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5"))
+HEDGE_MAX_DELAY = float(os.getenv("LLM_HEDGE_MAX_DELAY", "15.0"))
+HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+CALL_TIMEOUT = float(os.getenv("LLM_CALL_TIMEOUT", "60"))                  # 전체 호출 상한
+
+
+class LatencyHistogram:
+    """모델 1개의 응답 지연 분포 (고정 버킷 카운트 + 최근 표본으로 백분위 계산)"""
+
+    def __init__(self, window: int = 200):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.samples = deque(maxlen=window)
+        self.success = 0
+        self.failure = 0
+        self.timeout = 0
+        self.cancelled = 0
+        self.total_seconds = 0.0
+
+    def observe(self, seconds: float):
+        self.samples.append(seconds)
+        self.success += 1
+        self.total_seconds += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def observe_failure(self, seconds: float, timed_out: bool = False):
+        """실패/시간 초과 호출: 버킷(성공 지연 분포)에는 넣지 않고 백분위 표본에만 소요 시간을 남긴다"""
+        self.samples.append(seconds)
+        if timed_out:
+            self.timeout += 1
+        else:
+            self.failure += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, object]:
+        labels = [f"le_{b:g}s" for b in LATENCY_BUCKETS] + ["gt_%gs" % LATENCY_BUCKETS[-1]]
+        return {
+            "success": self.success,
+            "failure": self.failure,
+            "timeout": self.timeout,
+            "cancelled": self.cancelled,
+            "avg_seconds": round(self.total_seconds / self.success, 3) if self.success else None,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+_lock = threading.Lock()
+
+
+def _histogram(name: str) -> LatencyHistogram:
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = LatencyHistogram()
+        return hist
+
+
+def hedge_delay(name: str, percentile: float = None) -> float:
+    """name 모델 호출 후 다음 모델을 띄우기까지 기다릴 시간 (지연 백분위, 표본 부족 시 기본값)"""
+    hist = _histogram(name)
+    value = hist.percentile(HEDGE_PERCENTILE if percentile is None else percentile)
+    if value is None or len(hist.samples) < HEDGE_MIN_SAMPLES:
+        value = HEDGE_DEFAULT_DELAY
+    return max(HEDGE_MIN_DELAY, min(HEDGE_MAX_DELAY, value))
+
+
+def _consume(task: asyncio.Task):
+    # 취소/패배한 호출의 예외가 "never retrieved" 경고로 남지 않게 소비
+    if not task.cancelled():
+        task.exception()
+
+
+async def hedged_ainvoke(candidates: Sequence[Tuple[str, object]], messages, label: str = "LLM",
+                         validate: Callable[[object], bool] = None, percentile: float = None,
+                         timeout: float = None) -> Tuple[object, str]:
+    """
+    candidates = [(모델명, runnable), ...] (우선순위 순) 에 헤지 호출을 수행하고 (응답, 모델명) 을 반환
+
+    - validate(response) 가 False 인 응답은 실패로 취급하고 다음 후보로 넘어감 (기본: None 이 아니면 유효)
+    - 모든 후보가 실패하면 마지막 예외를 다시 발생시킴
+    """
+    validate = validate or (lambda r: r is not None)
+    timeout = CALL_TIMEOUT if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    pending: Dict[asyncio.Task, Tuple[str, float]] = {}
+    next_idx = 0
+    last_error: Optional[BaseException] = None
+    timed_out = False
+
+    def launch():
+        nonlocal next_idx
+        name, runnable = candidates[next_idx]
+        next_idx += 1
+        print(f"{label}: {next_idx}차 모델 호출 - {name}")
+        task = asyncio.ensure_future(runnable.ainvoke(messages))
+        pending[task] = (name, time.monotonic())
+        return name
+
+    if not candidates:
+        raise ValueError("호출할 모델이 없습니다.")
+    last_launched = launch()
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                raise asyncio.TimeoutError(f"{label}: {timeout}s 내 응답 없음")
+            wait = remaining
+            if next_idx < len(candidates):
+                wait = min(wait, hedge_delay(last_launched, percentile))
+            done, _ = await asyncio.wait(list(pending), timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                # 지연 백분위 초과 → 다음 모델을 헤지로 추가 호출 (기존 호출은 계속 대기)
+                if next_idx < len(candidates):
+                    print(f"{label}: {last_launched} 응답 지연 → 헤지 호출")
+                    last_launched = launch()
+                continue
+
+            failed = 0
+            for task in done:
+                name, started = pending.pop(task)
+                hist = _histogram(name)
+                error = task.exception()
+                elapsed = time.monotonic() - started
+                if error is None and validate(task.result()):
+                    hist.observe(elapsed)
+                    print(f"{label}: {name} 응답 채택 ({elapsed:.2f}s)")
+                    return task.result(), name
+                hist.observe_failure(elapsed)
+                failed += 1
+                last_error = error or ValueError(f"{name}: 유효하지 않은 구조화 응답")
+                print(f"{label}: {name} 실패 - {last_error}")
+
+            # 실패한 만큼 대기 없이 다음 후보 호출 (헤지 호출이 진행 중이어도 남은 지연을 기다리지 않음)
+            for _ in range(failed):
+                if next_idx >= len(candidates):
+                    break
+                last_launched = launch()
+        raise last_error or RuntimeError(f"{label}: 모든 모델 실패")
+    finally:
+        now = time.monotonic()
+        for task, (name, started) in pending.items():
+            task.cancel()
+            task.add_done_callback(_consume)
+            if timed_out:
+                _histogram(name).observe_failure(now - started, timed_out=True)
+            else:
+                _histogram(name).cancelled += 1
+
+
+def get_llm_latency_stats() -> Dict[str, object]:
+    """모델별 지연 히스토그램과 현재 헤지 지연값"""
+    with _lock:
+        names = list(_histograms)
+    return {
+        "hedge_percentile": HEDGE_PERCENTILE,
+        "models": {name: {**_histogram(name).snapshot(), "hedge_delay": round(hedge_delay(name), 3)}
+                   for name in names},
+    }
+
+
+def reset_latency_stats():
+    with _lock:
+        _histograms.clear()
@@ -3,10 +3,12 @@ from pydantic import BaseModel
 from typing import List, TypedDict, Annotated, operator
 from google import genai
 from google.genai import types
+from functools import lru_cache
 from langgraph.graph import StateGraph, END
-from langchain_anthropic import ChatAnthropic
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langgraph.types import Send
+from agents.llm_clients import fallback_models, structured_candidates
+from agents.llm_hedge import hedged_ainvoke
+from agents.llm_cache import llm_response_cache, make_cache_key
 from langchain_core.messages import SystemMessage, HumanMessage
 import os
 import dotenv
@@ -17,6 +19,9 @@ except Exception:
 
 dotenv.load_dotenv()
 
+# 프롬프트(preferenceAnalyzerPrompt)나 출력 스키마를 바꾸면 올려서 이전 캐시 응답을 무효화
+PREFERENCE_PROMPT_VERSION = "preference-v1"
+
 class PreferenceSubgraph(TypedDict):
     requests: List[str]
     n_requests: int
@@ -24,6 +29,8 @@ class PreferenceSubgraph(TypedDict):
     schema: object
     preference_result: Annotated[list, operator.add]
     model: object
+    year: int
+    month: int
 
 
 def collector(state):
@@ -203,6 +210,39 @@ class preferenceAnalyzerPrompt:
             # OUTPUT:
             """
 
+def _build_answer(response, query, data) -> dict:
+    """구조화 응답 → 결과 dict (스키마에 없는 간호사 ID 는 무시 처리)"""
+    json_answer = {
+        "processor": response.processor,
+        "id": response.id,
+        "weight": response.weight,
+        "reason": response.reason,
+        "request": query
+    }
+    
+    # ID 검증: schema에 존재하는 간호사인지 확인
+    valid_nurse_ids = []
+    if isinstance(data, list):
+    
+        valid_nurse_ids = [nurse.get('nurse_id', '') for nurse in data if isinstance(nurse, dict)]
+    elif isinstance(data, dict) and 'nurses' in data:
+    
+        nurses = data.get('nurses', [])
+        valid_nurse_ids = [nurse.get('nurse_id', '') for nurse in nurses if isinstance(nurse, dict)]
+    
+    # 추출된 id가 유효한 간호사 ID가 아니면 빈 값으로 처리
+    if json_answer["id"] and json_answer["id"] not in valid_nurse_ids:
+        print(f"Preference Analyzer: 무효한 간호사 ID '{json_answer['id']}' - 빈 값으로 처리")
+        json_answer = {
+            "processor": f"언급된 간호사를 찾을 수 없어 무시됨: {response.processor}",
+            "id": "",
+            "weight": 0.0,
+            "reason": "해당하는 간호사가 스키마에 존재하지 않음",
+            "request": query
+        }
+    return json_answer
+
+
 async def preference_analyzer(state):
     
     phase = state['phase']
@@ -211,24 +251,19 @@ async def preference_analyzer(state):
     
     preference_analyzer_prompt = preferenceAnalyzerPrompt(data, query)
     
-    # 백업 모델들 순서대로 시도
-    models_to_try = [
-        # 1차: OpenAI (기본)
-        ChatOpenAI(
-            model="gpt-4.1-mini-2025-04-14",
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-        ),
-        # 2차: Anthropic (백업)
-        ChatAnthropic(
-            model="claude-3-7-sonnet-20250219",
-            anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
-        ),
-        # 3차: Google Gemini (최종 백업)
-        ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            google_api_key=os.getenv("GOOGLE_API_KEY"),
-        )
-    ]
+    # 같은 문장/년월/간호사 스키마/프롬프트 버전으로 분석한 결과가 캐시에 있으면 LLM 호출 생략
+    cache_key = make_cache_key("preference", PREFERENCE_PROMPT_VERSION, query,
+                               state.get('year'), state.get('month'), data)
+    cached = llm_response_cache.get("preference", cache_key)
+    if cached is not None:
+        json_answer = _build_answer(preferenceAnalyzer.model_validate(cached["response"]), query, data)
+        saved = _compute_cost(cached["prompt_tokens"], cached["completion_tokens"], cached["model"])
+        llm_response_cache.record_saving(saved)
+        print(f"Preference Analyzer: 캐시 적중 - LLM 호출 생략, 절약 토큰: {saved['usage']}, 비용(USD/KRW): {saved['cost_usd']} / {saved['cost_krw']}")
+        return {'preference_result': [json_answer]}
+
+    # 백업 모델들 순서대로 시도 (프로세스 공유 클라이언트)
+    models_to_try = fallback_models()
     
     messages = [
         SystemMessage(content=preference_analyzer_prompt.system),
@@ -243,74 +278,17 @@ async def preference_analyzer(state):
         "request": query
     }
     used_model_name = ""
+    raw_response = None
     
-    for i, client in enumerate(models_to_try):
-        try:
-            
-            print(f"Preference Analyzer: {i+1}차 모델 시도 중...")
-            
-            llm = client.with_structured_output(preferenceAnalyzer)
-
-            response = await llm.ainvoke(messages)
-            used_model_name = getattr(client, "model", "") or used_model_name
-            print('used_model_name', used_model_name)
-
-            # 성공 시 데이터 추출
-            json_answer = {
-                "processor": response.processor,
-                "id": response.id,
-                "weight": response.weight,
-                "reason": response.reason,
-                "request": query
-            }
-            
-            # ID 검증: schema에 존재하는 간호사인지 확인
-            valid_nurse_ids = []
-            if isinstance(data, list):
-            
-                valid_nurse_ids = [nurse.get('nurse_id', '') for nurse in data if isinstance(nurse, dict)]
-            elif isinstance(data, dict) and 'nurses' in data:
-            
-                nurses = data.get('nurses', [])
-                valid_nurse_ids = [nurse.get('nurse_id', '') for nurse in nurses if isinstance(nurse, dict)]
-            
-            # 추출된 id가 유효한 간호사 ID가 아니면 빈 값으로 처리
-            if json_answer["id"] and json_answer["id"] not in valid_nurse_ids:
-                print(f"Preference Analyzer: 무효한 간호사 ID '{json_answer['id']}' - 빈 값으로 처리")
-                json_answer = {
-                    "processor": f"언급된 간호사를 찾을 수 없어 무시됨: {response.processor}",
-                    "id": "",
-                    "weight": 0.0,
-                    "reason": "해당하는 간호사가 스키마에 존재하지 않음",
-                    "request": query
-                }
-            
-            print(f"Preference Analyzer: {i+1}차 모델 성공!")
-            break
-            
-        except Exception as e:
-            error_msg = str(e).lower()
-            print(f"Preference Analyzer: {i+1}차 모델 오류 - {e}")
-            
-            # 429 (Rate limit) 또는 529 (Service unavailable) 에러인지 확인
-            if ("429" in error_msg or "rate" in error_msg or 
-                "529" in error_msg or "service unavailable" in error_msg or
-                "quota" in error_msg or "limit" in error_msg):
-                
-                if i < len(models_to_try) - 1:
-                    print(f"Preference Analyzer: {i+2}차 백업 모델로 재시도...")
-                    continue
-                else:
-                    print("Preference Analyzer: 모든 백업 모델 실패, 기본값 사용")
-                    break
-            else:
-                # 다른 에러는 즉시 백업 모델로 시도
-                if i < len(models_to_try) - 1:
-                    print(f"Preference Analyzer: 예상치 못한 오류, {i+2}차 백업 모델로 재시도...")
-                    continue
-                else:
-                    print("Preference Analyzer: 모든 모델 실패, 기본값 사용")
-                    break
+    try:
+        response, used_model_name = await hedged_ainvoke(
+            structured_candidates(models_to_try, preferenceAnalyzer), messages, label="Preference Analyzer",
+        )
+        raw_response = response.model_dump()
+        json_answer = _build_answer(response, query, data)
+        print(f"Preference Analyzer: {used_model_name} 모델 성공!")
+    except Exception as e:
+        print(f"Preference Analyzer: 모든 모델 실패, 기본값 사용 - {e}")
     
     # 토큰/비용 계산
     model_name_for_calc = used_model_name or (getattr(models_to_try[0], "model", "") or "")
@@ -319,10 +297,34 @@ async def preference_analyzer(state):
     completion_tokens = _count_tokens(completion_json, model_name_for_calc)
     cost_info = _compute_cost(prompt_tokens, completion_tokens, model_name_for_calc)
     print(f"토큰 사용량(Preference): {cost_info['usage']}, 비용(USD/KRW): {cost_info['cost_usd']} / {cost_info['cost_krw']}")
+    if raw_response is not None and used_model_name:
+        llm_response_cache.set("preference", cache_key, raw_response, used_model_name, prompt_tokens, completion_tokens)
     
     return {'preference_result': [json_answer]}
 
 
+def _fan_out_requests(state):
+    """요청 문장 수만큼 preference_analyzer 노드로 분기 (phase 만 다른 입력)"""
+    return [Send("preference_analyzer", {**state, "phase": n}) for n in range(len(state["requests"]))]
+
+
+@lru_cache(maxsize=1)
+def _preference_fanout_graph():
+    """
+    문장 수와 무관한 map 형태 서브그래프를 1회만 컴파일해 재사용
+    init_data → (Send × N) preference_analyzer → collector
+    """
+    graph = StateGraph(PreferenceSubgraph)
+    graph.add_node("init_data", init_data)
+    graph.add_node("preference_analyzer", preference_analyzer)
+    graph.add_node("collector", collector)
+    graph.set_entry_point('init_data')
+    graph.add_conditional_edges('init_data', _fan_out_requests, ["preference_analyzer"])
+    graph.add_edge('preference_analyzer', "collector")
+    graph.add_edge('collector', END)
+    return graph.compile()
+
+
 async def create_preference_analyzer(parent_state):
     requests = parent_state['query_preference']         # Shift List ex. ["9/9: D", "9/10: D", "9/16: OFF", "9/9, 9/10, 9/16 외에 웬만하면 E로 줘"]
     schema = parent_state['schema']
@@ -330,25 +332,10 @@ async def create_preference_analyzer(parent_state):
     n_requests = len(requests)
     if n_requests == 0:
         return {"preference_results": []}
-    graph = StateGraph(PreferenceSubgraph)
-    
-    graph.add_node("init_data", init_data)
-    graph.add_node("collector", collector)
-    graph.set_entry_point('init_data')
-    for n in range(n_requests):
-        def create_preference_node(n):
-            async def wrapped_shift(state):
-                state['phase']= n
-                return await preference_analyzer(state)
-            return wrapped_shift
-        graph.add_node('preference_analyzer' +str(n), create_preference_node(n))
-        graph.add_edge('init_data', 'preference_analyzer' +str(n))
-        graph.add_edge('preference_analyzer'+ str(n), "collector")
-
-    graph.add_edge('collector', END)
-    graph_app = graph.compile()
 
-    result = await graph_app.ainvoke({"requests": requests, "schema": schema, "model": client})
+    result = await _preference_fanout_graph().ainvoke({
+        "requests": requests, "schema": schema, "model": client,
+        "year": parent_state.get('year'), "month": parent_state.get('month'),
+    })
     print(f'\n\n\n\n\npreference_results, {result}\n\n\n\n\n')
     return {"preference_results": [result]}
-
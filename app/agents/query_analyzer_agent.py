@@ -7,9 +7,8 @@ import dotenv
 from langgraph.prebuilt import create_react_agent
 from langchain_mcp_adapters.client import MultiServerMCPClient
 import pprint
-from langchain_anthropic import ChatAnthropic
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
+from agents.llm_clients import fallback_models, structured_candidates
+from agents.llm_hedge import hedged_ainvoke
 from langchain_core.messages import SystemMessage, HumanMessage
 import os
 try:
@@ -213,24 +212,8 @@ async def query_analyzer(state):
     month = state['month']
     query_analyzer_prompt = queryAnalyzerPrompt(context, year, month)
     
-    # 백업 모델들 순서대로 시도
-    models_to_try = [
-        # 1차: OpenAI (기본)
-        ChatOpenAI(
-            model="gpt-4.1-mini-2025-04-14",
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-        ),
-        # 2차: Anthropic (백업)
-        ChatAnthropic(
-            model="claude-3-7-sonnet-20250219",
-            anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
-        ),
-        # 3차: Google Gemini (최종 백업)
-        ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            google_api_key=os.getenv("GOOGLE_API_KEY"),
-        )
-    ]
+    # 백업 모델들 순서대로 시도 (프로세스 공유 클라이언트)
+    models_to_try = fallback_models()
     
     messages = [
         SystemMessage(content=query_analyzer_prompt.system),
@@ -282,48 +265,20 @@ async def query_analyzer(state):
             'model': models_to_try[0]
         }
 
-    for i, client in enumerate(models_to_try):
-        try:
-            print(f"Query Analyzer: {i+1}차 모델 시도 중..., 모델: {client}")
-            
-            llm = client.with_structured_output(queryAnalyzer)
-            response = await llm.ainvoke(messages)
-            used_model_name = getattr(client, "model", "") or used_model_name
-            print("\n\n\nresponse", response, "\n\n\n")
-            # 성공 시 데이터 추출
-            chat = response.Chat
-            shift = response.Shift
-            preference = response.Preference
-            except_ = response.Except
-            others = response.Others
-            
-            print(f"Query Analyzer: {i+1}차 모델 성공!", response)
-            
-            break
-            
-        except Exception as e:
-            error_msg = str(e).lower()
-            print(f"Query Analyzer: {i+1}차 모델 오류 - {e}")
-            
-            # 429 (Rate limit) 또는 529 (Service unavailable) 에러인지 확인
-            if ("429" in error_msg or "rate" in error_msg or 
-                "529" in error_msg or "service unavailable" in error_msg or
-                "quota" in error_msg or "limit" in error_msg):
-                
-                if i < len(models_to_try) - 1:
-                    print(f"Query Analyzer: {i+2}차 백업 모델로 재시도...")
-                    continue
-                else:
-                    print("Query Analyzer: 모든 백업 모델 실패, 기본값 사용")
-                    break
-            else:
-                # 다른 에러는 즉시 백업 모델로 시도
-                if i < len(models_to_try) - 1:
-                    print(f"Query Analyzer: 예상치 못한 오류, {i+2}차 백업 모델로 재시도...")
-                    continue
-                else:
-                    print("Query Analyzer: 모든 모델 실패, 기본값 사용")
-                    break
+    try:
+        response, used_model_name = await hedged_ainvoke(
+            structured_candidates(models_to_try, queryAnalyzer), messages, label="Query Analyzer",
+        )
+        print("\n\n\nresponse", response, "\n\n\n")
+        # 성공 시 데이터 추출
+        chat = response.Chat
+        shift = response.Shift
+        preference = response.Preference
+        except_ = response.Except
+        others = response.Others
+        print(f"Query Analyzer: {used_model_name} 모델 성공!", response)
+    except Exception as e:
+        print(f"Query Analyzer: 모든 모델 실패, 기본값 사용 - {e}")
 
     # 토큰/비용 계산
     model_name_for_calc = used_model_name or (getattr(models_to_try[0], "model", "") or "")
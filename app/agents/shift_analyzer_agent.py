@@ -3,12 +3,14 @@ from pydantic import BaseModel
 from typing import List, TypedDict, Annotated, operator, Dict
 from google import genai
 from google.genai import types
+from functools import lru_cache
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_anthropic import ChatAnthropic
-from langchain_openai import ChatOpenAI
+from agents.llm_clients import fallback_models, get_chat_model, structured_candidates
+from agents.llm_hedge import hedged_ainvoke
+from agents.llm_cache import llm_response_cache, make_cache_key
 import os
 from langchain_core.messages import SystemMessage, HumanMessage
 import dotenv
@@ -24,6 +26,9 @@ except Exception:
 
 dotenv.load_dotenv()
 
+# 프롬프트(shiftAnalyzerPrompt)나 출력 스키마를 바꾸면 올려서 이전 캐시 응답을 무효화
+SHIFT_PROMPT_VERSION = "shift-v1"
+
 
 def collector(state):
     """
@@ -286,88 +291,37 @@ async def shift_analyzer(state):
     
     shift_analyzer_prompt = shiftAnalyzerPrompt(context, year, month, weekend_holiday)
     print(f'\n\n\n\n\nshift_analyzer_prompt, {shift_analyzer_prompt.human}\n\n\n\n\n')
-    # 백업 모델들 순서대로 시도
-    models_to_try = [
-        # 1차: Anthropic (기본)
-        # ChatAnthropic(
-        #     model="claude-sonnet-4-20250514",
-        #     anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
-        # ),
-
-        # 2차: OpenAI (백업)
-        ChatOpenAI(
-            model="gpt-4.1-mini-2025-04-14",
-            openai_api_key=os.getenv("OPENAI_API_KEY"),
-        ),
-        ChatAnthropic(
-            model="claude-3-7-sonnet-20250219",
-            anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
-        ),
-
-        # 3차: Google Gemini (최종 백업)
-        ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            google_api_key=os.getenv("GOOGLE_API_KEY"),
-        )
-    ]
+    # 같은 문장/년월/주말·공휴일/프롬프트 버전으로 분석한 결과가 캐시에 있으면 LLM 호출 생략
+    cache_key = make_cache_key("shift", SHIFT_PROMPT_VERSION, context, year, month, weekend_holiday)
+    cached = llm_response_cache.get("shift", cache_key)
+    if cached is not None:
+        result = shiftAnalyzer.model_validate(cached["response"]).result
+        saved = _compute_cost(cached["prompt_tokens"], cached["completion_tokens"], cached["model"])
+        llm_response_cache.record_saving(saved)
+        print(f"Shift Analyzer: 캐시 적중 - LLM 호출 생략, 절약 토큰: {saved['usage']}, 비용(USD/KRW): {saved['cost_usd']} / {saved['cost_krw']}")
+        if result is None:
+            return {"shift_result": []}
+        result['request'] = [context] * len(result['date'])
+        return {"shift_result": [result]}
+
+    # 백업 모델들 순서대로 시도 (프로세스 공유 클라이언트)
+    models_to_try = fallback_models()
     
     sr = None
     used_model_name = ""
-    for i, client in enumerate(models_to_try):
-        try:
-            print(f"Shift Analyzer: {i+1}차 모델 시도 중..., 모델: {client}")
-            # agent = create_react_agent(client, tools, response_format=shiftAnalyzer)
-            llm = client.with_structured_output(shiftAnalyzer)
-            response = await llm.ainvoke([
-                SystemMessage(content=shift_analyzer_prompt.system), 
-                HumanMessage(content=shift_analyzer_prompt.human)
-            ])
-
-            # result = await agent.ainvoke({
-            #     "messages": [
-            #         SystemMessage(content=shift_analyzer_prompt.system), 
-            #         HumanMessage(content=shift_analyzer_prompt.human)
-            #     ]
-            # })
-            # print('response', response)
-            sr = response
-            print(f"Shift Analyzer1111: {sr}")
-                
-            used_model_name = getattr(client, "model", "") or used_model_name
-            print(f"Shift Analyzer: {i+1}차 모델 성공!")
-            break
-            
-        except Exception as e:
-            error_msg = str(e).lower()
-            print(f"Shift Analyzer: {i+1}차 모델 오류 - {e}")
-            
-            # 429 (Rate limit) 또는 529 (Service unavailable) 에러인지 확인
-            if ("429" in error_msg or "rate" in error_msg or 
-                "529" in error_msg or "service unavailable" in error_msg or
-                "quota" in error_msg or "limit" in error_msg):
-                
-                if i < len(models_to_try) - 1:
-                    print(f"Shift Analyzer: {i+2}차 백업 모델로 재시도...")
-                    continue
-                else:
-                    print("Shift Analyzer: 모든 백업 모델 실패, 기본값 사용")
-                    # 기본값 설정
-                    from types import SimpleNamespace
-                    sr = SimpleNamespace()
-                    sr.result = {"shift": "O", "date": [], "score": []}
-                    break
-            else:
-                # 다른 에러는 즉시 백업 모델로 시도
-                if i < len(models_to_try) - 1:
-                    print(f"Shift Analyzer: 예상치 못한 오류, {i+2}차 백업 모델로 재시도...")
-                    continue
-                else:
-                    print("Shift Analyzer: 모든 모델 실패, 기본값 사용")
-                    # 기본값 설정
-                    from types import SimpleNamespace
-                    sr = SimpleNamespace()
-                    sr.result = {"shift": "O", "date": [], "score": []}
-                    break
+    try:
+        sr, used_model_name = await hedged_ainvoke(
+            structured_candidates(models_to_try, shiftAnalyzer),
+            [SystemMessage(content=shift_analyzer_prompt.system), HumanMessage(content=shift_analyzer_prompt.human)],
+            label="Shift Analyzer",
+        )
+        print(f"Shift Analyzer: {used_model_name} 모델 성공! {sr}")
+    except Exception as e:
+        print(f"Shift Analyzer: 모든 모델 실패, 기본값 사용 - {e}")
+        # 기본값 설정
+        from types import SimpleNamespace
+        sr = SimpleNamespace()
+        sr.result = {"shift": "O", "date": [], "score": []}
     
     # 토큰/비용 계산
     model_name_for_calc = used_model_name or (getattr(models_to_try[0], "model", "") or "")
@@ -376,6 +330,8 @@ async def shift_analyzer(state):
     completion_tokens = _count_tokens(completion_json, model_name_for_calc)
     cost_info = _compute_cost(prompt_tokens, completion_tokens, model_name_for_calc)
     print(f"토큰 사용량(Shift): {cost_info['usage']}, 비용(USD/KRW): {cost_info['cost_usd']} / {cost_info['cost_krw']}")
+    if used_model_name:
+        llm_response_cache.set("shift", cache_key, sr.model_dump(), used_model_name, prompt_tokens, completion_tokens)
     # print(f"Shift Analyzer: {sr.result}")
     sr.result['request'] = [context] * len(sr.result['date'])
     # print(f'\n\n\n\n\nshift_result, {sr.result}\n\n\n\n\n')
@@ -393,6 +349,28 @@ from agents.query_analyzer_agent import query_analyzer
 # from langchain_core.tools import Tool
 
 
+def _fan_out_requests(state):
+    """요청 문장 수만큼 shift_analyzer 노드로 분기 (phase 만 다른 입력)"""
+    return [Send("shift_analyzer", {**state, "phase": n}) for n in range(len(state["requests"]))]
+
+
+@lru_cache(maxsize=1)
+def _shift_fanout_graph():
+    """
+    문장 수와 무관한 map 형태 서브그래프를 1회만 컴파일해 재사용
+    init_data → (Send × N) shift_analyzer → collector
+    """
+    graph = StateGraph(ShiftSubgraph)
+    graph.add_node("init_data", init_data)
+    graph.add_node("shift_analyzer", shift_analyzer)
+    graph.add_node("collector", collector)
+    graph.set_entry_point('init_data')
+    graph.add_conditional_edges('init_data', _fan_out_requests, ["shift_analyzer"])
+    graph.add_edge('shift_analyzer', "collector")
+    graph.add_edge('collector', END)
+    return graph.compile()
+
+
 async def create_shift_analyzer(parent_state):
     """
     Shift 분석기 생성 및 실행
@@ -447,11 +425,7 @@ async def create_shift_analyzer(parent_state):
     # ======================================================================
     # 일반 경로: LLM을 사용한 shift 분석
     # ======================================================================
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.0-flash",
-        temperature=0,
-        google_api_key=os.getenv("GOOGLE_API_KEY"),
-    )
+    llm = get_chat_model("google", "gemini-2.0-flash", temperature=0)
 
     # llm = ChatAnthropic(
     #         model="claude-sonnet-4-20250514",
@@ -482,24 +456,9 @@ async def create_shift_analyzer(parent_state):
     if n_requests == 0:
         print('shift_analyzer 답변 없음')
         return {"shift_results": []}
-    graph = StateGraph(ShiftSubgraph)
-    graph.add_node("init_data", init_data)
-    graph.add_node("collector", collector)
-    graph.set_entry_point('init_data')
-    for n in range(n_requests):
-        def create_shift_node(n):
-            async def wrapped_shift(state):
-                state['phase']= n
-                return await shift_analyzer(state)
-            return wrapped_shift
-        graph.add_node('shift_analyzer' +str(n), create_shift_node(n))
-        graph.add_edge('init_data', 'shift_analyzer' +str(n))
-        graph.add_edge('shift_analyzer'+ str(n), "collector")
-    graph.add_edge('collector', END)
-    graph_app = graph.compile()
     print('weekend_holiday', weekend_holiday)
     try:
-        result = await graph_app.ainvoke({
+        result = await _shift_fanout_graph().ainvoke({
             "requests": requests,
             "model": llm,
             # "mcp_tools": tools,
@@ -0,0 +1,106 @@
+"""
+비동기 DB 세션 모듈 (조회 위주 엔드포인트용)
+- async 핸들러에서 동기 Session 을 직접 쓰면 느린 쿼리 동안 이벤트 루프 전체가 멈추므로,
+  조회 엔드포인트는 get_async_db 로 받은 세션의 await db.run_sync(fn, ...) 로 DB 작업을 수행
+- ASYNC_DATABASE_URL 이 설정되어 있으면 SQLAlchemy asyncio 엔진(AsyncSession) 사용
+  (예: mysql+aiomysql://..., mssql+aioodbc://...)
+- 설정이 없으면 기존 동기 풀(db.client2)의 Session 을 워커 스레드에서 실행하는 ThreadedAsyncSession 사용
+  (동시 세션 수 = 커넥션 풀 크기 + 오버플로, 초과 요청은 이벤트 루프에서 비동기로 대기)
+- 두 방식 모두 run_sync(fn, *args) 인터페이스가 같아 엔드포인트 코드는 동일 (fn 의 첫 인자는 동기 Session)
+- 솔버/저장 경로는 기존 동기 get_db 를 그대로 사용
+"""
+import functools
+import os
+from typing import AsyncGenerator, Callable, Optional
+
+import anyio
+from sqlalchemy.orm import Session, sessionmaker
+
+from db.pool import POOL_SIZE, POOL_MAX_OVERFLOW, POOL_TIMEOUT, POOL_RECYCLE, POOL_PRE_PING
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+
+class ThreadedAsyncSession:
+    """동기 Session 을 스레드에서 실행하는 AsyncSession 호환 래퍼 (run_sync / close)
+
+    Notes:
+        세션은 첫 run_sync 부터 close 까지 커넥션을 쥐고 있으므로, 스레드 수가 아니라 세션 수를
+        풀 용량(slots)으로 제한한다 → 풀이 바닥난 상태에서 스레드가 체크아웃 대기로 묶이지 않음
+    """
+
+    def __init__(self, session: Session, slots: anyio.Semaphore):
+        self.sync_session = session
+        self._slots = slots
+        self._holding = False
+
+    async def run_sync(self, fn: Callable, *args, **kwargs):
+        if not self._holding:
+            await self._slots.acquire()
+            self._holding = True
+        return await anyio.to_thread.run_sync(functools.partial(fn, self.sync_session, *args, **kwargs))
+
+    async def close(self):
+        try:
+            if self._holding:
+                await anyio.to_thread.run_sync(self.sync_session.close)
+            else:
+                self.sync_session.close()
+        finally:
+            if self._holding:
+                self._holding = False
+                self._slots.release()
+
+
+class ThreadedAsyncSessionFactory:
+    """sessionmaker 를 받아 ThreadedAsyncSession 을 만드는 팩토리 (동시 세션 수 상한 공유)"""
+
+    def __init__(self, sync_sessionmaker: sessionmaker, max_sessions: int):
+        self.sync_sessionmaker = sync_sessionmaker
+        self.max_sessions = max_sessions
+        self._slots: Optional[anyio.Semaphore] = None
+
+    def __call__(self) -> ThreadedAsyncSession:
+        # Semaphore 는 이벤트 루프 안에서 생성해야 하므로 첫 세션 생성 시 만든다
+        if self._slots is None:
+            self._slots = anyio.Semaphore(self.max_sessions)
+        return ThreadedAsyncSession(self.sync_sessionmaker(), self._slots)
+
+
+def _create_native_factory(url: str):
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    engine = create_async_engine(
+        url,
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_recycle=POOL_RECYCLE,
+        pool_pre_ping=POOL_PRE_PING,
+    )
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+_factory = None
+
+
+def get_async_session_factory():
+    """프로세스 공유 비동기 세션 팩토리 (최초 호출 시 생성)"""
+    global _factory
+    if _factory is None:
+        if ASYNC_DATABASE_URL:
+            _factory = _create_native_factory(ASYNC_DATABASE_URL)
+            print("[async db] SQLAlchemy asyncio 엔진 사용")
+        else:
+            from db.client2 import SessionLocal
+            _factory = ThreadedAsyncSessionFactory(SessionLocal, POOL_SIZE + POOL_MAX_OVERFLOW)
+            print("[async db] 동기 풀 + 스레드 실행 모드 사용")
+    return _factory
+
+
+async def get_async_db() -> AsyncGenerator:
+    db = get_async_session_factory()()
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,112 @@
+"""
+비동기 DB 경로 부하 테스트 (동기 Session vs get_async_db 방식 비교)
+- 로컬 SQLite 에 지연 함수(slow_query)를 등록해 느린 조회(기본 50ms)를 흉내내고, 같은 조회를
+  1) async 핸들러 안에서 동기 Session 으로 직접 실행 (기존 방식)
+  2) ThreadedAsyncSession.run_sync 로 실행 (get_async_db 방식)
+  두 엔드포인트로 만들어 동시 요청을 보낸다
+- 느린 조회 처리량과, 부하 중 이벤트 루프 지연(10ms sleep 이 늦게 깨어난 정도 = 다른 요청이 멈춘 시간)을 함께 측정
+- 실행: app 디렉터리에서 python -m db.async_load_test [동시요청수] [지연ms]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from db.async_client import ThreadedAsyncSessionFactory
+
+
+def _sessionmaker(pool_size: int) -> sessionmaker:
+    path = os.path.join(tempfile.gettempdir(), "async_load_test.sqlite3")
+    engine = create_engine(f"sqlite:///{path}", pool_size=pool_size, max_overflow=0,
+                           connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _register(dbapi_connection, connection_record):
+        dbapi_connection.create_function("slow_query", 1, lambda ms: time.sleep(ms / 1000) or ms)
+
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+def _build_app(concurrency: int, delay_ms: int, max_sessions: int) -> FastAPI:
+    # 기존 방식은 세션 반납(의존성 정리)도 막힌 이벤트 루프를 기다리므로, 풀이 모자라면 체크아웃 대기에서
+    # 루프 전체가 멈춘다 → 비교를 위해 동시 요청 수만큼 연결을 준다
+    SessionLocal = _sessionmaker(concurrency + 1)
+    async_factory = ThreadedAsyncSessionFactory(_sessionmaker(max_sessions), max_sessions)
+    query = text("SELECT slow_query(:ms)")
+
+    def get_sync_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        db = async_factory()
+        try:
+            yield db
+        finally:
+            await db.close()
+
+    app = FastAPI()
+
+    @app.get("/sync")
+    async def sync_endpoint(db: Session = Depends(get_sync_db)):
+        return {"value": db.execute(query, {"ms": delay_ms}).scalar()}
+
+    @app.get("/async")
+    async def async_endpoint(db=Depends(get_async_db)):
+        return {"value": await db.run_sync(lambda s: s.execute(query, {"ms": delay_ms}).scalar())}
+
+    return app
+
+
+async def _run(app: FastAPI, path: str, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get(path)  # 워밍업 (커넥션/스레드 생성)
+        lags = []
+        stop = asyncio.Event()
+
+        async def monitor():
+            while not stop.is_set():
+                t = time.perf_counter()
+                await asyncio.sleep(0.01)
+                lags.append(time.perf_counter() - t - 0.01)
+
+        monitor_task = asyncio.create_task(monitor())
+        await asyncio.sleep(0)
+        t0 = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(path) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - t0
+        stop.set()
+        await monitor_task
+
+    lags.sort()
+    return {
+        "ok": sum(r.status_code == 200 for r in responses),
+        "elapsed_s": elapsed,
+        "rps": concurrency / elapsed,
+        "lag_p50_ms": lags[len(lags) // 2] * 1000 if lags else 0.0,
+        "lag_max_ms": lags[-1] * 1000 if lags else 0.0,
+    }
+
+
+def run_load_test(concurrency: int = 40, delay_ms: int = 50, max_sessions: int = 10):
+    app = _build_app(concurrency, delay_ms, max_sessions)
+    print(f"동시 요청 {concurrency}건, 조회 지연 {delay_ms}ms, 동시 세션 상한 {max_sessions}")
+    print(f"{'경로':<8}{'성공':>6}{'소요(s)':>10}{'req/s':>10}{'loop lag p50(ms)':>18}{'max(ms)':>10}")
+    for label, path in (("sync", "/sync"), ("async", "/async")):
+        r = asyncio.run(_run(app, path, concurrency))
+        print(f"{label:<8}{r['ok']:>6}{r['elapsed_s']:>10.3f}{r['rps']:>10.1f}{r['lag_p50_ms']:>18.2f}{r['lag_max_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    run_load_test(*args)
@@ -1,8 +1,8 @@
 import os
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 import dotenv
+from db.pool import get_pooled_engine
 
 dotenv.load_dotenv()
 
@@ -14,7 +14,8 @@ DB_NAME = os.getenv("DB_NAME")
 
 DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-engine = create_engine(DATABASE_URL)
+# mariadb_manager(기본 DB)와 같은 풀을 공유
+engine = get_pooled_engine("mariadb", DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -7,6 +7,8 @@ dotenv.load_dotenv()
 
 import pymssql
 import pymysql
+from sqlalchemy.engine import URL
+from db.pool import get_pooled_engine
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -20,20 +22,27 @@ class MssqlDatabasemanager:
         self.user = os.getenv("MS_DB_USER")
         self.password = os.getenv("MS_DB_PASSWORD")
 
+    def _engine(self, database: str | None = None):
+        """데이터베이스별 공유 풀 엔진 (raw 연결은 EUC-KR 고정이라 ORM 엔진과 풀을 분리)"""
+        database = database or self.database
+        url = URL.create(
+            "mssql+pymssql",
+            username=self.user,
+            password=self.password,
+            host=self.host,
+            port=int(self.port) if self.port else None,
+            database=database,
+        )
+        return get_pooled_engine(f"mssql-raw:{database}", url, connect_args={"charset": "EUC-KR"})
+
     def get_connection(self, database: str | None = None, charset: str | None = 'EUC-KR') -> pymssql.Connection:
-        """데이터베이스 연결을 생성합니다. 선택적으로 데이터베이스명을 지정할 수 있습니다."""
+        """풀에서 연결을 가져옵니다. 선택적으로 데이터베이스명을 지정할 수 있습니다.
+
+        Notes:
+            반환되는 연결의 close() 는 실제로 닫지 않고 풀에 반납 (반납 시 rollback)
+        """
         try:
-            connection = pymssql.connect(
-                server=self.host,
-                port=self.port,
-                database=(database or self.database),
-                user=self.user,
-                password=self.password,
-                charset='EUC-KR'
-                #charset= charset
-
-            )
-            return connection
+            return self._engine(database).raw_connection()
         except Exception as e:
             logger.error(f"데이터베이스 연결 실패: {e}")
             raise
@@ -95,20 +104,20 @@ class MariaDatabasemanager:
         self.database = os.getenv("DB_NAME")
         self.user = os.getenv("DB_USER")
         self.password = os.getenv("DB_PASSWORD")
+    def _engine(self, database: str | None = None):
+        """데이터베이스별 공유 풀 엔진 (기본 DB 는 db.client 의 ORM 엔진과 같은 'mariadb' 풀)"""
+        name = "mariadb" if not database or database == self.database else f"mariadb:{database}"
+        url = f"mysql+pymysql://{self.user}:{self.password}@{self.host}:{self.port}/{database or self.database}"
+        return get_pooled_engine(name, url)
+
     def get_connection(self, database: str | None = None) -> pymysql.connections.Connection:
-        """데이터베이스 연결을 생성합니다. 선택적으로 데이터베이스명을 지정할 수 있습니다."""
+        """풀에서 연결을 가져옵니다. 선택적으로 데이터베이스명을 지정할 수 있습니다.
+
+        Notes:
+            반환되는 연결의 close() 는 실제로 닫지 않고 풀에 반납 (반납 시 rollback)
+        """
         try:
-            connection = pymysql.connect(
-                host=self.host,
-                port=int(self.port),
-                db=(database or self.database),
-                user=self.user,
-                password=self.password,
-                charset='utf8mb4',
-                autocommit=False,
-                cursorclass=pymysql.cursors.Cursor,
-            )
-            return connection
+            return self._engine(database).raw_connection()
         except Exception as e:
             logger.error(f"마리아DB 연결 실패: {e}")
             raise
@@ -174,7 +183,7 @@ DB_NAME = os.getenv("MS_DB_NAME")
 
 DATABASE_URL = f"mssql+pymssql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-engine = create_engine(DATABASE_URL)
+engine = get_pooled_engine(f"mssql:{DB_NAME}", DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -93,6 +93,15 @@ class ScheduleEntry(Base):
     work_date = Column(DATETIME, nullable=False)
     shift_id = Column(VARCHAR(10), ForeignKey("shifts.shift_id")) # D, E, N, O, etc.
 
+class ScheduleRow(Base):
+    """간호사 1명의 한 달 배정을 한 행으로 저장하는 압축 포맷 (schedule_entries 의 선택적 사본)"""
+    __tablename__ = "schedule_rows"
+    schedule_id = Column(CHAR(12), ForeignKey("schedules.schedule_id"), primary_key=True)
+    nurse_id = Column(VARCHAR(50), ForeignKey("nurses.nurse_id"), primary_key=True)
+    year = Column(SMALLINT, nullable=False)
+    month = Column(TINYINT, nullable=False)
+    shifts = Column(JSON, nullable=False)  # ['D', 'E', 'O', '-', ...] (일자 순, 미배정은 '-')
+
 class Shift(Base):
     __tablename__ = "shifts"
     shift_id = Column(VARCHAR(10), primary_key=True)
@@ -303,3 +312,33 @@ class DailyShift(Base):
 
     office = relationship("Office")
     group = relationship("Group")
+
+
+class RosterJob(Base):
+    __tablename__ = 'roster_jobs'
+
+    job_id = Column(VARCHAR(40), primary_key=True)
+    account_id = Column(VARCHAR(50), nullable=False)
+    group_id = Column(VARCHAR(50), nullable=True)
+    year = Column(SMALLINT, nullable=False)
+    month = Column(TINYINT, nullable=False)
+    params = Column(JSON, nullable=True)
+    backend = Column(VARCHAR(10), nullable=False, default='local')  # 'local', 'sqs'
+    status = Column(VARCHAR(10), nullable=False, default='QUEUED')  # QUEUED, RUNNING, DONE, FAILED, CANCELLED
+    progress = Column(FLOAT, nullable=False, default=0.0)            # 0.0 ~ 1.0
+    incumbent_objective = Column(FLOAT, nullable=True)               # 현재 최선해 목적값
+    hard_violations = Column(INTEGER, nullable=True)                 # 현재 최선해 하드 위반 수
+    incumbent_roster = Column(JSON, nullable=True)                   # 현재 최선해 {nurse_id: [교대코드...]}
+    incumbent_version = Column(INTEGER, nullable=False, default=0)   # incumbent 갱신 횟수 (스트리밍 변경 감지)
+    message = Column(TEXT, nullable=True)
+    schedule_id = Column(CHAR(12), nullable=True)
+    cancel_requested = Column(BOOLEAN, nullable=False, default=False)
+    accept_requested = Column(BOOLEAN, nullable=False, default=False)  # 현재 incumbent 수락(조기 종료) 요청
+    created_at = Column(DATETIME, default=func.now())
+    started_at = Column(DATETIME, nullable=True)
+    finished_at = Column(DATETIME, nullable=True)
+    updated_at = Column(DATETIME, default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index('ix_roster_jobs_group_created', 'group_id', 'created_at'),
+    )
@@ -0,0 +1,147 @@
+"""
+DB 커넥션 풀 공통 모듈
+- ORM 엔진(client.py / client2.py)과 raw 매니저(MariaDatabasemanager / MssqlDatabasemanager)가 같은 설정의 풀을 사용
+- 풀 크기/오버플로/체크아웃 타임아웃/재활용 주기/pre-ping 은 환경변수로 조정
+- 같은 이름으로 요청한 엔진은 1개만 생성해 공유 (예: MariaDB ORM 엔진과 mariadb_manager 기본 DB)
+- 풀별 체크아웃 수/대기 시간/타임아웃/신규 연결 수는 /health/database 로 노출
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "20"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))          # 체크아웃 대기 상한(초)
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))          # 서버 wait_timeout 보다 짧게
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+
+
+class PoolMetrics:
+    """풀 1개의 체크아웃 대기 시간/연결 수 집계"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.connects = 0
+        self.invalidated = 0
+
+    def observe_wait(self, seconds: float):
+        self.checkouts += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "invalidated": self.invalidated,
+            "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+_engines: Dict[str, Engine] = {}
+_metrics: Dict[str, PoolMetrics] = {}
+_lock = threading.Lock()
+
+
+def _pool_metrics(name: str) -> PoolMetrics:
+    metrics = _metrics.get(name)
+    if metrics is None:
+        with _lock:
+            metrics = _metrics.setdefault(name, PoolMetrics())
+    return metrics
+
+
+class MeteredQueuePool(QueuePool):
+    """체크아웃 대기 시간(신규 연결 생성 포함)과 타임아웃 횟수를 기록하는 QueuePool
+
+    Notes:
+        dispose()/invalidate 로 풀이 재생성돼도 logging_name 이 유지되므로 같은 집계에 누적
+    """
+
+    def _do_get(self):
+        metrics = _pool_metrics(self._orig_logging_name or "default")
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.timeouts += 1
+            raise
+        finally:
+            metrics.observe_wait(time.perf_counter() - t0)
+
+
+def get_pooled_engine(name: str, url, connect_args: Optional[dict] = None, **kwargs) -> Engine:
+    """name 별 공유 엔진을 반환 (최초 호출 시 공통 풀 설정으로 생성)
+
+    인자:
+        name: 풀 식별자 (통계 키, 같은 이름이면 같은 엔진/풀을 공유)
+        url: SQLAlchemy URL (문자열 또는 URL 객체)
+        connect_args: DB-API connect() 추가 인자 (예: pymssql charset)
+    """
+    engine = _engines.get(name)
+    if engine is not None:
+        return engine
+    with _lock:
+        engine = _engines.get(name)
+        if engine is not None:
+            return engine
+        options = dict(
+            poolclass=MeteredQueuePool,
+            pool_size=POOL_SIZE,
+            max_overflow=POOL_MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT,
+            pool_recycle=POOL_RECYCLE,
+            pool_pre_ping=POOL_PRE_PING,
+            pool_logging_name=name,
+        )
+        options.update(kwargs)
+        engine = create_engine(url, connect_args=connect_args or {}, **options)
+        metrics = _metrics.setdefault(name, PoolMetrics())
+
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            metrics.connects += 1
+
+        @event.listens_for(engine, "invalidate")
+        def _on_invalidate(dbapi_connection, connection_record, exception):
+            metrics.invalidated += 1
+
+        _engines[name] = engine
+        return engine
+
+
+def get_pool_stats() -> Dict[str, object]:
+    """풀별 현재 상태(크기/체크아웃/오버플로)와 누적 대기 시간 통계"""
+    with _lock:
+        engines = dict(_engines)
+    pools = {}
+    for name, engine in engines.items():
+        pool = engine.pool
+        pools[name] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": getattr(pool, "_max_overflow", None),
+            **_pool_metrics(name).snapshot(),
+        }
+    return {
+        "settings": {
+            "pool_size": POOL_SIZE,
+            "max_overflow": POOL_MAX_OVERFLOW,
+            "timeout_seconds": POOL_TIMEOUT,
+            "recycle_seconds": POOL_RECYCLE,
+            "pre_ping": POOL_PRE_PING,
+        },
+        "pools": pools,
+    }
@@ -71,6 +71,12 @@ class NurseRosterConfig:
     
     # 근무 요구사항 우선순위 (0~1) - 1에 가까울수록 더 강하게 근무 요구사항 강제
     shift_requirement_priority: float = 0.8  # 근무 요구사항 우선순위
+
+    # 병렬 LNS: 라운드마다 동시에 푸는 이웃 수 (1이면 순차 LNS)
+    lns_parallelism: int = 1
+
+    # 근무 순서 규칙 인코딩: 'linear'(슬라이딩 윈도우 선형 제약) / 'automaton'(간호사별 DFA + AddAutomaton)
+    sequence_encoding: str = 'linear'
     
     def __post_init__(self):
         if self.daily_shift_requirements is None:
@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from db.client2 import get_db
+from db.async_client import get_async_db
 from db.models import Nurse, Group, Office
 from schemas.auth_schema import User as UserSchema, TokenData
 
@@ -77,15 +78,9 @@ async def logout(response: Response):
     return {"message": "Logout successful"}
 
 
-async def get_current_user_from_cookie(token: Optional[str] = Cookie(None, alias="access_token"), db: Session = Depends(get_db)):
+def _account_id_from_token(token: Optional[str]) -> Optional[str]:
     if token is None:
         return None
-
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
     try:
         token = token.replace("Bearer ", "")
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -96,8 +91,10 @@ async def get_current_user_from_cookie(token: Optional[str] = Cookie(None, alias
         token_data = TokenData(account_id=account_id)
     except JWTError:
         return None # If token is invalid, treat as not logged in
-    
-    user = get_user(db, token_data.account_id)
+    return token_data.account_id
+
+
+def _to_user_schema(user) -> Optional[UserSchema]:
     if user is None:
         return None
     
@@ -111,6 +108,21 @@ async def get_current_user_from_cookie(token: Optional[str] = Cookie(None, alias
         name = user.name
     )
 
+
+async def get_current_user_from_cookie(token: Optional[str] = Cookie(None, alias="access_token"), db: Session = Depends(get_db)):
+    account_id = _account_id_from_token(token)
+    if account_id is None:
+        return None
+    return _to_user_schema(get_user(db, account_id))
+
+
+async def get_current_user_async(token: Optional[str] = Cookie(None, alias="access_token"), db=Depends(get_async_db)):
+    """get_current_user_from_cookie 의 비동기 세션 버전 (조회 엔드포인트용, 이벤트 루프 비차단)"""
+    account_id = _account_id_from_token(token)
+    if account_id is None:
+        return None
+    return await db.run_sync(lambda s: _to_user_schema(get_user(s, account_id)))
+
 @router.get("/me", response_model=UserSchema)
 async def read_users_me(current_user: UserSchema = Depends(get_current_user_from_cookie)):
     if current_user is None:
@@ -6,8 +6,9 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from db.client2 import get_db
+from db.async_client import get_async_db
 from schemas.auth_schema import User
-from routers.auth import get_current_user_from_cookie
+from routers.auth import get_current_user_from_cookie, get_current_user_async
 from services.dashboard_service import (
     get_roster_analytics_summary,
     get_individual_analytics,
@@ -22,8 +23,8 @@ router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 async def get_dashboard_summary(
     year: Optional[int] = Query(None, description="조회할 년도"),
     month: Optional[int] = Query(None, description="조회할 월"),
-    current_user: User = Depends(get_current_user_from_cookie),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db = Depends(get_async_db)
 ):
     """
     대시보드 요약 데이터를 조회합니다.
@@ -32,12 +33,12 @@ async def get_dashboard_summary(
         if not current_user:
             raise HTTPException(status_code=401, detail="인증이 필요합니다.")
         
-        summary = get_roster_analytics_summary(
+        summary = await db.run_sync(lambda s: get_roster_analytics_summary(
             group_id=current_user.group_id,
             year=year,
             month=month,
-            db=db
-        )
+            db=s
+        ))
         return summary
     except HTTPException:
         raise
@@ -73,8 +74,8 @@ async def get_individual_dashboard(
 @router.get("/trends")
 async def get_monthly_trend(
     months: int = Query(6, description="조회할 월 수", ge=1, le=12),
-    current_user: User = Depends(get_current_user_from_cookie),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db = Depends(get_async_db)
 ):
     """
     월별 만족도 트렌드를 조회합니다.
@@ -83,11 +84,11 @@ async def get_monthly_trend(
         if not current_user:
             raise HTTPException(status_code=401, detail="인증이 필요합니다.")
         
-        trends = get_monthly_trends(
+        trends = await db.run_sync(lambda s: get_monthly_trends(
             group_id=current_user.group_id,
             months=months,
-            db=db
-        )
+            db=s
+        ))
         return trends
     except HTTPException:
         raise
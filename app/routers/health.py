@@ -13,6 +13,9 @@ from services.health_service import (
     check_service_dependencies_service,
     get_comprehensive_health_service
 )
+from services.model_cache import get_model_cache_stats
+from agents.llm_cache import get_llm_cache_stats
+from agents.llm_hedge import get_llm_latency_stats
 import logging
 import traceback
 import json
@@ -141,6 +144,24 @@ async def database_health_check(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"데이터베이스 헬스체크 실패: {str(e)}")
 
 
+@router.get("/model-cache")
+async def model_cache_health_check():
+    """
+    CP-SAT 컴파일 모델 캐시 상태 엔드포인트
+    - 프로세스 단위 적중/미스/퇴출 카운터와 보관 용량
+    """
+    try:
+        logger.info("모델 캐시 헬스체크 엔드포인트 호출됨")
+        return {
+            "status": "healthy",
+            "model_cache": get_model_cache_stats(),
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        log_health_endpoint_error("model_cache_health_check", e)
+        raise HTTPException(status_code=500, detail=f"모델 캐시 헬스체크 실패: {str(e)}")
+
+
 @router.get("/system")
 async def system_health_check():
     """
@@ -238,4 +259,24 @@ async def liveness_check():
         }
     except Exception as e:
         log_health_endpoint_error("liveness_check", e)
-        raise HTTPException(status_code=500, detail=f"생존 상태 체크 실패: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"생존 상태 체크 실패: {str(e)}") 
+
+
+@router.get("/llm-cache")
+async def llm_cache_health_check():
+    """
+    LLM 응답 캐시 / 모델 호출 상태 엔드포인트
+    - 적중률, 보관 항목 수, 적중으로 절약한 토큰/비용(USD/KRW)
+    - 모델별 지연 히스토그램과 헤지 지연값, 성공/실패/취소 수
+    """
+    try:
+        logger.info("LLM 캐시 헬스체크 엔드포인트 호출됨")
+        return {
+            "status": "healthy",
+            "llm_cache": get_llm_cache_stats(),
+            "llm_latency": get_llm_latency_stats(),
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        log_health_endpoint_error("llm_cache_health_check", e)
+        raise HTTPException(status_code=500, detail=f"LLM 캐시 헬스체크 실패: {str(e)}")
@@ -1,6 +1,7 @@
 from schemas.roster_schema import PreferenceData, PreferenceSubmit
-from routers.auth import get_current_user_from_cookie
+from routers.auth import get_current_user_from_cookie, get_current_user_async
 from db.client2 import get_db
+from db.async_client import get_async_db
 from db.models import ShiftPreference, Nurse
 from schemas.auth_schema import User as UserSchema
 from fastapi import APIRouter, Depends, HTTPException
@@ -88,10 +89,10 @@ async def get_latest_preference(
 async def get_all_preferences(
     year: int, 
     month: int,
-    current_user: UserSchema = Depends(get_current_user_from_cookie),
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user_async),
+    db = Depends(get_async_db)
 ):
     try:
-        return get_all_preferences_service(year, month, current_user, db)
+        return await db.run_sync(lambda s: get_all_preferences_service(year, month, current_user, s))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"전체 선호도 조회 실패: {str(e)}")
\ No newline at end of file
@@ -6,9 +6,10 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 from db.roster_config import NurseRosterConfig, DEFAULT_CONFIG
 from schemas.roster_schema import RosterConfigCreate, RosterConfig, PublishRequest, WantedInvokeRequest, WantedInvokeResponse, RosterRequest
-from routers.auth import get_current_user_from_cookie
+from routers.auth import get_current_user_from_cookie, get_current_user_async
 from schemas.auth_schema import User
 from db.client2 import get_db
+from db.async_client import get_async_db
 from db.models import RosterConfig as RosterConfigModel
 from schemas.auth_schema import User as UserSchema
 from db.models import Schedule, ShiftPreference, Nurse, ScheduleEntry, Shift, Group, RosterConfig, Wanted, IssuedRoster, ShiftManage
@@ -17,7 +18,7 @@ from routers.utils import get_days_in_month
 from db.nurse_config import Nurse as NurseEngine
 from services.roster_system import RosterSystem
 from datetime import date
-from services.roster_service import save_roster_config_service, get_latest_schedule_service, get_issued_schedules_service, get_schedule_status_service
+from services.roster_service import save_roster_config_service, get_latest_schedule_service, get_issued_schedules_service, get_schedule_status_service, replace_schedule_entries
 import uuid
 import pprint
 router = APIRouter(
@@ -301,18 +302,18 @@ async def get_roster_by_schedule_id(
 @router.get("/{year:int}/{month:int}/versions")
 async def get_schedule_versions(
     year: int, month: int,
-    current_user: UserSchema = Depends(get_current_user_from_cookie),
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user_async),
+    db = Depends(get_async_db)
 ):
     if not current_user or not current_user.is_head_nurse:
         raise HTTPException(status_code=403, detail="Permission denied")
 
-    schedules = db.query(Schedule).filter(
+    schedules = await db.run_sync(lambda s: s.query(Schedule).filter(
         Schedule.group_id == current_user.group_id,
         Schedule.year == year,
         Schedule.month == month,
         Schedule.dropped == False
-    ).order_by(Schedule.version.desc()).all()
+    ).order_by(Schedule.version.desc()).all())
     
     return [{
         "schedule_id": schedule.schedule_id,
@@ -327,36 +328,42 @@ async def get_schedule_versions(
 @router.get("/{year:int}/{month:int}")
 async def get_roster_for_month(
     year: int, month: int,
-    current_user: UserSchema = Depends(get_current_user_from_cookie),
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user_async),
+    db = Depends(get_async_db)
 ):
     if not current_user:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    # Get latest issued schedule for the month
-    schedule_info = db.query(Schedule).filter(
-        Schedule.group_id == current_user.group_id,
-        Schedule.year == year,
-        Schedule.month == month,
-        Schedule.status == 'issued',
-        Schedule.dropped == False
-    ).order_by(Schedule.version.desc()).first()
 
-    if not schedule_info:
-        raise HTTPException(status_code=404, detail="No issued roster found for this month.")
+    def _load(db: Session):
+        # Get latest issued schedule for the month
+        schedule_info = db.query(Schedule).filter(
+            Schedule.group_id == current_user.group_id,
+            Schedule.year == year,
+            Schedule.month == month,
+            Schedule.status == 'issued',
+            Schedule.dropped == False
+        ).order_by(Schedule.version.desc()).first()
+        if not schedule_info:
+            return None
 
-    # Get all nurses in the group
-    nurses_in_group = db.query(Nurse.nurse_id, Nurse.name, Nurse.experience).filter(
-        Nurse.group_id == current_user.group_id
-    ).order_by(Nurse.experience.desc(), Nurse.nurse_id.asc()).all()
+        # Get all nurses in the group
+        nurses_in_group = db.query(Nurse.nurse_id, Nurse.name, Nurse.experience).filter(
+            Nurse.group_id == current_user.group_id
+        ).order_by(Nurse.experience.desc(), Nurse.nurse_id.asc()).all()
 
-    # Get shift colors
-    shifts_db = db.query(Shift).all()
+        # Get shift colors
+        shifts_db = db.query(Shift).all()
+
+        # Get schedule entries
+        entries = db.query(ScheduleEntry).filter(ScheduleEntry.schedule_id == schedule_info.schedule_id).all()
+        return nurses_in_group, shifts_db, entries
+
+    loaded = await db.run_sync(_load)
+    if not loaded:
+        raise HTTPException(status_code=404, detail="No issued roster found for this month.")
+    nurses_in_group, shifts_db, entries = loaded
     shift_colors = {s.shift_id: s.color for s in shifts_db}
     
-    # Get schedule entries
-    entries = db.query(ScheduleEntry).filter(ScheduleEntry.schedule_id == schedule_info.schedule_id).all()
-    
     roster_data = {
         "year": year, "month": month,
         "days_in_month": get_days_in_month(year, month),
@@ -556,30 +563,15 @@ async def save_roster(
     if not schedule:
         raise HTTPException(status_code=404, detail="No schedule found for this month")
 
-    # Clear existing roster entries
-    db.query(ScheduleEntry).filter(ScheduleEntry.schedule_id == schedule.schedule_id).delete()
-    
-    # Save new roster entries
-    
+    # 기존 배정 삭제 + 새 배정 저장 (bulk)
+    entries = {}
     for nurse in roster:
         nurse_id = nurse.get('nurse_id') or nurse.get('id')  # 둘 다 체크
         if not nurse_id:
             continue  # nurse_id가 없으면 건너뛰기
-            
-        schedule_data = nurse.get('schedule', [])
-        for day_index, shift_id in enumerate(schedule_data):
-            if shift_id and shift_id.strip():  # 빈 값이 아닌 경우만
-                work_date = date(year, month, day_index + 1)
-                entry = ScheduleEntry(
-                    entry_id=str(uuid.uuid4().hex)[:16],
-                    schedule_id=schedule.schedule_id,
-                    nurse_id=nurse_id,
-                    work_date=work_date,
-                    shift_id=shift_id.upper()
-                )
-                db.add(entry)
-
-    db.commit()
+        entries[nurse_id] = nurse.get('schedule', [])
+    # 편집 화면의 '-' 값은 기존과 같이 그대로 저장 (빈 값만 제외)
+    replace_schedule_entries(db, schedule.schedule_id, year, month, entries, skip_codes=())
     return {"message": "Roster saved successfully"}
 
 
@@ -797,7 +789,9 @@ async def validate_roster(
                     system.roster[nurse_idx, day_idx, shift_idx] = 1
                 # else: 알 수 없는 코드 → 무시
         # ──────────────────────── 5. 위반사항 탐색 & 포매팅 ────────────────────────
-        violation_details = system._find_violations()
+        # 벡터화 엔진으로 한 번에 평가 (카운트 + 셀 마스크)
+        report = system.evaluate_violations()
+        violation_details = report.to_list()
         # print('violation_details')
         # import pprint
         # pprint.pprint(violation_details)
@@ -858,7 +852,8 @@ async def validate_roster(
         # pprint.pprint(detailed_violations)
         return {
             "violations": sorted(violation_messages),
-            "detailed_violations": detailed_violations
+            "detailed_violations": detailed_violations,
+            "violation_counts": report.counts
         }
 
     # ──────────────────────── 6. 예외 처리 ────────────────────────
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, Request, Depends
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
 from datetime import datetime
@@ -17,7 +17,14 @@ from routers.utils import Timer
 from datetime import date
 import uuid
 from services.roster_create_service import generate_roster_service, request_schedule_service, generate_roster_service_with_fixed_cells
-import boto3
+from services.job_service import (
+    submit_roster_job_service,
+    get_roster_job_service,
+    list_roster_jobs_service,
+    cancel_roster_job_service,
+    accept_roster_job_service,
+    stream_roster_job_events,
+)
 import os
 import json
 import dotenv
@@ -57,9 +64,6 @@ class HoldGenerateRequest(BaseModel):
 
 dotenv.load_dotenv()
 
-sqs = boto3.client("sqs", region_name="ap-northeast-2")
-QUEUE_URL = os.getenv("SQS_QUEUE_URL")
-
 @router.post("/roster_create/async")
 def roster_create_async(
     req: RosterRequest,
@@ -67,22 +71,104 @@ def roster_create_async(
     current_user: UserSchema = Depends(get_current_user_from_cookie),
 ):
     """
-    근무표 생성 비동기 요청 → SQS로 job 전송
+    근무표 생성 비동기 요청 → 작업 등록 후 백엔드(local 프로세스 풀 / SQS)로 제출
+    - 진행 상황은 GET /roster_create/jobs/{job_id} 로 조회
     """
-    job_body = {
-        "job_id": f"job-{current_user.account_id}-{req.year}{req.month}",
-        "nurse_id": current_user.account_id,
-        "params": req.dict(),
-    }
+    try:
+        job = submit_roster_job_service(req, current_user, db)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"작업 등록 실패: {str(e)}")
+    return {"message": "✅ Job submitted", "job": job}
+
+
+@router.get("/roster_create/jobs")
+def list_roster_jobs(
+    limit: int = 20,
+    db: Session = Depends(get_db),
+    current_user: UserSchema = Depends(get_current_user_from_cookie),
+):
+    """그룹의 최근 근무표 생성 작업 목록"""
+    try:
+        return list_roster_jobs_service(current_user, db, limit=limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"작업 목록 조회 실패: {str(e)}")
+
+
+@router.get("/roster_create/jobs/{job_id}")
+def get_roster_job(
+    job_id: str,
+    include_roster: bool = False,
+    db: Session = Depends(get_db),
+    current_user: UserSchema = Depends(get_current_user_from_cookie),
+):
+    """작업 상태/진행률/현재 최선해 목적값 조회 (include_roster=true 면 현재 incumbent 배정 포함)"""
+    try:
+        job = get_roster_job_service(job_id, current_user, db, include_roster=include_roster)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"작업 조회 실패: {str(e)}")
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
+
+
+@router.post("/roster_create/jobs/{job_id}/cancel")
+def cancel_roster_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: UserSchema = Depends(get_current_user_from_cookie),
+):
+    """작업 취소 (대기 중이면 즉시, 실행 중이면 다음 LNS 반복 경계에서 중단)"""
+    try:
+        job = cancel_roster_job_service(job_id, current_user, db)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"작업 취소 실패: {str(e)}")
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
 
-    sqs.send_message(QueueUrl=QUEUE_URL, MessageBody=json.dumps(job_body))
 
-    return {"message": "✅ Job submitted to SQS", "job": job_body}
+@router.post("/roster_create/jobs/{job_id}/accept")
+def accept_roster_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: UserSchema = Depends(get_current_user_from_cookie),
+):
+    """현재 incumbent 수락 → 탐색 조기 종료 후 현재 최선해로 근무표 저장"""
+    try:
+        job = accept_roster_job_service(job_id, current_user, db)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"현재 해 수락 실패: {str(e)}")
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
+
+
+@router.get("/roster_create/jobs/{job_id}/stream")
+def stream_roster_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: UserSchema = Depends(get_current_user_from_cookie),
+):
+    """
+    작업 진행/incumbent Server-Sent Events 스트림
+    - event: progress / incumbent / done (EventSource 로 구독)
+    """
+    try:
+        job = get_roster_job_service(job_id, current_user, db)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"작업 조회 실패: {str(e)}")
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return StreamingResponse(
+        stream_roster_job_events(job_id, current_user),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
-# [Roster] - 근무표 생성
+# [Roster] - 근무표 생성 (동기 solve 이므로 def 로 선언해 스레드풀에서 실행 → 이벤트 루프 점유 방지)
 @router.post("/roster_create/generate")
-async def generate_roster_endpoint(
+def generate_roster_endpoint(
     req: RosterRequest,
     current_user: UserSchema = Depends(get_current_user_from_cookie),
     db: Session = Depends(get_db)
@@ -108,7 +194,7 @@ async def request_schedule(
 
 # [Roster] - 고정된 셀을 반영한 근무표 생성
 @router.post("/roster_create/hold_generate")
-async def hold_generate_roster_endpoint(
+def hold_generate_roster_endpoint(
     req: HoldGenerateRequest,
     current_user: UserSchema = Depends(get_current_user_from_cookie),
     db: Session = Depends(get_db)
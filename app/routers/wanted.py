@@ -7,13 +7,15 @@ from datetime import datetime
 from schemas.roster_schema import WantedInvokeRequest, WantedInvokeResponse, WantedDeadlineRequest
 from services.graph_service import graph_service
 from pydantic import BaseModel
-from routers.auth import get_current_user_from_cookie
+from routers.auth import get_current_user_from_cookie, get_current_user_async
 from db.client2 import get_db
+from db.async_client import get_async_db
 from db.models import Wanted
 from schemas.auth_schema import User as UserSchema
 from db.models import Nurse, ShiftPreference
 from services.wanted_service import request_wanted_shifts_service
 from services.wanted_service import invoke_and_persist_wanted_service
+from services.wanted_service import analyze_pending_wishes_batch_service
 router = APIRouter(
     prefix="/wanted",
     tags=["wanted"]
@@ -36,17 +38,17 @@ async def request_wanted_shifts(
 @router.get("/status")
 async def get_wanted_status(
     year: int, month: int,
-    current_user: UserSchema = Depends(get_current_user_from_cookie),
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user_async),
+    db = Depends(get_async_db)
 ):
     if not current_user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    wanted = db.query(Wanted).filter(
+    wanted = await db.run_sync(lambda s: s.query(Wanted).filter(
         Wanted.group_id == current_user.group_id,
         Wanted.year == year,
         Wanted.month == month
-    ).first()
+    ).first())
 
     if not wanted:
         return {"status": None, "message": "wanted 작성 요청 전"}
@@ -176,6 +178,22 @@ async def invoke_graph(request: WantedInvokeRequest, current_user: UserSchema =
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+# [Wanted] - 병동 전체 미분석 근무 희망 일괄 분석 (수간호사용, 근무표 생성 전 실행)
+@router.post("/{year}/{month}/analyze-batch")
+async def analyze_pending_wishes_batch(
+    year: int,
+    month: int,
+    current_user: UserSchema = Depends(get_current_user_from_cookie),
+    db: Session = Depends(get_db)
+):
+    if not current_user or not current_user.is_head_nurse:
+        raise HTTPException(status_code=403, detail="Permission denied")
+    try:
+        return await analyze_pending_wishes_batch_service(current_user.group_id, year, month, db)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"근무 희망 일괄 분석 실패: {str(e)}")
+
     
 def parse_shift_results(
     response: List[List[Dict[str, Any]]]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional
 from datetime import datetime
 
 class ShiftManageSaveRequest(BaseModel):
@@ -58,6 +58,8 @@ class RosterRequest(BaseModel):
     algorithm: str = "cp_sat"  # "cp_sat" or "random_sampling"
     config_id: Optional[int] = None
     preceptor_gauge: Optional[int] = Field(default=None, ge=0, le=10)
+    lns_parallelism: Optional[int] = Field(default=None, ge=1, le=32)  # 병렬 LNS 이웃 수 (None이면 순차)
+    sequence_encoding: Optional[Literal["linear", "automaton"]] = None  # 근무 순서 규칙 인코딩 (None이면 linear)
 
 class PreferenceSubmit(BaseModel):
     year: int
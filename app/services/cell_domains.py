@@ -0,0 +1,72 @@
+"""
+셀 도메인 축소 모듈
+- 전체 모델을 만들기 전에 셀(간호사×날짜)마다 허용 교대 집합을 비트마스크([N, D] 정수 배열)로 계산한다
+  · 근무 구간 [join, leave] 밖: 0 (배정 없음)
+  · 고정 셀: 고정 교대 비트만 (초기 금지와 충돌하면 경고 후 고정 우선)
+  · 야간 전담(is_night_nurse == 3): D/E 비트 제거
+  · 초기 금지 셀(전월 경계: N→D, E→D, 연속 N 상한 등): 해당 교대 비트 제거
+- 허용 비트에만 BoolVar 를 만들고 나머지는 상수로 둔다 (허용 교대가 하나뿐인 셀은 고정 셀처럼 상수 1)
+  → X == 0 / X == 1 고정 제약과 그 변수가 모델에서 빠져 presolve·LNS 반복마다 다루는 모델이 작아진다
+"""
+from typing import Dict, List, Mapping, Tuple
+
+import numpy as np
+
+
+def _mask_dtype(num_shifts: int):
+    return np.uint8 if num_shifts <= 8 else np.uint32
+
+
+def allowed_shift_masks(rs, join: List[int], leave: List[int],
+                        fixed: Mapping[Tuple[int, int], int]) -> np.ndarray:
+    """[N, D] 허용 교대 비트마스크 (bit s = 교대 index s 허용)"""
+    N, D = len(rs.nurses), rs.num_days
+    shift_types = rs.config.shift_types
+    S = len(shift_types)
+    dtype = _mask_dtype(S)
+    full = (1 << S) - 1
+
+    days = np.arange(D)
+    in_window = (days[None, :] >= np.asarray(join)[:, None]) & (days[None, :] <= np.asarray(leave)[:, None])
+    masks = np.where(in_window, full, 0).astype(dtype)
+
+    night_only = np.array([nu.is_night_nurse == 3 for nu in rs.nurses], dtype=bool)
+    if night_only.any():
+        day_eve = (1 << shift_types.index('D')) | (1 << shift_types.index('E'))
+        masks[night_only] &= dtype(full & ~day_eve)
+
+    forbidden = getattr(rs, 'initial_forbidden', None)
+    if isinstance(forbidden, dict):
+        for (n, d), code_list in forbidden.items():
+            if not (0 <= n < N and 0 <= d < D):
+                continue
+            for code in (code_list or []):
+                if code not in shift_types:
+                    continue
+                s_idx = shift_types.index(code)
+                if fixed.get((n, d)) == s_idx:
+                    print(f"[CP-SAT-Basic] 경고: 초기 금지와 고정 충돌 (n={n}, d={d+1}, code={code}) → 고정 우선")
+                masks[n, d] &= dtype(full & ~(1 << s_idx))
+
+    # 고정 셀은 다른 규칙과 무관하게 고정 교대만
+    for (n, d), s_idx in fixed.items():
+        if join[n] <= d <= leave[n]:
+            masks[n, d] = 1 << s_idx
+    return masks
+
+
+def single_shift_cells(masks: np.ndarray) -> Dict[Tuple[int, int], int]:
+    """허용 교대가 정확히 하나인 셀 → {(n, d): 교대 index}"""
+    ns, ds = np.nonzero((masks != 0) & ((masks & (masks - 1)) == 0))
+    shifts = np.log2(masks[ns, ds]).astype(int) if ns.size else ns
+    return {(int(n), int(d)): int(s) for n, d, s in zip(ns, ds, shifts)}
+
+
+def cell_lookup(Xv: Mapping[Tuple[int, int, int], object], fixed: Mapping[Tuple[int, int], int]):
+    """X(n, d, s): 변수가 있으면 BoolVar, 없으면 상수 (고정/단일 허용 셀의 교대는 1, 그 외 0)"""
+    def X(n, d, s):
+        v = Xv.get((n, d, s))
+        if v is not None:
+            return v
+        return 1 if fixed.get((n, d)) == s else 0
+    return X
@@ -1,13 +1,23 @@
 from datetime import date, datetime, timedelta
+import os
 import time
 import numpy as np
 from typing import List, Dict, Optional, Tuple
 from db.roster_config import NurseRosterConfig
 from db.nurse_config import Nurse
 from services.roster_system import RosterSystem
+from services.roster_violations import evaluate_hard_violations
+from services.roster_assignment import UNASSIGNED, as_assignment, empty_assignment
+from services.model_cache import compiled_model_cache, model_fingerprint
+from services.cell_domains import allowed_shift_masks, cell_lookup, single_shift_cells
+from services.objective_compiler import ObjectiveCompiler, preference_weights
+from services.sequence_automaton import SEQUENCE_ENCODINGS, SequenceRules, add_sequence_automaton, compile_sequence_automaton
+from services import job_progress
 import numpy as np
 from collections import defaultdict
 import random
+import threading
+from ortools.sat.python import cp_model
 # ─────────────────────────────  RL Neighborhood  ─────────────────────────
 class RLNeighborhoodPolicy:
     """아주 가벼운 ε-greedy 정책"""
@@ -28,6 +38,25 @@ class RLNeighborhoodPolicy:
         self.eps = max(self.eps_end, self.eps*self.decay)
         return n_sel, d_sel
 
+    def select_many(self, count, k_n=4, k_d=7):
+        """간호사 집합이 서로 겹치지 않는 이웃을 최대 count 개 뽑는다 (병렬 LNS용)"""
+        picks, avail = [], np.arange(self.N)
+        for _ in range(count):
+            if len(avail) == 0: break
+            k = min(k_n, len(avail))
+            if random.random() < self.eps:                      # explore
+                n_sel = random.sample(list(avail), k=k)
+                d_sel = random.sample(range(self.D), k=min(k_d,self.D))
+            else:                                               # exploit
+                w = self.n_w[avail]
+                n_sel = list(np.random.choice(avail,k,replace=False,p=w/w.sum()))
+                d_sel = list(np.random.choice(self.D,min(k_d,self.D),replace=False,
+                                              p=self.d_w/self.d_w.sum()))
+            self.eps = max(self.eps_end, self.eps*self.decay)
+            picks.append(([int(n) for n in n_sel], [int(d) for d in d_sel]))
+            avail = np.setdiff1d(avail, n_sel)
+        return picks
+
     def update(self, ok: bool, n_sel, d_sel):
         delta = 2.0 if ok else -1.0
         self.n_w[n_sel] += delta;  self.n_w = np.clip(self.n_w, .1, None)
@@ -106,7 +135,11 @@ class CPSATBasicEngine:
             preceptor_strength_multiplier=config_data.get('preceptor_strength_multiplier', 1.0),
             preceptor_top_days=config_data.get('preceptor_top_days', 12),
             preceptor_min_pair_weight=config_data.get('preceptor_min_pair_weight', 5.0),
-            preceptor_focus_shifts=config_data.get('preceptor_focus_shifts', None)
+            preceptor_focus_shifts=config_data.get('preceptor_focus_shifts', None),
+            # 병렬 LNS: 동시에 푸는 이웃 수 (1이면 순차)
+            lns_parallelism=max(1, int(config_data.get('lns_parallelism') or 1)),
+            # 근무 순서 규칙 인코딩 ('linear' / 'automaton')
+            sequence_encoding=config_data.get('sequence_encoding') if config_data.get('sequence_encoding') in SEQUENCE_ENCODINGS else 'linear'
         )
         # 일자별 요구치가 있으면 구성에 부가 속성으로 저장
         try:
@@ -336,6 +369,11 @@ class CPSATBasicEngine:
                             d = d_str
                         init_forb.setdefault((n_idx, d), set()).update(codes)
                 roster_system.initial_forbidden = init_forb
+            # 직전 버전 근무표 → CP-SAT 힌트 (재생성 warm-start)
+            warm_start = config_data.get('warm_start') or {}
+            if warm_start:
+                roster_system.warm_start_hint = self._build_warm_start_hint(
+                    roster_system, warm_start, rs_dbid_to_idx, grouped)
         # 5. 선호도 데이터 파싱 및 적용
         with Timer("선호도 데이터 파싱"):
             shift_preferences, off_requests, pair_preferences = self.parse_preferences_from_db(prefs_data)
@@ -401,7 +439,11 @@ class CPSATBasicEngine:
         with Timer("CP-SAT으로 최적화"):
             print(f"{self.logger_prefix} CP-SAT 최적화 시작 (시간 제한: {time_limit_seconds}초)...")
             success = self._optimize_with_enhanced_constraints(roster_system, time_limit_seconds, nurses, grouped, randomize=randomize, seed=seed)
-            if not success:
+            # 수락 요청이어도 배정된 incumbent 가 없으면 폴백으로 해를 만든다
+            has_incumbent = bool((roster_system.assignment != UNASSIGNED).any())
+            if not success and has_incumbent and job_progress.accept_requested():
+                print(f"{self.logger_prefix} 현재 해 수락 요청 → 폴백 없이 현재 incumbent 로 종료")
+            elif not success:
                 print(f"{self.logger_prefix} 개선된 제약사항으로 실패, 기본 알고리즘으로 폴백...")
                 self._optimize_fallback_lex_hard_first(roster_system, time_limit_seconds=time_limit_seconds, grouped=grouped)
         # 10. 결과 변환
@@ -443,7 +485,8 @@ class CPSATBasicEngine:
         return {
             "roster": result,
             "satisfaction_data": satisfaction_data,
-            "roster_system": roster_system
+            "roster_system": roster_system,
+            "lns_stats": getattr(roster_system, 'lns_stats', [])
         }
 
 
@@ -462,47 +505,129 @@ class CPSATBasicEngine:
         feasible = self._quick_initial_solve(
             roster_system, base_tl, grouped, run_seed)
 
-        # hard 위반 수 세는 헬퍼
-        HARD_TYPES = {
-            'shift_requirement', 'max_consecutive_night',
-            'max_consecutive_work', 'night_after_limit',
-            'day_after_evening', 'night_monthly_limit'
-        }
-        def hard_violation_cnt():
-            return sum(1 for v in roster_system._find_violations()
-                       if v['type'] in HARD_TYPES)
-
-        best_viol = hard_violation_cnt()
-        best_roster = roster_system.roster.copy()
+        # hard 위반: 초기 1회 전체 평가 후, 이웃 구간만 증분 평가(undo 로그로 롤백)
+        best_viol = roster_system.begin_incremental_scoring()
+        job_progress.report_progress(0.3, getattr(roster_system, 'incumbent_objective', None),
+                                     f"초기해 완료 (하드위반 {best_viol})")
+        if feasible:
+            _report_roster_incumbent(roster_system, getattr(roster_system, 'incumbent_objective', None), best_viol)
         # ② RL 정책
         policy = RLNeighborhoodPolicy(len(roster_system.nurses),
                                       roster_system.num_days)
         remaining = time_limit_seconds - base_tl
         per_iter  = 8          # neighbourhood solve 8 초
         max_iter  = max(1, remaining // per_iter)
-        if max_iter==0:
+        # 초기해(예: warm-start)가 이미 하드 위반 0이면 LNS 는 하드 위반 감소만 수락하므로 생략
+        if max_iter==0 or best_viol==0 or job_progress.interrupt_requested():
 
             return best_viol==0
+        parallelism = int(getattr(roster_system.config, 'lns_parallelism', 1) or 1)
+        if parallelism > 1:
+            best_viol = self._optimize_parallel_lns(
+                roster_system, grouped, run_seed, best_viol, max_iter, per_iter, parallelism)
+            return best_viol==0
+        # 전체 모델은 한 번만 빌드, 반복마다 neighbourhood 밖 셀만 고정/해제
+        nbhd_model = NeighbourhoodModel(roster_system, grouped)
         for it in range(max_iter):
+            if job_progress.interrupt_requested():
+                print(f"{self.logger_prefix} 작업 취소/수락 요청 → LNS 중단 (반복 {it})"); break
+            n_sel, d_sel = policy.select()
+            roster_system.mark_cells(n_sel, d_sel)
             try:
-                n_sel, d_sel = policy.select()
                 ok = _solve_neighbourhood(roster_system, n_sel, d_sel,
-                                      per_iter, grouped, run_seed, it = it)
+                                      per_iter, grouped, run_seed, it = it,
+                                      nbhd_model=nbhd_model)
             except Exception as e:
-                print(e)
-            if not ok: policy.update(False, n_sel, d_sel); continue
-            curr_viol = hard_violation_cnt()
+                print(e); ok = False
+            if not ok:
+                roster_system.undo_cells(); policy.update(False, n_sel, d_sel); continue
+            curr_viol = roster_system.rescore_cells()
             improved  = curr_viol < best_viol
             if improved:
-                best_viol = curr_viol;  best_roster = roster_system.roster.copy()
-            else:  # rollback
-                roster_system.roster = best_roster.copy()
+                best_viol = curr_viol;  roster_system.commit_cells()
+                _report_roster_incumbent(roster_system, None, best_viol)
+            else:  # rollback (변경 셀만 복원)
+                roster_system.undo_cells()
             policy.update(improved, n_sel, d_sel)
+            job_progress.report_progress(0.3 + 0.6 * (it + 1) / max_iter, None,
+                                         f"LNS {it + 1}/{max_iter} (하드위반 {best_viol})")
             if best_viol==0: break
-        roster_system.roster = best_roster
         return best_viol==0
 
 
+    def _optimize_parallel_lns(
+        self, roster_system: RosterSystem, grouped, run_seed: int | None,
+        best_viol: int, rounds: int, per_iter: int, parallelism: int
+    ) -> int:
+        """병렬 포트폴리오 LNS.
+
+        라운드마다 간호사가 겹치지 않는 이웃 parallelism 개를 프로세스 풀에서 동시에 풀고,
+        결과 블록을 하나씩 증분 평가해 하드 위반이 줄어드는 블록만 병합한다
+        (같은 날 커버리지를 공유하므로 병합 후 재평가로 충돌을 걸러냄).
+        각 워커 프로세스는 시작 시 영속 이웃 모델을 한 번만 빌드한다.
+
+        Returns:
+            int: 최종 하드 위반 수
+        """
+        import multiprocessing as mp
+        from concurrent.futures import ProcessPoolExecutor
+
+        policy = RLNeighborhoodPolicy(len(roster_system.nurses), roster_system.num_days)
+        # 코어를 이웃 수로 나눠 작은 워커 수로 각 서브문제를 푼다
+        workers_per_solve = max(1, (os.cpu_count() or 2) // parallelism)
+        print(f"{self.logger_prefix} 병렬 LNS: 이웃 {parallelism}개 × 워커 {workers_per_solve}개")
+        stats = []
+        # spawn: API 서버 스레드 상태를 fork 로 복제하지 않도록
+        with ProcessPoolExecutor(max_workers=parallelism, mp_context=mp.get_context('spawn'),
+                                 initializer=_lns_worker_init,
+                                 initargs=(roster_system, grouped)) as pool:
+            for it in range(rounds):
+                if job_progress.interrupt_requested():
+                    print(f"{self.logger_prefix} 작업 취소/수락 요청 → 병렬 LNS 중단 (라운드 {it})"); break
+                picks = policy.select_many(parallelism)
+                t0 = time.time()
+                futures = [
+                    pool.submit(_lns_worker_solve, roster_system.assignment, n_sel, d_sel,
+                                per_iter, run_seed, it * parallelism + k, workers_per_solve)
+                    for k, (n_sel, d_sel) in enumerate(picks)
+                ]
+                results = []
+                for f in futures:
+                    try:
+                        results.append(f.result())
+                    except Exception as e:
+                        print(e); results.append((False, None, 0.0))
+                wall = time.time() - t0
+
+                accepted = 0
+                for (n_sel, d_sel), (ok, block, _) in zip(picks, results):
+                    if not ok:
+                        policy.update(False, n_sel, d_sel); continue
+                    roster_system.mark_cells(n_sel, d_sel)
+                    roster_system.assignment[np.ix_(n_sel, d_sel)] = block
+                    curr_viol = roster_system.rescore_cells()
+                    improved = curr_viol < best_viol
+                    if improved:
+                        best_viol = curr_viol; roster_system.commit_cells(); accepted += 1
+                    else:
+                        roster_system.undo_cells()
+                    policy.update(improved, n_sel, d_sel)
+
+                if accepted:
+                    _report_roster_incumbent(roster_system, None, best_viol)
+                busy = sum(r[2] for r in results)
+                speedup = busy / wall if wall > 0 else 0.0
+                stats.append({'round': it, 'neighbourhoods': len(picks), 'accepted': accepted,
+                              'wall_s': round(wall, 2), 'solve_s': round(busy, 2),
+                              'speedup': round(speedup, 2), 'hard_violations': best_viol})
+                print(f"{self.logger_prefix} 병렬 LNS 라운드 {it}: 이웃 {len(picks)}개, 수락 {accepted}, "
+                      f"wall {wall:.2f}s, 합계 {busy:.2f}s, 속도향상 {speedup:.2f}x, 하드위반 {best_viol}")
+                job_progress.report_progress(0.3 + 0.6 * (it + 1) / rounds, None,
+                                             f"병렬 LNS {it + 1}/{rounds} (하드위반 {best_viol})")
+                if best_viol == 0: break
+        roster_system.lns_stats = stats
+        return best_viol
+
     # ────────────────────────────────────────────────────────────────────
     #                    ※ 아래는 helper 들 – 모두 완전판               │
     # ────────────────────────────────────────────────────────────────────
@@ -777,7 +902,10 @@ class CPSATBasicEngine:
             # stage별 목적/고정
             if stage == 1:
                 # 커버리지: shortage 우선, over는 약벌
-                m.Minimize(1000 * sum(short_terms) + sum(over_terms))
+                obj = ObjectiveCompiler("폴백 1단계")
+                obj.add_terms((1000, v) for v in short_terms)
+                obj.add_terms((1, v) for v in over_terms)
+                obj.minimize(m)
             elif stage == 2:
                 # 1단계 최솟값 고정 + over 상한 유지
                 if coverage_eq is not None:
@@ -785,10 +913,10 @@ class CPSATBasicEngine:
                 if over_le is not None:
                     m.Add(sum(over_terms) <= over_le)
                 # 모든 안전 위반의 합 최소화(정량)
-                safety_sum = []
+                obj = ObjectiveCompiler("폴백 2단계")
                 for k, arr in safety.items():
-                    safety_sum.extend(arr)
-                m.Minimize(sum(safety_sum))
+                    obj.add_terms((1, v) for v in arr)
+                obj.minimize(m)
             else:
                 # 1,2단계 고정 + 2단계에서 0이었던 위반은 0으로 잠금(새 위반 금지)
                 if coverage_eq is not None:
@@ -801,12 +929,9 @@ class CPSATBasicEngine:
                             # v는 0/1 또는 정수슬랙(>=0). 0 고정.
                             m.Add(v == 0)
                 # 선호/공정성 최대화
-                obj = []
-                P = roster_system.preference_matrix
-                for n in range(N):
-                    for d in range(join[n], leave[n] + 1):
-                        for s in range(S):
-                            obj.append(int(P[n, d, s] * 100) * X(n, d, s))
+                obj = ObjectiveCompiler("폴백 3단계")
+                obj.add_assignment_weights(X, preference_weights(roster_system.preference_matrix),
+                                           ((n, d) for n in range(N) for d in range(join[n], leave[n] + 1)), fixed)
                 # 경력자 부족 약벌
                 for d in range(D):
                     for code in ('D', 'E', 'N'):
@@ -816,8 +941,8 @@ class CPSATBasicEngine:
                                            if join[n] <= d <= leave[n] and nu.experience_years >= cfg.min_experience_per_shift)
                         shortage = m.NewIntVar(0, cfg.required_experienced_nurses, f'expShort_fb_{d}_{code}')
                         m.Add(shortage >= cfg.required_experienced_nurses - exp_assigned)
-                        obj.append(-100 * shortage)
-                m.Maximize(sum(obj))
+                        obj.add(-100, shortage)
+                obj.maximize(m)
 
             return m, X, short_terms, over_terms, safety
 
@@ -846,12 +971,12 @@ class CPSATBasicEngine:
             st2 = s2.Solve(m2)
             if st2 not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
                 print(f"{self.logger_prefix} 폴백2 실패: 단계 불가능 → 1단계 해 사용")
-                roster_system.roster.fill(0)
+                roster_system.assignment.fill(UNASSIGNED)
                 for n in range(N):
                     for d in range(join[n], leave[n] + 1):
                         for s in range(S):
                             if s1.Value(X1(n, d, s)):
-                                roster_system.roster[n, d, s] = 1
+                                roster_system.assignment[n, d] = s
                 return best_short == 0
             # 안전 위반 총합 및 0-위치 목록 수집
             stage2_zero_locks = {}
@@ -890,21 +1015,21 @@ class CPSATBasicEngine:
             st3 = s3.Solve(m3)
             if st3 not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
                 print(f"{self.logger_prefix} 폴백3 실패: 선호 단계 불가능 → 2단계 해 사용")
-                roster_system.roster.fill(0)
+                roster_system.assignment.fill(UNASSIGNED)
                 for n in range(N):
                     for d in range(join[n], leave[n] + 1):
                         for s in range(S):
                             if s2.Value(X2(n, d, s)):
-                                roster_system.roster[n, d, s] = 1
+                                roster_system.assignment[n, d] = s
                 return best_short == 0 and best_safe_sum == 0
 
         # stage3 해 반영
-        roster_system.roster.fill(0)
+        roster_system.assignment.fill(UNASSIGNED)
         for n in range(N):
             for d in range(join[n], leave[n] + 1):
                 for s in range(S):
                     if s3.Value(X3(n, d, s)):
-                        roster_system.roster[n, d, s] = 1
+                        roster_system.assignment[n, d] = s
 
         print(f"{self.logger_prefix} 폴백 완료: 커버리지부족={best_short}, 안전위반합={best_safe_sum}")
         return best_short == 0 and best_safe_sum == 0
@@ -913,7 +1038,11 @@ class CPSATBasicEngine:
                              tl:int, grouped, run_seed: int | None = None):
         from ortools.sat.python import cp_model
         model,X,j,l,fixed = _build_full_model(rs,grouped)
+        n_hint = _add_warm_start_hints(model, X, rs, j, l, fixed)
         solver=cp_model.CpSolver()
+        if n_hint:
+            # 편집으로 힌트 일부가 불가능해졌을 수 있으므로 힌트 보정 허용
+            solver.parameters.repair_hint = True
         # ▼▼ 랜덤화 추가 ▼▼
         # seed = getattr(rs.config, 'random_seed', None)
         # if seed is None:
@@ -927,16 +1056,39 @@ class CPSATBasicEngine:
         solver.parameters.max_time_in_seconds=tl
         solver.parameters.num_search_workers=2
         solver.parameters.relative_gap_limit = 0.1
-        stat=solver.Solve(model)
+        # 비동기 작업이면 개선 incumbent 마다 스트리밍, 취소/수락 요청 시 탐색 중단
+        callback = IncumbentCallback(rs, X, j, l) if job_progress.has_incumbent_listener() else None
+        with InterruptWatcher(solver):
+            stat = solver.Solve(model, callback) if callback else solver.Solve(model)
+        if callback:
+            print(f"[CP-SAT-Basic] 초기해 incumbent {callback.solution_count}개 수신, 보고 {callback.reported}개")
         if stat not in (cp_model.OPTIMAL,cp_model.FEASIBLE): return False
-        rs.roster.fill(0)
+        rs.incumbent_objective = solver.ObjectiveValue()
+        rs.assignment.fill(UNASSIGNED)
         N,D,S=len(rs.nurses),rs.num_days,rs.config.num_shifts
         for n in range(N):
             for d in range(j[n],l[n]+1):
                 for s in range(S):
-                    if solver.Value(X(n,d,s)): rs.roster[n,d,s]=1
+                    if solver.Value(X(n,d,s)): rs.assignment[n,d]=s
         return True
     
+    def _build_warm_start_hint(self, rs: RosterSystem, warm_start: Dict[str, List[str]],
+                               dbid_to_idx: Dict[str, int], grouped) -> np.ndarray:
+        """{nurse_db_id: [코드(1일..말일)]} → [N, D] 교대 인덱스 힌트 행렬 (-1: 힌트 없음)"""
+        code2main = {c: r['main_code'] for r in (grouped or []) for c in r['codes']}
+        shift_pos = {c: i for i, c in enumerate(rs.config.shift_types)}
+        hint = np.full((len(rs.nurses), rs.num_days), -1, dtype=np.int16)
+        for dbid, codes in warm_start.items():
+            n = dbid_to_idx.get(dbid)
+            if n is None:
+                continue
+            for d, code in enumerate(codes[:rs.num_days]):
+                s = shift_pos.get(code2main.get(code, code))
+                if s is not None:
+                    hint[n, d] = s
+        print(f"{self.logger_prefix} warm-start 힌트 {int((hint >= 0).sum())}셀 로딩")
+        return hint
+
     def _convert_result_to_db_format(self, roster_system: RosterSystem, nurses: List[Nurse]) -> Dict[str, List[str]]:
         """RosterSystem 결과를 DB 형식으로 변환 (고정된 셀은 원래 값으로 반환)"""
         result = {}
@@ -946,6 +1098,7 @@ class CPSATBasicEngine:
         if fixed:
             for cell in fixed:
                 fixed_lookup[(cell['nurse_index'], cell['day_index'])] = cell['shift']
+        assignment = roster_system.assignment
         for n_idx, nurse in enumerate(nurses):
             nurse_schedule = []
             for day_idx in range(roster_system.num_days):
@@ -953,10 +1106,9 @@ class CPSATBasicEngine:
                 if (n_idx, day_idx) in fixed_lookup:
                     nurse_schedule.append(fixed_lookup[(n_idx, day_idx)])
                     continue
-                shift_vector = roster_system.roster[n_idx, day_idx]
-                shift_idx = np.where(shift_vector == 1)[0]
-                if len(shift_idx) > 0:
-                    shift_id = shift_map[shift_idx[0]]
+                shift_idx = int(assignment[n_idx, day_idx])
+                if shift_idx != UNASSIGNED:
+                    shift_id = shift_map[shift_idx]
                     # if shift_id == 'OFF':
                     #     shift_id = 'O'
                     nurse_schedule.append(shift_id)
@@ -1056,9 +1208,10 @@ class CPSATBasicEngine:
                         continue
                     same_shift_days = 0
                     both_worked_days = 0
+                    assignment = roster_system.assignment
                     for d in range(roster_system.num_days):
-                        s1 = int(np.argmax(roster_system.roster[n1, d]))
-                        s2 = int(np.argmax(roster_system.roster[n2, d]))
+                        s1 = int(assignment[n1, d])
+                        s2 = int(assignment[n2, d])
                         if s1 != off_idx and s2 != off_idx:
                             both_worked_days += 1
                             if s1 == s2 and s1 in work_shift_idxs:
@@ -1078,6 +1231,24 @@ class CPSATBasicEngine:
 # ================== Helper 함수 ==========================
 
 def _build_full_model(rs: RosterSystem, grouped, include_pair_objective: bool = True):
+    """입력 지문이 같으면 캐시된 컴파일 모델 사본을, 아니면 새로 빌드한 모델을 반환한다.
+
+    캐시 모델은 페어 보너스 없이 컴파일하므로 초기해와 LNS 모델이 같은 항목을 쓰고,
+    include_pair_objective 이면 받은 사본에 프리셉터 항을 더해 목적식을 다시 건다.
+    """
+    key = model_fingerprint(rs, grouped)
+    m, X, join, leave, fixed, obj = compiled_model_cache.get_or_build(
+        key, lambda: _compile_full_model(rs, grouped, include_pair_objective=False, return_objective=True))
+    if include_pair_objective:
+        pair_terms = _add_preceptor_objective_terms(m, rs, X, join, leave)
+        if pair_terms:
+            obj.add_terms(pair_terms)
+            obj.maximize(m)
+    return m, X, join, leave, fixed
+
+
+def _compile_full_model(rs: RosterSystem, grouped, include_pair_objective: bool = True,
+                        return_objective: bool = False):
     from ortools.sat.python import cp_model
     m = cp_model.CpModel()
     N,D,S = len(rs.nurses), rs.num_days, rs.config.num_shifts
@@ -1091,46 +1262,45 @@ def _build_full_model(rs: RosterSystem, grouped, include_pair_objective: bool =
     # 고정 셀 (수간호사 등)
     code2main = {c:r['main_code']
                  for r in (grouped or []) for c in r['codes']}
-    fixed, fixed_cnt = {}, [[0]*S for _ in range(D)]
+    fixed = {}
     for c in getattr(rs,'fixed_cells',[]) or []:
         n,d = c['nurse_index'], c['day_index']
         s_main = code2main.get(c['shift'], c['shift'])
         s_idx  = rs.config.shift_types.index(s_main)
-        fixed[(n,d)] = s_idx; fixed_cnt[d][s_idx]+=1
-
+        if not join[n] <= d <= leave[n]:
+            print(f"[CP-SAT-Basic] 경고: 근무 구간 밖 고정 셀 무시 (n={n}, d={d+1}, code={c['shift']})")
+            continue
+        fixed[(n,d)] = s_idx
+
+    # ───────────── 2-A. 셀 도메인 축소 (고정/야간 전담/초기 금지) ─────────────
+    # 허용 교대가 하나뿐인 셀은 고정 셀과 같이 상수로 취급
+    masks = allowed_shift_masks(rs, join, leave, fixed)
+    for cell, s_idx in single_shift_cells(masks).items():
+        fixed.setdefault(cell, s_idx)
+    fixed_cnt = [[0]*S for _ in range(D)]
+    for (n,d),s_idx in fixed.items():
+        fixed_cnt[d][s_idx]+=1
 
-    # 변수
+    # 변수: 허용 비트에만 생성, 나머지는 상수
     Xv={}
     for n in range(N):
         for d in range(join[n], leave[n]+1):
+            if (n,d) in fixed: continue
+            mask = int(masks[n,d])
             for s in range(S):
-                Xv[n,d,s]=m.NewBoolVar(f'x_{n}_{d}_{s}')
-    def X(n,d,s):  return Xv.get((n,d,s),0)
-    
-    # ───────────── 2-A. 고정 셀  ─────────────
-    for (n,d),s_idx in fixed.items():
-        m.Add(X(n,d,s_idx)==1)
-        for s in range(S):
-            if s!=s_idx: m.Add(X(n,d,s)==0)
-    # ───────────── 2-A2. 초기 금지 셀(경계 제약) ─────────────
-    try:
-        if hasattr(rs, 'initial_forbidden') and isinstance(rs.initial_forbidden, dict):
-            for (n, d), code_list in rs.initial_forbidden.items():
-                for code in (code_list or []):
-                    if code not in rs.config.shift_types:
-                        continue
-                    s_idx = rs.config.shift_types.index(code)
-                    if (n,d) in fixed and fixed[(n,d)] == s_idx:
-                        print(f"[CP-SAT-Basic] 경고: 초기 금지와 고정 충돌 (n={n}, d={d+1}, code={code})")
-                    m.Add(X(n,d,s_idx)==0)
-    except Exception as e:
-        print(f"[CP-SAT-Basic] 초기 금지 셀 적용 중 오류: {e}")
+                if mask >> s & 1:
+                    Xv[n,d,s]=m.NewBoolVar(f'x_{n}_{d}_{s}')
+    X = cell_lookup(Xv, fixed)
+    dense = sum(leave[n]-join[n]+1 for n in range(N)) * S
+    print(f"[CP-SAT-Basic] 셀 도메인 축소: 변수 {dense} → {len(Xv)} (상수 셀 {len(fixed)})")
 
     # ───────────── 2-B. Exactly-one ──────────
     for n in range(N):
         for d in range(join[n], leave[n]+1):
             if (n,d) in fixed: continue
-            m.AddExactlyOne(X(n,d,s) for s in range(S))
+            if masks[n,d] == 0:
+                print(f"[CP-SAT-Basic] 경고: 허용 교대가 없는 셀 (n={n}, d={d+1})")
+            m.AddExactlyOne(X(n,d,s) for s in range(S) if masks[n,d] >> s & 1)
 
     # ───────────── 2-C. Shift requirements (per-day, slack 허용) ───
     coverage_shortage_vars = []
@@ -1165,28 +1335,33 @@ def _build_full_model(rs: RosterSystem, grouped, include_pair_objective: bool =
     cfg = rs.config
     K   = cfg.max_consecutive_work_days
     L   = cfg.max_consecutive_nights
+    # 순서 규칙(전이 금지/연속 상한/N3·N2→OFF/NOD·NOE/고립 OFF) 인코딩 방식
+    use_automaton = getattr(cfg, 'sequence_encoding', 'linear') == 'automaton'
+    automaton = compile_sequence_automaton(SequenceRules.from_config(cfg)) if use_automaton else None
+    seq_penalties = {}
 
     for n,nu in enumerate(rs.nurses):
         T0,T1 = join[n], leave[n]
-        # 연속 근무 K+1 중 OFF ≥1
-        for d0 in range(T0, T1-K+1):
-            m.Add(sum(X(n,d0+t,off) for t in range(K+1)) >= 1)
-
-        # E→D, N→D, N→E
-        for d in range(T0+1, T1+1):
-            m.Add(X(n,d,day)+X(n,d-1,night)<=1)  # N→D 금지
-            if cfg.banned_day_after_eve:
-                m.Add(X(n,d,day)+X(n,d-1,eve)<=1)   # E→D 금지
-                m.Add(X(n,d,eve)+X(n,d-1,night)<=1) # N→E 금지
-
-        # Night-전담
-        if nu.is_night_nurse == 3:
-            for d in range(T0,T1+1):
-                m.Add(X(n,d,day)==0); m.Add(X(n,d,eve)==0)
+        if use_automaton:
+            seq_penalties[n] = add_sequence_automaton(m, X, n, T0, T1, automaton)
+        else:
+            # 연속 근무 K+1 중 OFF ≥1
+            for d0 in range(T0, T1-K+1):
+                m.Add(sum(X(n,d0+t,off) for t in range(K+1)) >= 1)
+
+            # E→D, N→D, N→E
+            for d in range(T0+1, T1+1):
+                m.Add(X(n,d,day)+X(n,d-1,night)<=1)  # N→D 금지
+                if cfg.banned_day_after_eve:
+                    m.Add(X(n,d,day)+X(n,d-1,eve)<=1)   # E→D 금지
+                    m.Add(X(n,d,eve)+X(n,d-1,night)<=1) # N→E 금지
+
+        # Night-전담 D/E 금지는 셀 도메인(2-A)에서 변수 자체를 만들지 않음
 
         # 연속 Night
-        for d0 in range(T0, T1-L+1):
-            m.Add(sum(X(n,d0+t,night) for t in range(L+1)) <= L)
+        if not use_automaton:
+            for d0 in range(T0, T1-L+1):
+                m.Add(sum(X(n,d0+t,night) for t in range(L+1)) <= L)
 
         # 월 Night 상한
         m.Add(sum(X(n,d,night) for d in range(T0,T1+1))
@@ -1203,6 +1378,8 @@ def _build_full_model(rs: RosterSystem, grouped, include_pair_objective: bool =
             pass
 
         # N2/3→2OFF
+        if use_automaton:
+            continue
         if cfg.two_offs_after_three_nig:
             for d in range(T0+2,T1-1):
                 m.Add(sum(X(n,d-t,night) for t in (0,1,2))-2
@@ -1213,12 +1390,9 @@ def _build_full_model(rs: RosterSystem, grouped, include_pair_objective: bool =
                       <= X(n,d+1,off)+X(n,d+2,off))
 
     # ───────────── 4. Soft (패널티 변수) ───────
-    obj=[]
-    P = rs.preference_matrix
-    for n in range(N):
-        for d in range(join[n], leave[n]+1):
-            for s in range(S):
-                obj.append(int(P[n,d,s]*100)*X(n,d,s))
+    obj = ObjectiveCompiler("전체 모델")
+    obj.add_assignment_weights(X, preference_weights(rs.preference_matrix),
+                               ((n,d) for n in range(N) for d in range(join[n], leave[n]+1)), fixed)
 
     # (4-1) 경력자 부족
     for d in range(D):
@@ -1230,7 +1404,7 @@ def _build_full_model(rs: RosterSystem, grouped, include_pair_objective: bool =
                                nu.experience_years>=cfg.min_experience_per_shift)
             shortage = m.NewIntVar(0, cfg.required_experienced_nurses, f'expShort_{d}_{code}')
             m.Add(shortage >= cfg.required_experienced_nurses - exp_assigned)
-            obj.append(-200*shortage)
+            obj.add(-200, shortage)
 
     # (4-2) 주 2 OFF
     if cfg.enforce_two_offs_per_week:
@@ -1241,7 +1415,7 @@ def _build_full_model(rs: RosterSystem, grouped, include_pair_objective: bool =
                 offs=sum(X(n,d,off) for d in range(d0,d1)
                          if join[n]<=d<=leave[n])
                 slack = m.NewIntVar(0,2,f'weekSlack_{n}_{w}')
-                m.Add(slack >= 2-offs); obj.append(-300*slack)
+                m.Add(slack >= 2-offs); obj.add(-300, slack)
 
     # (4-3) 야간 균등 (편차에 선형 패널티)
     if cfg.even_nights:
@@ -1254,32 +1428,49 @@ def _build_full_model(rs: RosterSystem, grouped, include_pair_objective: bool =
                 devP=m.NewIntVar(0,D,f'devP_{n}')
                 devN=m.NewIntVar(0,D,f'devN_{n}')
                 m.Add(devP-devN==totN-target)
-                obj.extend([-50*devP,-50*devN])
+                obj.add_terms([(-50, devP), (-50, devN)])
 
     # (4-4) N-O-D/E 패터
-    if getattr(cfg, 'nod_noe', True):
+    if use_automaton:
+        # 오토마톤 패널티 비트: k 번째 = join+k 일에 완성된 패턴 (선형 모드와 같이 마지막 날 완성분은 제외)
+        for n, (pats, isos) in seq_penalties.items():
+            for pat in pats[:-1]:
+                obj.add(-100, pat)
+            for iso in isos:
+                obj.add(-100, iso)
+            # 마지막 날 OFF 는 다음 날이 없으므로 오토마톤 밖에서 고립 여부 판정
+            T1 = leave[n]
+            if T1 >= join[n]:
+                iso=m.NewIntVar(0,1,f'iso_{n}_{T1}')
+                m.Add(iso >= X(n,T1,off)-X(n,T1-1,off))
+                m.Add(iso <= X(n,T1,off))
+                m.Add(iso <= 1-X(n,T1-1,off))
+                obj.add(-100, iso)
+    elif getattr(cfg, 'nod_noe', True):
         for n in range(N):
             for d in range(join[n], leave[n]-2):
                 pat=m.NewIntVar(0,1,f'NOD_{n}_{d}')
                 m.Add(pat >= X(n,d,night)+X(n,d+1,off)+X(n,d+2,day)-2)
-                obj.append(-100*pat)
+                obj.add(-100, pat)
                 pat2=m.NewIntVar(0,1,f'NOE_{n}_{d}')
                 m.Add(pat2 >= X(n,d,night)+X(n,d+1,off)+X(n,d+2,eve)-2)
-                obj.append(-100*pat2)
+                obj.add(-100, pat2)
 
-    # (4-5) 고립 OFF
+    # (4-5) 고립 OFF (오토마톤 모드는 위 패널티 비트로 처리)
     for n in range(N):
+        if use_automaton:
+            break
         for d in range(join[n], leave[n]+1):
             iso=m.NewIntVar(0,1,f'iso_{n}_{d}')
             m.Add(iso >= X(n,d,off)-X(n,d-1,off)-X(n,d+1,off))
             m.Add(iso <= X(n,d,off))
             m.Add(iso <= 1-X(n,d-1,off))
             m.Add(iso <= 1-X(n,d+1,off))
-            obj.append(-100*iso)
+            obj.add(-100, iso)
  
     # (4-6) 프리셉터 보너스 항 모듈화
     if include_pair_objective:
-        obj.extend(_add_preceptor_objective_terms(m, rs, X, join, leave))
+        obj.add_terms(_add_preceptor_objective_terms(m, rs, X, join, leave))
 
     # (4-7) 커버리지 부족 패널티(메인 경로 slack 허용) – 날짜별 요구치 기반
     try:
@@ -1289,111 +1480,235 @@ def _build_full_model(rs: RosterSystem, grouped, include_pair_objective: bool =
             w = base
             if code == 'N':
                 w = int(base * 1.2)
-            obj.append(-w * sh)
+            obj.add(-w, sh)
     except Exception:
         pass
 
-    m.Maximize(sum(obj))
-    return m,X,join,leave,fixed
+    obj.maximize(m)
+    var_index = {key: v.Index() for key, v in Xv.items()}
+    if return_objective:
+        return m,X,join,leave,fixed,var_index,obj
+    return m,X,join,leave,fixed,var_index
+
+
+def _add_warm_start_hints(m, X, rs: RosterSystem, join, leave, fixed) -> int:
+    """rs.warm_start_hint([N, D] 교대 인덱스, -1=없음)를 AddHint 로 주입하고 힌트 셀 수를 반환."""
+    hint = getattr(rs, 'warm_start_hint', None)
+    if hint is None:
+        return 0
+    S = rs.config.num_shifts
+    cnt = 0
+    for n in range(len(rs.nurses)):
+        for d in range(join[n], leave[n]+1):
+            s0 = int(hint[n, d])
+            if s0 < 0 or (n, d) in fixed: continue
+            for s in range(S):
+                v = X(n,d,s)
+                if isinstance(v, int): continue
+                m.AddHint(v, 1 if s == s0 else 0)
+            cnt += 1
+    return cnt
 
 
 # ─────────────────────────────────────────────────────────────
 #           Neighbourhood solver  (전역 변수·제약 그대로)     │
 # ─────────────────────────────────────────────────────────────
-def _solve_neighbourhood(rs, n_set, d_set, tl, grouped, run_seed: int | None = None, it:int=0):
-    from ortools.sat.python import cp_model
-    model,X,j,l,fixed=_build_full_model(rs,grouped, include_pair_objective=False)
+# ─────────────────────────────────────────────────────────────
+#           incumbent 스트리밍 / 조기 종료                       │
+# ─────────────────────────────────────────────────────────────
+def _assignment_codes(rs: RosterSystem, roster: np.ndarray) -> Dict[str, List[str]]:
+    """[N, D] 배정 행렬(또는 one-hot) → {nurse db_id: [교대코드...]} (고정 셀은 원래 코드, 미배정은 '-')"""
+    codes = np.array(list(rs.config.shift_types) + ['-'], dtype=object)
+    idx = as_assignment(roster)     # 미배정 -1 → codes[-1] == '-'
+    out = {nu.db_id: codes[idx[n]].tolist() for n, nu in enumerate(rs.nurses)}
+    for c in getattr(rs, 'fixed_cells', None) or []:
+        out[rs.nurses[c['nurse_index']].db_id][c['day_index']] = c['shift']
+    return out
 
-    # neighbourhood 외 셀은 현재 값 고정
-    N,D,S=len(rs.nurses),rs.num_days,rs.config.num_shifts
-    for n in range(N):
-        for d in range(D):
-            if (n in n_set) and (d in d_set): continue
-            assigned=np.where(rs.roster[n,d]==1)[0]
-            if len(assigned):
-                s0=assigned[0]
-                model.Add(X(n,d,s0)==1)
+
+def _report_roster_incumbent(rs: RosterSystem, objective, hard_violations: int):
+    """현재 rs.assignment 를 incumbent 로 보고 (수신자가 없으면 변환도 하지 않음)"""
+    if job_progress.has_incumbent_listener():
+        job_progress.report_incumbent(objective, hard_violations, _assignment_codes(rs, rs.assignment))
+
+
+class IncumbentCallback(cp_model.CpSolverSolutionCallback):
+    """개선 해마다 (목적값, 하드위반 수, 배정)을 job_progress 로 내보내는 solution callback.
+
+    배정 추출은 min_interval 초에 한 번으로 제한하고, 마지막 해는 solve 후 호출자가 보고한다.
+    """
+
+    def __init__(self, rs: RosterSystem, X, join, leave, min_interval: float = 0.5):
+        super().__init__()
+        self.rs = rs
+        self.min_interval = min_interval
+        S = rs.config.num_shifts
+        cells = [(n, d, s, X(n, d, s)) for n in range(len(rs.nurses))
+                 for d in range(join[n], leave[n] + 1) for s in range(S)]
+        # 상수 셀(고정/단일 허용)은 해마다 같으므로 기본 배정에 미리 기록
+        self._base = empty_assignment(len(rs.nurses), rs.num_days)
+        for n, d, s, v in cells:
+            if isinstance(v, int) and v:
+                self._base[n, d] = s
+        self._cells = [c for c in cells if not isinstance(c[3], int)]
+        self.solution_count = 0
+        self.reported = 0
+        self._last = 0.0
+
+    def on_solution_callback(self):
+        self.solution_count += 1
+        now = time.time()
+        if now - self._last < self.min_interval:
+            return
+        self._last = now
+        roster = self._base.copy()
+        for n, d, s, v in self._cells:
+            if self.Value(v):
+                roster[n, d] = s
+        hard = evaluate_hard_violations(roster, self.rs.config).total
+        job_progress.report_incumbent(self.ObjectiveValue(), hard, _assignment_codes(self.rs, roster))
+        self.reported += 1
+
+    OnSolutionCallback = on_solution_callback
+
+
+class InterruptWatcher:
+    """비동기 작업에서 취소/수락 요청을 주기적으로 확인해 진행 중인 solve 를 StopSearch 로 끊는다."""
+
+    def __init__(self, solver, interval: float = 0.5):
+        self.solver = solver
+        self.interval = interval
+        self._done = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._done.wait(self.interval):
+            if job_progress.interrupt_requested():
+                print("[CP-SAT-Basic] 작업 취소/수락 요청 → solve 중단")
+                self.solver.StopSearch()
+                return
+
+    def __enter__(self):
+        if job_progress.is_job_context():
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._done.set()
+        if self._thread:
+            self._thread.join()
+
+
+class NeighbourhoodModel:
+    """LNS용 영속 모델: 전체 모델은 generate_roster 호출당 한 번만 빌드한다.
+
+    반복마다 neighbourhood 밖 셀의 변수 도메인을 현재 값으로 고정(bound change)하고,
+    solve 후에는 도메인을 [0,1]로 되돌린다. 제약/변수 추가가 없으므로 모델 크기는 불변.
+    """
+
+    def __init__(self, rs: RosterSystem, grouped):
+        self.rs = rs
+        with Timer("LNS 영속 모델 빌드"):
+            self.model, self.X, self.join, self.leave, self.fixed = _build_full_model(
+                rs, grouped, include_pair_objective=False)
+        self._proto_vars = self.model.Proto().variables
+        self._pinned: List[int] = []
+
+    def _set_domain(self, var_idx: int, lo: int, hi: int):
+        dom = self._proto_vars[var_idx].domain
+        dom[0] = lo; dom[1] = hi
+
+    def _pin_outside(self, n_set, d_set):
+        """neighbourhood 밖 셀을 현재 roster 값으로 고정"""
+        rs = self.rs
+        N, D, S = len(rs.nurses), rs.num_days, rs.config.num_shifts
+        n_in, d_in = set(n_set), set(d_set)
+        assigned = rs.assignment
+        has_assign = assigned != UNASSIGNED
+        for n in range(N):
+            for d in range(self.join[n], self.leave[n] + 1):
+                if (n in n_in) and (d in d_in): continue
+                if not has_assign[n, d]: continue
+                s0 = int(assigned[n, d])
+                for s in range(S):
+                    v = self.X(n, d, s)
+                    if isinstance(v, int): continue
+                    idx = v.Index()
+                    val = 1 if s == s0 else 0
+                    self._set_domain(idx, val, val)
+                    self._pinned.append(idx)
+
+    def _release(self):
+        for idx in self._pinned:
+            self._set_domain(idx, 0, 1)
+        self._pinned.clear()
+
+    def solve(self, n_set, d_set, tl, run_seed: int | None = None, it: int = 0,
+              num_workers: int = 10) -> bool:
+        from ortools.sat.python import cp_model
+        rs, X = self.rs, self.X
+        S = rs.config.num_shifts
+        self._pin_outside(n_set, d_set)
+        try:
+            solver = cp_model.CpSolver()
+            if run_seed is not None:
+                # 이웃/반복에 따라 seed 살짝 변조 → 다양성
+                tweak = (hash(tuple(sorted(n_set))) ^ hash(tuple(sorted(d_set))) ^ (it * 0x9E3779B1)) & 0x7fffffff
+                solver.parameters.randomize_search = True
+                solver.parameters.random_seed = (run_seed ^ tweak) & 0x7fffffff
+                solver.parameters.solution_pool_size = 10
+            solver.parameters.max_time_in_seconds = tl
+            solver.parameters.num_search_workers = num_workers
+            solver.parameters.relative_gap_limit = 0.1
+            with InterruptWatcher(solver):
+                st = solver.Solve(self.model)
+        finally:
+            self._release()
+        if st not in (cp_model.OPTIMAL, cp_model.FEASIBLE): return False
+
+        # 반영
+        assignment = rs.assignment
+        for n in n_set:
+            for d in d_set:
+                assignment[n, d] = UNASSIGNED
                 for s in range(S):
-                    if s!=s0: model.Add(X(n,d,s)==0)
+                    if solver.Value(X(n, d, s)): assignment[n, d] = s
+        return True
 
-    # 옵션: 프리셉터-포커스 이웃일 때만 해당 셀에 한정하여 보너스 항 주입
-    try:
-        focus_preceptor = bool(getattr(rs.config, 'preceptor_enable', True))
-        if focus_preceptor and hasattr(rs, 'pair_matrix') and isinstance(rs.pair_matrix, dict):
-            # 선택된 n_set,d_set의 셀만 대상으로 제한된 항 생성
-            def X_sub(n,d,s):
-                if (n in n_set) and (d in d_set):
-                    return X(n,d,s)
-                # neighbourhood 밖은 고정되어 있으므로 항의 영향 없음 처리(0 반환)
-                return 0
-            # join/leave를 그대로 써도 되지만 날짜 필터를 d_set로 제한
-            # 간단하게 전역 헬퍼 재사용은 어려우므로, 최소한의 제한형 항만 주입
-            together = rs.pair_matrix.get('together')
-            if together is not None:
-                cfg = rs.config
-                strength = float(getattr(cfg, 'preceptor_strength_multiplier', 1.0))
-                base_min = float(getattr(cfg, 'preceptor_min_pair_weight', 5.0))
-                if getattr(cfg, 'preceptor_focus_shifts', None):
-                    focus_codes = [c for c in cfg.preceptor_focus_shifts if c in cfg.daily_shift_requirements.keys()]
-                else:
-                    focus_codes = list(cfg.daily_shift_requirements.keys())
-                shift_indices = [cfg.shift_types.index(c) for c in focus_codes]
-                pref = rs.preference_matrix
-                pref_sum_threshold = 1.2
-                for n1 in n_set:
-                    for n2 in n_set:
-                        if n1>=n2: continue
-                        base = together[n1,n2]
-                        if base < base_min: continue
-                        w = int(base * 100 * strength)
-                        for d in d_set:
-                            # 해당 날짜에서 최선의 교대만 선택
-                            best=None; best_s=None
-                            for s in shift_indices:
-                                sc = pref[n1,d,s] + pref[n2,d,s]
-                                if sc < pref_sum_threshold: continue
-                                if best is None or sc>best:
-                                    best,best_s=sc,s
-                            if best is None: continue
-                            z = model.NewBoolVar(f'pc_lns_{n1}_{n2}_{d}_{best_s}')
-                            model.Add(z <= X_sub(n1,d,best_s))
-                            model.Add(z <= X_sub(n2,d,best_s))
-                            # 목적함수에 추가
-                            # CP-SAT Python API에서는 Maximize가 호출 이전이면 terms 누적 가능
-                            # 여기서는 model에 저장된 선형식이 없으므로 CpSolver쪽에서 자동 합산되도록 유지
-                            # 간단하게: 목적은 build 단계의 obj에만 존재. 여기서는 AddMaxEquality 대신
-                            # 리니어식으로 보정: solver Maximize 전에 선호 obj는 이미 존재하므로, 이 항을 모델의
-                            # 계수화가 필요. OR-Tools는 명시 obj 합산 인터페이스 없음 → trick: 저장 후 아래에서 사용 안함
-                            # 안전하게는 풀빌드에서만 목적에 넣고, LNS에서는 제약만으로 유도 불가 → 여기선 생략
-                            # 대신 neighbourhood 풀빌드 자체가 include_pair_objective=False 이므로 성능 우선.
-                            # 필요시 풀빌드 쪽 강도 상향으로 보정.
-                            pass
-    except Exception:
-        pass
 
-    solver=cp_model.CpSolver()
-    if run_seed is not None:
-        # 이웃/반복에 따라 seed 살짝 변조 → 다양성
-        tweak = (hash(tuple(sorted(n_set))) ^ hash(tuple(sorted(d_set))) ^ (it * 0x9E3779B1)) & 0x7fffffff
-        solver.parameters.randomize_search = True
-        solver.parameters.random_seed = (run_seed ^ tweak) & 0x7fffffff
-        solver.parameters.solution_pool_size = 10
-    solver.parameters.max_time_in_seconds=tl
-    solver.parameters.num_search_workers=10
-    solver.parameters.relative_gap_limit = 0.1
-    st=solver.Solve(model)
-    if st not in (cp_model.OPTIMAL,cp_model.FEASIBLE): return False
-
-    # 반영
-    for n in n_set:
-        for d in d_set:
-            for s in range(S):
-                rs.roster[n,d,s]=1 if solver.Value(X(n,d,s)) else 0
-    return True
+def _solve_neighbourhood(rs, n_set, d_set, tl, grouped, run_seed: int | None = None, it:int=0,
+                         nbhd_model: Optional[NeighbourhoodModel] = None):
+    """이웃 탐색 1회. nbhd_model 을 넘기면 모델 재빌드 없이 도메인만 토글한다."""
+    if nbhd_model is None:
+        nbhd_model = NeighbourhoodModel(rs, grouped)
+    return nbhd_model.solve(n_set, d_set, tl, run_seed, it)
+
+
+# ─────────────────────────────────────────────────────────────
+#           병렬 LNS 워커 (프로세스 풀)                         │
+# ─────────────────────────────────────────────────────────────
+_WORKER_NBHD: Optional[NeighbourhoodModel] = None
+
+
+def _lns_worker_init(rs, grouped):
+    """워커 프로세스 시작 시 영속 이웃 모델을 한 번 빌드한다."""
+    global _WORKER_NBHD
+    _WORKER_NBHD = NeighbourhoodModel(rs, grouped)
+
+
+def _lns_worker_solve(roster, n_set, d_set, tl, run_seed, it, num_workers):
+    """현재 배정 행렬 기준으로 이웃 1개를 풀어 (성공여부, n_set×d_set 블록, 소요초)를 반환한다."""
+    t0 = time.time()
+    rs = _WORKER_NBHD.rs
+    rs.assignment = roster
+    ok = _WORKER_NBHD.solve(n_set, d_set, tl, run_seed, it, num_workers=num_workers)
+    block = rs.assignment[np.ix_(n_set, d_set)].copy() if ok else None
+    return ok, block, time.time() - t0
 
 
 def _add_preceptor_objective_terms(m, rs: RosterSystem, X, join, leave):
-    """프리셉터(페어 together) 보너스 항을 생성하여 obj 리스트로 반환.
+    """프리셉터(페어 together) 보너스 항을 생성하여 (계수, 변수) 리스트로 반환.
     - 하드 제약은 건드리지 않음. 소프트 보너스만 추가.
     - 설정 파라미터로 강도/탑-K/교대/하한값을 제어.
     - LNS에서는 호출자가 생략하거나 별도 이웃 주입으로 사용 가능.
@@ -1448,7 +1763,7 @@ def _add_preceptor_objective_terms(m, rs: RosterSystem, X, join, leave):
             z = m.NewBoolVar(f'pc_{n1}_{n2}_{d}_{s}')
             m.Add(z <= X(n1,d,s))
             m.Add(z <= X(n2,d,s))
-            obj_terms.append(w * z)
+            obj_terms.append((w, z))
             _added += 1
     _dt = _t.time()-_t0
     print(f"[CP-SAT-Basic] 프리셉터 항: 쌍 {len(pairs)}개, 변수 {_added}개, {_dt:.2f}s, 강도 {strength}x, K={K_default}, shifts={focus_codes}")
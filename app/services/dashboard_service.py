@@ -9,7 +9,11 @@ from services.roster_system import RosterSystem
 from typing import Dict, List, Optional
 from datetime import date
 import json
-from sqlalchemy import inspect
+from sqlalchemy import inspect, select, insert, delete
+from collections import defaultdict
+
+# 상세 요청 행 executemany 1회당 행 수
+ANALYTICS_INSERT_CHUNK = 1000
 
 def _check_table_exists(table_name: str, db: Session) -> bool:
     """테이블이 존재하는지 확인합니다."""
@@ -22,15 +26,20 @@ def _check_table_exists(table_name: str, db: Session) -> bool:
 def save_roster_analytics(
     schedule_id: str,
     roster_system: RosterSystem,
-    db: Session
+    db: Session,
+    chunk_size: int = ANALYTICS_INSERT_CHUNK
 ) -> bool:
     """
     근무표 분석 데이터를 DB에 저장합니다.
+    - request_details 는 간호사별로 한 번만 묶고(페어 요청은 nurse_1 기준), 유형별 요청/충족 수도 같은 패스에서 집계
+    - 분석 행은 executemany 1회로 넣은 뒤 (nurse_id → analytics_id) 를 SELECT 1회로 회수
+    - 상세 행은 chunk_size 단위 executemany 로 기록 (행별 flush/ORM 객체 생성 없음)
     
     Args:
         schedule_id: 스케줄 ID
         roster_system: RosterSystem 객체
         db: 데이터베이스 세션
+        chunk_size: 상세 행 INSERT 묶음 크기
         
     Returns:
         bool: 저장 성공 여부
@@ -41,57 +50,82 @@ def save_roster_analytics(
             print("roster_analytics 테이블이 존재하지 않습니다. 분석 데이터를 저장할 수 없습니다.")
             return False
         
-        # 기존 분석 데이터 삭제 (같은 스케줄에 대해)
-        db.query(RosterAnalytics).filter(
-            RosterAnalytics.schedule_id == schedule_id
-        ).delete()
+        # 기존 분석 데이터 삭제 (같은 스케줄에 대해, 상세 → 분석 순)
+        old_ids = select(RosterAnalytics.analytics_id).where(RosterAnalytics.schedule_id == schedule_id)
+        db.execute(delete(RosterRequestDetails).where(RosterRequestDetails.analytics_id.in_(old_ids)))
+        db.execute(delete(RosterAnalytics).where(RosterAnalytics.schedule_id == schedule_id))
         
         # 개인별 만족도 계산
         individual_satisfaction = roster_system.calculate_individual_satisfaction()
         
-        # 상세 요청 분석
+        # 상세 요청 분석 → 간호사별 그룹핑 + 유형별 요청/충족 수 (단일 패스)
         detailed_analysis = roster_system.calculate_detailed_request_analysis()
-        
-        # 각 간호사별 분석 데이터 저장
+        details_by_nurse = defaultdict(list)
+        counts = defaultdict(lambda: defaultdict(int))
+        for detail in detailed_analysis["request_details"]:
+            nurse_id = detail.get("nurse_id") or detail.get("nurse_1_id")
+            if nurse_id not in individual_satisfaction:
+                continue
+            details_by_nurse[nurse_id].append(detail)
+            request_type = detail["request_type"]
+            counts[nurse_id][f"{request_type}_requests"] += 1
+            if detail["satisfied"]:
+                counts[nurse_id][f"satisfied_{request_type}_requests"] += 1
+        
+        year, month = roster_system.target_month.year, roster_system.target_month.month
+        analytics_rows = []
         for nurse_id, satisfaction in individual_satisfaction.items():
-            analytics = RosterAnalytics(
-                schedule_id=schedule_id,
-                nurse_id=nurse_id,
-                year=roster_system.target_month.year,
-                month=roster_system.target_month.month,
-                off_satisfaction=satisfaction["off_satisfaction"],
-                shift_satisfaction=satisfaction["shift_satisfaction"],
-                pair_satisfaction=satisfaction["pair_satisfaction"],
-                overall_satisfaction=satisfaction["overall_satisfaction"],
-                total_requests=satisfaction["total_requests"],
-                satisfied_requests=satisfaction["satisfied_requests"],
-                off_requests=satisfaction.get("off_requests", 0),
-                satisfied_off_requests=satisfaction.get("satisfied_off_requests", 0),
-                shift_requests=satisfaction.get("shift_requests", 0),
-                satisfied_shift_requests=satisfaction.get("satisfied_shift_requests", 0),
-                pair_requests=satisfaction.get("pair_requests", 0),
-                satisfied_pair_requests=satisfaction.get("satisfied_pair_requests", 0)
-            )
-            db.add(analytics)
-            db.flush()  # analytics_id 생성
-            
-            # 상세 요청 데이터 저장
-            for detail in detailed_analysis["request_details"]:
-                if detail["nurse_id"] == nurse_id:
-                    request_detail = RosterRequestDetails(
-                        analytics_id=analytics.analytics_id,
-                        nurse_id=nurse_id,
-                        day=detail["day"],
-                        request_type=detail["request_type"],
-                        shift_type=detail.get("shift_type"),
-                        pair_type=detail.get("pair_type"),
-                        nurse_2_id=detail.get("nurse_2_id") if detail.get("nurse_2_id") else None,
-                        satisfied=detail["satisfied"],
-                        preference_score=detail["preference_score"]
-                    )
-                    db.add(request_detail)
+            c = counts[nurse_id]
+            analytics_rows.append({
+                "schedule_id": schedule_id,
+                "nurse_id": nurse_id,
+                "year": year,
+                "month": month,
+                "off_satisfaction": satisfaction["off_satisfaction"],
+                "shift_satisfaction": satisfaction["shift_satisfaction"],
+                "pair_satisfaction": satisfaction["pair_satisfaction"],
+                "overall_satisfaction": satisfaction["overall_satisfaction"],
+                "total_requests": satisfaction["total_requests"],
+                "satisfied_requests": satisfaction["satisfied_requests"],
+                "off_requests": c["off_requests"],
+                "satisfied_off_requests": c["satisfied_off_requests"],
+                "shift_requests": c["shift_requests"],
+                "satisfied_shift_requests": c["satisfied_shift_requests"],
+                "pair_requests": c["pair_requests"],
+                "satisfied_pair_requests": c["satisfied_pair_requests"],
+            })
+        if not analytics_rows:
+            db.commit()
+            return True
+        db.execute(insert(RosterAnalytics), analytics_rows)
+        
+        # 방금 넣은 분석 행의 ID 회수 (스케줄당 간호사 1행이므로 nurse_id 로 매핑)
+        analytics_ids = dict(db.execute(
+            select(RosterAnalytics.nurse_id, RosterAnalytics.analytics_id)
+            .where(RosterAnalytics.schedule_id == schedule_id)
+        ).all())
+        
+        # 상세 요청 데이터 저장
+        detail_rows = []
+        for nurse_id, details in details_by_nurse.items():
+            analytics_id = analytics_ids[nurse_id]
+            for detail in details:
+                detail_rows.append({
+                    "analytics_id": analytics_id,
+                    "nurse_id": nurse_id,
+                    "day": detail["day"],
+                    "request_type": detail["request_type"],
+                    "shift_type": detail.get("shift_type"),
+                    "pair_type": detail.get("pair_type"),
+                    "nurse_2_id": detail.get("nurse_2_id") or None,
+                    "satisfied": bool(detail["satisfied"]),
+                    "preference_score": float(detail["preference_score"]),
+                })
+        for i in range(0, len(detail_rows), chunk_size):
+            db.execute(insert(RosterRequestDetails), detail_rows[i:i + chunk_size])
         
         db.commit()
+        print(f"대시보드 데이터 저장: schedule_id={schedule_id}, 분석={len(analytics_rows)}, 상세={len(detail_rows)}")
         return True
         
     except Exception as e:
@@ -1,25 +1,47 @@
+import time
+
 from agents.main_graph import GraphGenerate
+from services.wish_rule_parser import fast_path_results, case_to_shift_results
 
 class GraphService:
     def __init__(self):
         self._graph = GraphGenerate()
+        self.fast_path_requests = 0     # LLM 없이 규칙 파서만으로 끝난 요청 수
+        self.llm_requests = 0           # 그래프(LLM)를 호출한 요청 수
 
     async def invoke(self, request: str | list[str], schema: str, case: object | None, year: int, month: int):
         """
         주어진 요청과 스키마로 그래프를 실행합니다.
+        - case(캘린더 선택)는 그래프 없이 바로 shift_results 로 변환
+        - 모든 줄이 "9/9: D", "주말 O" 처럼 구조화돼 있으면 규칙 파서로 처리하고, 아니면 요청 전체를 그래프(LLM)로 전달
 
         Args:
             request (str): 사용자 요청 문자열
             schema (list): 간호사 스키마 리스트
 
         Returns:
-            dict: 그래프 실행 결과
+            list: [shift_results, preference_results]
         """
+        t0 = time.perf_counter()
+        if case is not None:
+            self.fast_path_requests += 1
+            response = [case_to_shift_results(case), []]
+            print(f"[graph] case 처리 (LLM 미사용): {(time.perf_counter() - t0) * 1000:.2f}ms")
+            return response
+
+        parsed = fast_path_results(request, year, month)
+        if parsed is not None:
+            self.fast_path_requests += 1
+            print(f"[graph] 규칙 파서로 처리 (LLM 미사용, {len(parsed)}건): {(time.perf_counter() - t0) * 1000:.2f}ms")
+            return [[{'shift_result': parsed}] if parsed else [], []]
 
-        response = await self._graph.ainvoke({"request": request, "schema": schema, "case": case, "year": year, "month": month})        
+        # 일부 줄만 파싱돼도 요청 전체를 넘김 (상대 표현이 앞 줄 문맥을 참조)
+        self.llm_requests += 1
+        print("[graph] 규칙 파서로 처리되지 않는 줄 있음 → 요청 전체 LLM 전달")
+        response = await self._graph.ainvoke({"request": request, "schema": schema, "case": None, "year": year, "month": month})
         response = [response['shift_results'], response['preference_results']]
         import pprint
         pprint.pprint(response)
         return response
 
-graph_service = GraphService() 
+graph_service = GraphService()
@@ -6,6 +6,7 @@
 """
 from sqlalchemy.orm import Session
 from db.client import get_db
+from db.pool import get_pool_stats
 from db.models import Nurse, Schedule, ShiftPreference
 from datetime import datetime
 import psutil
@@ -50,6 +51,7 @@ def log_health_error(service_name: str, error: Exception, context: dict = None):
 def check_database_health_service(db: Session):
     """
     데이터베이스 연결 상태 체크 서비스 함수
+    - 커넥션 풀 상태(체크아웃/오버플로/대기 시간)도 함께 반환
     """
     try:
         # 간단한 쿼리로 DB 연결 상태 확인
@@ -67,7 +69,8 @@ def check_database_health_service(db: Session):
                 "schedule_count": schedule_count,
                 "preference_count": preference_count,
                 "timestamp": datetime.now().isoformat()
-            }
+            },
+            "pool": get_pool_stats()
         }
     except Exception as e:
         error_data = log_health_error("database", e, {
@@ -81,7 +84,8 @@ def check_database_health_service(db: Session):
                 "error": str(e),
                 "error_details": error_data,
                 "timestamp": datetime.now().isoformat()
-            }
+            },
+            "pool": get_pool_stats()
         }
 
 
@@ -0,0 +1,89 @@
+"""
+근무표 생성 작업 진행률 보고 모듈
+- 엔진(cp_sat_basic)은 DB 를 모른 채 report_progress / should_stop 만 호출한다
+- 워커가 작업 시작 시 set_reporter 로 콜백을 등록하면 jobs 테이블에 반영되고,
+  등록되지 않은 경우(동기 /generate 등)에는 아무 동작도 하지 않는다
+- 개선 incumbent(목적값, 하드위반, 배정)도 같은 경로로 내보내며, "현재 해 수락" 요청 시 조기 종료한다
+- 작업은 프로세스당 1개씩 실행되므로 모듈 전역 상태로 충분하다
+"""
+from typing import Callable, Dict, List, Optional
+
+_reporter: Optional[Callable[..., None]] = None
+_stop_checker: Optional[Callable[[], bool]] = None
+_incumbent_listener: Optional[Callable[..., None]] = None
+_accept_checker: Optional[Callable[[], bool]] = None
+
+
+class JobCancelled(Exception):
+    """작업 취소 요청으로 생성을 중단할 때 발생"""
+
+
+def set_reporter(reporter: Optional[Callable[..., None]], stop_checker: Optional[Callable[[], bool]] = None,
+                 incumbent_listener: Optional[Callable[..., None]] = None,
+                 accept_checker: Optional[Callable[[], bool]] = None):
+    """현재 프로세스의 진행률/incumbent 콜백과 취소·수락 확인 함수를 등록(None 이면 해제)한다."""
+    global _reporter, _stop_checker, _incumbent_listener, _accept_checker
+    _reporter = reporter
+    _stop_checker = stop_checker
+    _incumbent_listener = incumbent_listener
+    _accept_checker = accept_checker
+
+
+def report_progress(progress: float, incumbent_objective: Optional[float] = None, message: Optional[str] = None):
+    """진행률(0~1)과 현재 최선해 목적값을 보고한다. 보고 실패는 생성에 영향을 주지 않는다."""
+    if _reporter is None:
+        return
+    try:
+        _reporter(max(0.0, min(1.0, float(progress))), incumbent_objective, message)
+    except Exception as e:
+        print(f"[job] 진행률 보고 실패: {e}")
+
+
+def is_job_context() -> bool:
+    """비동기 작업 실행 중(콜백 등록됨)인지 여부"""
+    return any(f is not None for f in (_reporter, _stop_checker, _incumbent_listener, _accept_checker))
+
+
+def has_incumbent_listener() -> bool:
+    """incumbent 수신자가 있을 때만 엔진이 solution callback 을 붙인다 (동기 생성은 오버헤드 없음)."""
+    return _incumbent_listener is not None
+
+
+def report_incumbent(objective: Optional[float], hard_violations: int, assignment: Dict[str, List[str]]):
+    """개선된 incumbent 를 보고한다. assignment 는 {nurse_id: [교대코드, ...]} (DB 포맷)."""
+    if _incumbent_listener is None:
+        return
+    try:
+        _incumbent_listener(objective, int(hard_violations), assignment)
+    except Exception as e:
+        print(f"[job] incumbent 보고 실패: {e}")
+
+
+def accept_requested() -> bool:
+    """사용자가 현재 incumbent 수락(조기 종료)을 요청했는지 여부."""
+    if _accept_checker is None:
+        return False
+    try:
+        return bool(_accept_checker())
+    except Exception:
+        return False
+
+
+def interrupt_requested() -> bool:
+    """취소 또는 수락 요청 → 탐색을 멈춰야 하는지 여부."""
+    return should_stop() or accept_requested()
+
+
+def should_stop() -> bool:
+    """취소 요청 여부. 엔진은 LNS 반복 경계 등 안전한 지점에서만 확인한다."""
+    if _stop_checker is None:
+        return False
+    try:
+        return bool(_stop_checker())
+    except Exception:
+        return False
+
+
+def raise_if_cancelled():
+    if should_stop():
+        raise JobCancelled("작업 취소 요청으로 중단되었습니다.")
@@ -0,0 +1,416 @@
+"""
+근무표 생성 비동기 작업(Job) 서비스 모듈
+- roster_jobs 테이블에 상태/진행률/현재 최선해 목적값을 기록
+- 실행 백엔드는 교체 가능: 기본은 API 프로세스 내부 프로세스 풀(local), 선택적으로 SQS(sqs)
+- 모든 함수는 한글 docstring, 한글 print/logging, PEP8 스타일 적용
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from db.client import engine, SessionLocal
+from db.models import RosterJob
+from schemas.roster_schema import RosterRequest
+
+JOB_QUEUED = 'QUEUED'
+JOB_RUNNING = 'RUNNING'
+JOB_DONE = 'DONE'
+JOB_FAILED = 'FAILED'
+JOB_CANCELLED = 'CANCELLED'
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+_table_ready = False
+_table_lock = threading.Lock()
+
+
+def _ensure_jobs_table():
+    """roster_jobs 테이블이 없으면 생성한다 (프로세스당 1회)."""
+    global _table_ready
+    if _table_ready:
+        return
+    with _table_lock:
+        if not _table_ready:
+            RosterJob.__table__.create(bind=engine, checkfirst=True)
+            _table_ready = True
+
+
+def job_to_dict(job: RosterJob, include_roster: bool = False) -> dict:
+    """RosterJob → 응답 dict (include_roster=True 이면 현재 incumbent 배정 포함)"""
+    data = {
+        "job_id": job.job_id,
+        "status": job.status,
+        "progress": round(float(job.progress or 0.0), 4),
+        "incumbent_objective": job.incumbent_objective,
+        "hard_violations": job.hard_violations,
+        "incumbent_version": job.incumbent_version or 0,
+        "message": job.message,
+        "schedule_id": job.schedule_id,
+        "cancel_requested": bool(job.cancel_requested),
+        "accept_requested": bool(job.accept_requested),
+        "backend": job.backend,
+        "year": job.year,
+        "month": job.month,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+    if include_roster:
+        data["incumbent_roster"] = job.incumbent_roster
+    return data
+
+
+def update_job_status(db: Session, job_id: str, status: Optional[str] = None, **fields) -> Optional[RosterJob]:
+    """작업 상태/진행률 등을 갱신하고 커밋한다. 종료 상태로 바뀌면 finished_at 을 기록한다."""
+    job = db.query(RosterJob).filter(RosterJob.job_id == job_id).first()
+    if not job:
+        print(f"[job] 작업 없음: job_id={job_id}")
+        return None
+    if status:
+        job.status = status
+        if status == JOB_RUNNING and job.started_at is None:
+            job.started_at = datetime.now()
+        if status in FINISHED_STATES:
+            job.finished_at = datetime.now()
+    for key, value in fields.items():
+        setattr(job, key, value)
+    db.commit()
+    return job
+
+
+def _read_job_flags(db: Session, job_id: str) -> tuple:
+    """(취소 요청, 수락 요청) 플래그 조회 (다른 세션의 갱신을 보도록 매번 새로 읽는다)."""
+    row = (
+        db.query(RosterJob.cancel_requested, RosterJob.accept_requested)
+        .filter(RosterJob.job_id == job_id)
+        .first()
+    )
+    db.rollback()
+    return (bool(row[0]), bool(row[1])) if row else (False, False)
+
+
+def is_cancel_requested(db: Session, job_id: str) -> bool:
+    """취소 요청 플래그 조회"""
+    return _read_job_flags(db, job_id)[0]
+
+
+# ───────────────────────────── 실행 백엔드 ─────────────────────────────
+
+class LocalProcessPoolBackend:
+    """API 프로세스 내부 프로세스 풀 백엔드 (기본값).
+
+    solve 는 워커 프로세스에서 실행되므로 이벤트 루프/GIL 을 점유하지 않는다.
+    대기 중인 작업은 future.cancel() 로 즉시 취소하고, 실행 중인 작업은 취소 플래그로 협조적 중단한다.
+    """
+    name = 'local'
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool = None
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        if self._pool is None:
+            import multiprocessing as mp
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn: API 서버의 스레드/DB 커넥션 상태를 fork 로 복제하지 않도록
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=mp.get_context('spawn'))
+        return self._pool
+
+    def submit(self, payload: dict):
+        from worker import run_job
+        with self._lock:
+            future = self._get_pool().submit(run_job, payload)
+            self._futures[payload["job_id"]] = future
+        future.add_done_callback(lambda f, job_id=payload["job_id"]: self._futures.pop(job_id, None))
+
+    def cancel(self, job_id: str) -> bool:
+        """아직 시작 전이면 큐에서 제거하고 True 를 반환한다."""
+        future = self._futures.get(job_id)
+        return bool(future and future.cancel())
+
+
+class SqsJobBackend:
+    """SQS 호환 백엔드: 메시지만 전송하고 실행은 외부 워커(app/worker.py)가 담당한다."""
+    name = 'sqs'
+
+    def __init__(self, queue_url: Optional[str], region_name: str = "ap-northeast-2"):
+        self.queue_url = queue_url
+        self.region_name = region_name
+        self._client = None
+
+    def submit(self, payload: dict):
+        if not self.queue_url:
+            raise Exception("SQS_QUEUE_URL 이 설정되지 않았습니다.")
+        if self._client is None:
+            import boto3
+            self._client = boto3.client("sqs", region_name=self.region_name)
+        self._client.send_message(QueueUrl=self.queue_url, MessageBody=json.dumps(payload, default=str))
+
+    def cancel(self, job_id: str) -> bool:
+        # 전송된 메시지는 회수하지 않는다 → 워커가 시작 시/실행 중 취소 플래그를 확인
+        return False
+
+
+_backend = None
+
+
+def get_job_backend():
+    """ROSTER_JOB_BACKEND(local|sqs) 환경변수에 따른 실행 백엔드 (프로세스당 1개)."""
+    global _backend
+    if _backend is None:
+        kind = os.getenv("ROSTER_JOB_BACKEND", "local").lower()
+        if kind == "sqs":
+            _backend = SqsJobBackend(os.getenv("SQS_QUEUE_URL"))
+        else:
+            _backend = LocalProcessPoolBackend(max_workers=int(os.getenv("ROSTER_JOB_WORKERS", "2")))
+        print(f"[job] 실행 백엔드: {_backend.name}")
+    return _backend
+
+
+# ───────────────────────────── 서비스 함수 ─────────────────────────────
+
+def submit_roster_job_service(req: RosterRequest, current_user, db: Session) -> dict:
+    """근무표 생성 작업을 등록하고 백엔드에 제출한다."""
+    if not current_user or not current_user.is_head_nurse:
+        raise Exception("Permission denied")
+    _ensure_jobs_table()
+    backend = get_job_backend()
+    job_id = f"job-{uuid.uuid4().hex[:16]}"
+    params = req.dict()
+    job = RosterJob(
+        job_id=job_id,
+        account_id=current_user.account_id,
+        group_id=current_user.group_id,
+        year=req.year,
+        month=req.month,
+        params=params,
+        backend=backend.name,
+        status=JOB_QUEUED,
+        progress=0.0,
+    )
+    db.add(job)
+    db.commit()
+
+    payload = {"job_id": job_id, "nurse_id": current_user.account_id, "params": params}
+    try:
+        backend.submit(payload)
+    except Exception as e:
+        update_job_status(db, job_id, JOB_FAILED, message=f"작업 제출 실패: {e}")
+        raise
+    print(f"[job] 작업 등록 job_id={job_id}, backend={backend.name}")
+    db.refresh(job)
+    return job_to_dict(job)
+
+
+def _get_group_job(db: Session, job_id: str, current_user) -> Optional[RosterJob]:
+    _ensure_jobs_table()
+    return (
+        db.query(RosterJob)
+        .filter(RosterJob.job_id == job_id, RosterJob.group_id == current_user.group_id)
+        .first()
+    )
+
+
+def get_roster_job_service(job_id: str, current_user, db: Session, include_roster: bool = False) -> Optional[dict]:
+    """작업 상태 조회 (같은 그룹 작업만). 없으면 None"""
+    if not current_user:
+        raise Exception("Not authenticated")
+    job = _get_group_job(db, job_id, current_user)
+    return job_to_dict(job, include_roster) if job else None
+
+
+def list_roster_jobs_service(current_user, db: Session, limit: int = 20) -> list:
+    """그룹의 최근 작업 목록"""
+    if not current_user:
+        raise Exception("Not authenticated")
+    _ensure_jobs_table()
+    jobs = (
+        db.query(RosterJob)
+        .filter(RosterJob.group_id == current_user.group_id)
+        .order_by(RosterJob.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+    return [job_to_dict(j) for j in jobs]
+
+
+def cancel_roster_job_service(job_id: str, current_user, db: Session) -> Optional[dict]:
+    """작업 취소. 대기 중이면 즉시 취소, 실행 중이면 취소 플래그를 세워 워커가 중단하도록 한다."""
+    if not current_user or not current_user.is_head_nurse:
+        raise Exception("Permission denied")
+    job = _get_group_job(db, job_id, current_user)
+    if not job:
+        return None
+    if job.status in FINISHED_STATES:
+        return job_to_dict(job)
+    if job.backend == get_job_backend().name and get_job_backend().cancel(job_id):
+        job = update_job_status(db, job_id, JOB_CANCELLED, cancel_requested=True, message="대기 중 취소됨")
+    else:
+        job = update_job_status(db, job_id, cancel_requested=True, message="취소 요청됨")
+    return job_to_dict(job)
+
+
+def accept_roster_job_service(job_id: str, current_user, db: Session) -> Optional[dict]:
+    """현재 incumbent 수락: 실행 중인 작업의 탐색을 조기 종료하고 현재 최선해를 저장하도록 요청한다."""
+    if not current_user or not current_user.is_head_nurse:
+        raise Exception("Permission denied")
+    job = _get_group_job(db, job_id, current_user)
+    if not job:
+        return None
+    if job.status != JOB_RUNNING:
+        return job_to_dict(job)
+    if not job.incumbent_version:
+        # 첫 해가 나오기 전 수락은 저장할 배정이 없으므로 플래그를 세우지 않는다
+        data = job_to_dict(job)
+        data["message"] = "아직 현재 해가 없어 수락할 수 없습니다."
+        return data
+    job = update_job_status(db, job_id, accept_requested=True, message="현재 해 수락 요청됨")
+    return job_to_dict(job)
+
+
+def _load_job_snapshot(job_id: str, group_id: str) -> Optional[dict]:
+    """스트리밍용 작업 스냅샷 (요청마다 짧은 세션 사용)"""
+    db = SessionLocal()
+    try:
+        job = (
+            db.query(RosterJob)
+            .filter(RosterJob.job_id == job_id, RosterJob.group_id == group_id)
+            .first()
+        )
+        return job_to_dict(job, include_roster=True) if job else None
+    finally:
+        db.close()
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+async def stream_roster_job_events(job_id: str, current_user, poll_interval: float = 1.0, timeout: float = 1800):
+    """
+    작업 진행 상황 Server-Sent Events 스트림
+    - progress: 진행률/메시지 변경 시
+    - incumbent: 개선된 incumbent(목적값, 하드위반, 배정) 갱신 시
+    - done: 종료 상태 도달 시 (이후 스트림 종료)
+    """
+    from starlette.concurrency import run_in_threadpool
+
+    last_version, last_progress = None, None
+    started = time.time()
+    while True:
+        snap = await run_in_threadpool(_load_job_snapshot, job_id, current_user.group_id)
+        if snap is None:
+            yield _sse("error", {"job_id": job_id, "message": "작업을 찾을 수 없습니다."})
+            return
+        roster = snap.pop("incumbent_roster", None)
+        if snap["incumbent_version"] != last_version and roster:
+            last_version = snap["incumbent_version"]
+            yield _sse("incumbent", {
+                "job_id": job_id,
+                "version": last_version,
+                "objective": snap["incumbent_objective"],
+                "hard_violations": snap["hard_violations"],
+                "roster": roster,
+            })
+        progress_key = (snap["status"], snap["progress"], snap["message"])
+        if progress_key != last_progress:
+            last_progress = progress_key
+            yield _sse("progress", snap)
+        if snap["status"] in FINISHED_STATES:
+            yield _sse("done", snap)
+            return
+        if time.time() - started > timeout:
+            yield _sse("timeout", {"job_id": job_id})
+            return
+        await asyncio.sleep(poll_interval)
+
+
+class JobProgressWriter:
+    """워커 프로세스의 진행률/incumbent 콜백: 별도 세션으로 roster_jobs 를 갱신한다.
+
+    solve 스레드(solution callback)와 중단 감시 스레드에서도 호출되므로 세션 접근은 잠금으로 직렬화하고,
+    쓰기/조회는 min_interval 초 간격으로 제한한다 (건너뛴 incumbent 는 다음 호출이나 close 때 기록).
+    """
+
+    def __init__(self, job_id: str, min_interval: float = 1.0):
+        self.job_id = job_id
+        self.min_interval = min_interval
+        self._db = SessionLocal()
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+        self._last_incumbent = 0.0
+        self._last_check = 0.0
+        self._cancelled = False
+        self._accepted = False
+        self._pending = None
+        self._version = 0
+
+    def __call__(self, progress: float, incumbent_objective=None, message=None):
+        with self._lock:
+            self._flush_incumbent()
+            now = time.time()
+            if now - self._last_write < self.min_interval and progress < 1.0:
+                return
+            self._last_write = now
+            fields = {"progress": progress}
+            if incumbent_objective is not None:
+                fields["incumbent_objective"] = float(incumbent_objective)
+            if message:
+                fields["message"] = message
+            update_job_status(self._db, self.job_id, **fields)
+
+    def on_incumbent(self, objective, hard_violations: int, assignment: dict):
+        with self._lock:
+            self._pending = (objective, hard_violations, assignment)
+            self._flush_incumbent()
+
+    def _flush_incumbent(self, force: bool = False):
+        if self._pending is None:
+            return
+        now = time.time()
+        if not force and now - self._last_incumbent < self.min_interval:
+            return
+        objective, hard_violations, assignment = self._pending
+        self._pending = None
+        self._last_incumbent = now
+        self._version += 1
+        fields = {"hard_violations": hard_violations, "incumbent_roster": assignment,
+                  "incumbent_version": self._version}
+        if objective is not None:
+            fields["incumbent_objective"] = float(objective)
+        update_job_status(self._db, self.job_id, **fields)
+
+    def _refresh_flags(self):
+        now = time.time()
+        if now - self._last_check >= self.min_interval:
+            self._last_check = now
+            cancel, accept = _read_job_flags(self._db, self.job_id)
+            self._cancelled = self._cancelled or cancel
+            self._accepted = self._accepted or accept
+
+    def should_stop(self) -> bool:
+        with self._lock:
+            if not self._cancelled:
+                self._refresh_flags()
+            return self._cancelled
+
+    def accept_requested(self) -> bool:
+        with self._lock:
+            if not self._accepted:
+                self._refresh_flags()
+            return self._accepted
+
+    def close(self):
+        with self._lock:
+            try:
+                self._flush_incumbent(force=True)
+            finally:
+                self._db.close()
@@ -0,0 +1,166 @@
+"""
+CP-SAT 컴파일 모델 캐시 모듈
+- 입력 지문(간호사/설정/선호 행렬/고정·금지 셀/그룹 코드)으로 _build_full_model 결과를 재사용
+- 캐시 항목은 원본 CpModel 을 보관하고, 조회 시 clone() 사본과 (n, d, s) → 변수 인덱스 맵을 돌려준다
+- 캐시 모델에는 프리셉터(페어) 보너스를 넣지 않고 목적식 누적 상태를 함께 보관한다
+  → 한 번의 생성에서 초기해(페어 항 포함)와 LNS 영속 모델(페어 항 제외)이 같은 항목을 공유하고,
+    초기해 쪽은 사본에 페어 항만 덧붙여 목적식을 다시 건다
+- 프로세스 내 LRU (항목 수 + 변수·제약 수 합계 상한), 적중/미스 카운터는 /health/model-cache 로 노출
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from typing import Callable, Dict
+
+import numpy as np
+
+from services.cell_domains import cell_lookup
+from services.objective_compiler import ObjectiveCompiler
+
+
+def _feed(h, value):
+    """해시에 값을 결정적으로 누적한다 (dict 는 키 정렬, ndarray 는 shape/dtype/bytes)."""
+    if isinstance(value, np.ndarray):
+        h.update(f"nd{value.shape}{value.dtype}".encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        h.update(b"{")
+        for k in sorted(value, key=repr):
+            h.update(repr(k).encode()); _feed(h, value[k])
+        h.update(b"}")
+    elif isinstance(value, (list, tuple)):
+        h.update(b"[")
+        for v in value:
+            _feed(h, v)
+        h.update(b"]")
+    elif isinstance(value, (set, frozenset)):
+        _feed(h, sorted(value, key=repr))
+    elif is_dataclass(value) and not isinstance(value, type):
+        _feed(h, asdict(value))
+    else:
+        h.update(repr(value).encode())
+    h.update(b"|")
+
+
+def model_fingerprint(rs, grouped) -> str:
+    """캐시 대상 모델(페어 보너스 제외) 입력 전체에 대한 sha256 지문."""
+    h = hashlib.sha256()
+    cfg = dict(vars(rs.config))
+    _feed(h, {
+        'nurses': list(rs.nurses),
+        'config': cfg,
+        'target_month': rs.target_month,
+        'num_days': rs.num_days,
+        'preference': rs.preference_matrix,
+        'fixed_cells': getattr(rs, 'fixed_cells', None) or [],
+        'initial_forbidden': getattr(rs, 'initial_forbidden', None) or {},
+        'grouped': grouped or [],
+    })
+    return h.hexdigest()
+
+
+class CompiledModelCache:
+    """지문 → 컴파일된 CP-SAT 모델 LRU 캐시."""
+
+    def __init__(self, max_entries: int = 8, max_weight: int = 2_000_000):
+        self.max_entries = max_entries
+        self.max_weight = max_weight      # 보관 모델의 (변수 수 + 제약 수) 합계 상한
+        self._items: "OrderedDict[str, dict]" = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.build_seconds = 0.0          # 미스 시 빌드에 쓴 누적 시간
+        self.saved_seconds = 0.0          # 적중으로 생략한 빌드 시간 추정치
+
+    def get_or_build(self, key: str, build: Callable[[], tuple]):
+        """캐시에서 (model, X, join, leave, fixed, objective) 를 꺼내거나 build() 로 만든 뒤 저장한다.
+
+        objective 는 반환 모델에 묶인 ObjectiveCompiler 로, 호출자가 항을 더해 목적식을 다시 걸 수 있다.
+
+        반환 모델은 항상 호출자 전용 사본이므로 힌트 추가/도메인 변경을 해도 캐시는 오염되지 않는다.
+        """
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                self.saved_seconds += entry['build_seconds']
+        if entry is not None:
+            return self._materialize(entry)
+
+        t0 = time.time()
+        m, X, join, leave, fixed, var_index, objective = build()
+        elapsed = time.time() - t0
+        proto = m.Proto()
+        entry = {
+            'model': m.clone(),
+            'var_index': var_index,
+            'join': list(join),
+            'leave': list(leave),
+            'fixed': dict(fixed),
+            'objective': objective.snapshot(),
+            'weight': len(proto.variables) + len(proto.constraints),
+            'build_seconds': elapsed,
+        }
+        with self._lock:
+            self.misses += 1
+            self.build_seconds += elapsed
+            if entry['weight'] <= self.max_weight:
+                old = self._items.pop(key, None)
+                if old is not None:
+                    self._weight -= old['weight']
+                self._items[key] = entry
+                self._weight += entry['weight']
+                self._evict()
+        return m, X, join, leave, fixed, objective
+
+    @staticmethod
+    def _materialize(entry: dict):
+        m = entry['model'].clone()
+        Xv = {key: m.get_bool_var_from_proto_index(idx) for key, idx in entry['var_index'].items()}
+        fixed = dict(entry['fixed'])
+        objective = ObjectiveCompiler.restore(entry['objective'], m)
+        return m, cell_lookup(Xv, fixed), list(entry['join']), list(entry['leave']), fixed, objective
+
+    def _evict(self):
+        while self._items and (len(self._items) > self.max_entries or self._weight > self.max_weight):
+            _, old = self._items.popitem(last=False)
+            self._weight -= old['weight']
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._weight = 0
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._items),
+                'max_entries': self.max_entries,
+                'weight': self._weight,
+                'max_weight': self.max_weight,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'build_seconds': round(self.build_seconds, 3),
+                'saved_seconds': round(self.saved_seconds, 3),
+            }
+
+
+compiled_model_cache = CompiledModelCache(
+    max_entries=int(os.getenv('ROSTER_MODEL_CACHE_SIZE', '8')),
+    max_weight=int(os.getenv('ROSTER_MODEL_CACHE_MAX_WEIGHT', '2000000')),
+)
+
+
+def get_model_cache_stats() -> Dict[str, object]:
+    """컴파일 모델 캐시 적중/미스 통계 (프로세스 단위)."""
+    return compiled_model_cache.stats()
@@ -0,0 +1,128 @@
+"""
+CP-SAT 목적식 컴파일러
+- 셀(간호사×날짜)마다 exactly-one 이 걸려 있으면 Σ_s w[s]·X[s] = b + Σ_s (w[s]-b)·X[s] 이므로
+  셀별 기준값 b(가장 흔한 가중치)를 상수로 분리하고 기준값과 다른 교대만 항으로 남긴다
+  (기본 선호도 행렬은 D/E/N 이 같은 값이라 셀당 4항 → 1항)
+- 고정 셀은 값이 정해져 있으므로 전부 상수로 접는다
+- 같은 변수에 붙는 계수는 합치고 0 계수는 버린 뒤 WeightedSum 하나로 목적식을 만든다
+- 상수(offset)도 목적식에 포함하므로 ObjectiveValue 는 기존 dense 목적식과 같다
+"""
+from typing import Dict, Iterable, Mapping, Tuple
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+
+def preference_weights(preference_matrix: np.ndarray) -> np.ndarray:
+    """선호도 행렬 → 정수 목적 계수 (기존 int(P[n,d,s]*100) 과 같은 절삭)"""
+    return (np.asarray(preference_matrix, dtype=float) * 100).astype(np.int64)
+
+
+class ObjectiveCompiler:
+    """선형 목적식 누적기: 변수별 계수 병합, 상수 분리, 항 수 집계"""
+
+    def __init__(self, name: str = "objective"):
+        self.name = name
+        self._vars: Dict[int, cp_model.IntVar] = {}
+        self._coefs: Dict[int, int] = {}
+        self.offset = 0
+        self.dense_terms = 0        # 기존 방식(셀×교대 전부 나열)으로 만들었을 때의 항 수
+        self.baseline_cells = 0     # 기준값을 상수로 분리한 셀 수
+
+    def _add(self, coef: int, var):
+        coef = int(coef)
+        if isinstance(var, (int, np.integer)):
+            # 범위 밖 셀 등 X(...) 가 상수인 경우
+            self.offset += coef * int(var)
+            return
+        if coef == 0:
+            return
+        idx = var.Index()
+        self._vars[idx] = var
+        self._coefs[idx] = self._coefs.get(idx, 0) + coef
+
+    def add(self, coef: int, var):
+        """coef·var 항 1개 추가"""
+        self.dense_terms += 1
+        self._add(coef, var)
+
+    def add_terms(self, terms: Iterable[Tuple[int, object]]):
+        for coef, var in terms:
+            self.add(coef, var)
+
+    def add_assignment_weights(self, X, weights: np.ndarray, cells: Iterable[Tuple[int, int]],
+                               fixed: Mapping[Tuple[int, int], int]):
+        """Σ weights[n,d,s]·X(n,d,s) 를 셀별 기준값 분리 후 편차 항만 추가
+
+        인자:
+            X: X(n, d, s) → BoolVar (또는 상수 0)
+            weights: [N, D, S] 정수 계수
+            cells: exactly-one 이 걸린 (n, d) 와 고정 셀 목록
+            fixed: {(n, d): 고정 교대 index}
+        """
+        cells = list(cells)
+        if not cells:
+            return
+        S = weights.shape[2]
+        ns = np.fromiter((c[0] for c in cells), dtype=np.intp, count=len(cells))
+        ds = np.fromiter((c[1] for c in cells), dtype=np.intp, count=len(cells))
+        W = weights[ns, ds]                                              # [K, S]
+        self.dense_terms += W.size
+
+        # 셀별 최빈 가중치(동률이면 앞 교대)를 기준값으로
+        freq = (W[:, :, None] == W[:, None, :]).sum(axis=2)
+        base = W[np.arange(len(cells)), freq.argmax(axis=1)]
+        dev = W - base[:, None]
+
+        is_fixed = np.fromiter(((n, d) in fixed for n, d in cells), dtype=bool, count=len(cells))
+        for k in np.flatnonzero(is_fixed):
+            self.offset += int(W[k, fixed[(int(ns[k]), int(ds[k]))]])
+        self.offset += int(base[~is_fixed].sum())
+        self.baseline_cells += int((~is_fixed).sum())
+
+        dev[is_fixed] = 0
+        for k, s in zip(*np.nonzero(dev)):
+            self._add(dev[k, s], X(int(ns[k]), int(ds[k]), int(s)))
+
+    @property
+    def sparse_terms(self) -> int:
+        return sum(1 for c in self._coefs.values() if c != 0)
+
+    def expression(self):
+        items = [(self._vars[i], c) for i, c in self._coefs.items() if c != 0]
+        expr = cp_model.LinearExpr.weighted_sum([v for v, _ in items], [c for _, c in items])
+        return expr + self.offset
+
+    def stats(self) -> Dict[str, int]:
+        return {"dense_terms": self.dense_terms, "sparse_terms": self.sparse_terms,
+                "baseline_cells": self.baseline_cells, "offset": self.offset}
+
+    def snapshot(self) -> dict:
+        """모델 캐시 보관용 상태 (변수는 proto index 로만 보관)"""
+        return {"name": self.name, "coefs": dict(self._coefs), "offset": self.offset,
+                "dense_terms": self.dense_terms, "baseline_cells": self.baseline_cells}
+
+    @classmethod
+    def restore(cls, snapshot: dict, m: cp_model.CpModel) -> "ObjectiveCompiler":
+        """snapshot 을 모델 사본 m 의 변수에 다시 묶은 누적기 (이어서 항을 추가한 뒤 maximize 가능)"""
+        obj = cls(snapshot["name"])
+        obj._coefs = dict(snapshot["coefs"])
+        obj._vars = {i: m.get_int_var_from_proto_index(i) for i in obj._coefs}
+        obj.offset = snapshot["offset"]
+        obj.dense_terms = snapshot["dense_terms"]
+        obj.baseline_cells = snapshot["baseline_cells"]
+        return obj
+
+    def _report(self):
+        dense, sparse = self.dense_terms, self.sparse_terms
+        ratio = f"{sparse / dense * 100:.1f}%" if dense else "-"
+        print(f"[목적식] {self.name}: 항 {dense} → {sparse} ({ratio}), "
+              f"기준값 분리 셀 {self.baseline_cells}, 상수 {self.offset}")
+
+    def maximize(self, m: cp_model.CpModel):
+        m.Maximize(self.expression())
+        self._report()
+
+    def minimize(self, m: cp_model.CpModel):
+        m.Minimize(self.expression())
+        self._report()
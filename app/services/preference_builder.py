@@ -0,0 +1,102 @@
+"""
+선호도 행렬 빌더 모듈
+- RosterSystem 의 [N, D, S] 기본 선호도 행렬을 브로드캐스팅으로 한 번에 생성
+  (교대 배정 비율 → 야간 전담 가중치 → 수간호사 주말 OFF 패턴, Nurse.get_shift_preferences 와 같은 규칙)
+- 휴무/근무 유형/페어 요청은 db_id → index 맵으로 좌표 배열을 모은 뒤 팬시 인덱싱으로 한 번에 기록
+- 같은 셀에 요청이 여러 번 오면("5"/"05" 같은 날짜 키, A→B·B→A 페어 등) 파이썬 dict 로 먼저 합쳐
+  기존 순차 적용과 같이 마지막 값만 남긴 뒤 셀마다 한 번씩 기록한다
+  (반복 인덱스 팬시 대입의 기록 순서는 NumPy 가 보장하지 않음)
+"""
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+def nurse_index_map(nurses) -> Dict[str, int]:
+    """{db_id: RosterSystem 내부 index(Nurse.id)}"""
+    return {n.db_id: n.id for n in nurses}
+
+
+def build_base_preferences(nurses, num_days: int, config, weekend_days: Iterable[int]) -> np.ndarray:
+    """[N, D, S] 기본 선호도 행렬 (모든 간호사·날짜에 get_shift_preferences 를 적용한 것과 동일)"""
+    shift_types = config.shift_types
+    d_idx, e_idx = shift_types.index('D'), shift_types.index('E')
+    n_idx, off_idx = shift_types.index('N'), shift_types.index('O')
+
+    ratios = np.ones(len(shift_types))
+    ratios[d_idx] *= config.day_shift_ratio
+    ratios[e_idx] *= config.evening_shift_ratio
+    ratios[n_idx] *= config.night_shift_ratio
+    ratios[off_idx] *= config.off_shift_ratio
+
+    # 간호사별 교대 계수 [N, S]: 야간 전담(is_night_nurse == 3)은 N 가중, D/E 비선호
+    night_factor = np.ones(len(shift_types))
+    night_factor[n_idx] = config.night_nurse_weight
+    night_factor[e_idx] = config.night_nurse_weight * 0.2
+    night_factor[d_idx] = 0.2
+    is_night = np.array([n.is_night_nurse == 3 for n in nurses], dtype=bool)
+    nurse_ratios = np.where(is_night[:, None], ratios * night_factor, ratios)
+
+    prefs = np.repeat(nurse_ratios[:, None, :], num_days, axis=1)
+
+    # 수간호사 weekend 패턴: 주말은 모든 교대 0.1, OFF 2.0
+    heads = np.array([bool(n.is_head_nurse) and n.head_nurse_off_pattern == 'weekend' for n in nurses], dtype=bool)
+    days = np.array(sorted(d for d in weekend_days if 0 <= d < num_days), dtype=np.intp)
+    if heads.any() and days.size:
+        cell = np.ix_(np.flatnonzero(heads), days)
+        prefs[cell] = 0.1
+        prefs[cell + (off_idx,)] = 2.0
+    return prefs
+
+
+def collect_day_weights(index_map: Mapping[str, int], day_maps: Mapping[str, Mapping[str, float]],
+                        num_days: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+    """{nurse_id: {"일(1-based)": delta}} → (nurse idx, day idx, delta) 배열과 찾지 못한 nurse_id 목록
+
+    범위를 벗어난 날짜는 버리고, 같은 (간호사, 날짜)는 나중 값 하나만 남긴다.
+    """
+    cells: Dict[Tuple[int, int], float] = {}
+    missing = []
+    for nurse_id, day_map in day_maps.items():
+        n = index_map.get(nurse_id)
+        if n is None:
+            missing.append(nurse_id)
+            continue
+        for day_str, delta in day_map.items():
+            d = int(day_str)
+            if 1 <= d <= num_days:
+                cells[n, d - 1] = delta
+    rows, cols = _split_keys(cells)
+    return rows, cols, np.fromiter(cells.values(), dtype=float, count=len(cells)), missing
+
+
+def _split_keys(cells: Mapping[Tuple[int, int], object]) -> Tuple[np.ndarray, np.ndarray]:
+    keys = np.array(list(cells), dtype=np.intp).reshape(-1, 2)
+    return keys[:, 0], keys[:, 1]
+
+
+def scatter_pair_weights(matrix: np.ndarray, n1: np.ndarray, n2: np.ndarray, weights: np.ndarray):
+    """pair 행렬에 (n1, n2), (n2, n1) 을 대칭으로 기록 (요청 순서대로 적용한 결과와 동일)"""
+    if n1.size == 0:
+        return
+    # 요청 순서대로 두 방향을 dict 에 넣어 뒤 요청이 앞 요청의 칸(대칭 칸 포함)을 덮어쓰게 한 뒤 셀당 1회 기록
+    cells: Dict[Tuple[int, int], float] = {}
+    for a, b, w in zip(n1.tolist(), n2.tolist(), weights.tolist()):
+        cells[a, b] = w
+        cells[b, a] = w
+    rows, cols = _split_keys(cells)
+    matrix[rows, cols] = np.fromiter(cells.values(), dtype=float, count=len(cells))
+
+
+def collect_pairs(index_map: Mapping[str, int], pairs: List[dict], default_weight: float
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[dict], List[Optional[str]]]:
+    """페어 요청 목록 → (n1 idx, n2 idx, weight) 배열, 유효한 요청 목록, 찾지 못한 nurse_id 목록"""
+    n1, n2, weights, valid, missing = [], [], [], [], []
+    for pair in pairs:
+        i1, i2 = index_map.get(pair["nurse_1"]), index_map.get(pair["nurse_2"])
+        if i1 is None or i2 is None:
+            missing.extend(nid for nid, idx in ((pair["nurse_1"], i1), (pair["nurse_2"], i2)) if idx is None)
+            continue
+        n1.append(i1); n2.append(i2); weights.append(pair.get("weight", default_weight)); valid.append(pair)
+    return (np.array(n1, dtype=np.intp), np.array(n2, dtype=np.intp),
+            np.array(weights, dtype=float), valid, missing)
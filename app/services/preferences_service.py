@@ -5,11 +5,12 @@
 """
 import pprint
 from sqlalchemy.orm import Session
-from sqlalchemy import String, cast, extract
+from sqlalchemy import String, cast, extract, func, case
 from db.models import WantedRequest, Nurse, NurseShiftRequest, NursePairRequest, ShiftPreference
 from schemas.roster_schema import PreferenceData, PreferenceSubmit
 from schemas.auth_schema import User as UserSchema
-from datetime import datetime
+from datetime import datetime, date
+from collections import defaultdict
 
 
 # def save_preference_draft_service(pref_data: PreferenceData, current_user, db: Session):
@@ -272,80 +273,89 @@ def get_latest_preference_service(year: int, month: int, current_user, db: Sessi
 #     }
 
 
-def get_all_preferences_service(year: int, month: int, current_user, db: Session):
+def load_wish_preferences_bulk(db: Session, nurse_ids: list, year: int, month: int,
+                               include_drafts: bool = True, month_dates_only: bool = False):
     """
-    모든 간호사의 최신 선호도 데이터 조회 서비스 함수 (새 구조 기반)
-    - WantedRequest, NurseShiftRequest, NursePairRequest 조합
-    - Output은 기존 ShiftPreference.data 구조와 동일하게 유지
+    간호사 목록의 최신 희망 근무 요청을 한 번에 로드하는 공용 로더
+    - WantedRequest: 간호사별 최신 1건을 윈도우 쿼리 1회로 선택
+      (제출본 submitted_at 최신 우선, include_drafts=True 이면 제출본이 없을 때 가장 먼저 만든 초안)
+    - NurseShiftRequest / NursePairRequest: 선택된 요청들을 IN 쿼리 각 1회로 로드
+    - 반환: nurse_ids 순서를 따르는 기존 ShiftPreference.data 포맷 dict 리스트 (요청 없는 간호사는 제외)
     """
-    if not current_user:
-        raise Exception("Not authenticated")
-
+    if not nurse_ids:
+        return []
     month_str = f"{year}-{month:02d}"
 
-    # ✅ 1️⃣ 그룹 내 간호사 목록 가져오기
-    nurse_ids = [
-        n.nurse_id
-        for n in db.query(Nurse.nurse_id)
-        .filter(Nurse.group_id == current_user.group_id)
-        .all()
-    ]
-    # ✅ 2️⃣ 각 간호사별 최신 요청(WantedRequest) 찾기
-    wanted_requests = (
-        db.query(WantedRequest)
-        .filter(
-            WantedRequest.nurse_id.in_(nurse_ids),
-            WantedRequest.month == month_str,
-            WantedRequest.is_submitted == True,
+    # 1️⃣ 간호사별 최신 요청 1건 (ROW_NUMBER 윈도우)
+    filters = [WantedRequest.nurse_id.in_(nurse_ids), WantedRequest.month == month_str]
+    if not include_drafts:
+        filters.append(WantedRequest.is_submitted == True)
+    rn = func.row_number().over(
+        partition_by=WantedRequest.nurse_id,
+        order_by=(
+            WantedRequest.is_submitted.desc(),
+            case((WantedRequest.is_submitted == True, WantedRequest.submitted_at)).desc(),
+            WantedRequest.created_at.asc(),
+        ),
+    ).label("rn")
+    ranked = db.query(WantedRequest, rn).filter(*filters).subquery()
+    wr_rows = (
+        db.query(
+            ranked.c.nurse_id, ranked.c.request_id, ranked.c.request,
+            ranked.c.is_submitted, ranked.c.created_at, ranked.c.submitted_at,
         )
-        .order_by(WantedRequest.nurse_id, WantedRequest.submitted_at.desc())
+        .filter(ranked.c.rn == 1)
         .all()
     )
-    # ✅ 3️⃣ nurse_id별 최신 submitted request만 남기기
-    latest_wr_map = {}
-    for wr in wanted_requests:
-        if wr.nurse_id not in latest_wr_map:
-            latest_wr_map[wr.nurse_id] = wr
-    results = []
+    if not wr_rows:
+        return []
+    latest_wr_map = {wr.nurse_id: wr for wr in wr_rows}
+    wanted_keys = {(wr.nurse_id, wr.request_id) for wr in wr_rows}
+    request_ids = {wr.request_id for wr in wr_rows}
+    target_nurses = list(latest_wr_map.keys())
 
-    # ✅ 4️⃣ 각 nurse_id에 대해 shift/pair 요청 조회 및 JSON 구성
-    for nurse_id, wr in latest_wr_map.items():
-        # shift 요청들
-        shift_rows = (
-            db.query(NurseShiftRequest)
-            .filter(
-                NurseShiftRequest.nurse_id == nurse_id,
-                NurseShiftRequest.request_id == wr.request_id,
-                cast(NurseShiftRequest.shift_date, String).like(f"{month_str}-%"),
-            )
-            .all()
+    # 2️⃣ shift 요청 일괄 조회 (request_id 는 간호사별 번호이므로 (nurse_id, request_id) 로 다시 거른다)
+    shift_q = db.query(NurseShiftRequest).filter(
+        NurseShiftRequest.nurse_id.in_(target_nurses),
+        NurseShiftRequest.request_id.in_(request_ids),
+    )
+    if month_dates_only:
+        next_first = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        shift_q = shift_q.filter(
+            NurseShiftRequest.shift_date >= date(year, month, 1),
+            NurseShiftRequest.shift_date < next_first,
         )
-        shift_data = {"D": {}, "E": {}, "N": {}, "O": {}}
-        for s in shift_rows:
-            shift_type = s.shift.upper()
-            day = str(int(str(s.shift_date).split("-")[-1]))  # 날짜만 추출 (문자열 키)
-            if shift_type in shift_data:
-                shift_data[shift_type][day] = int(s.score) if s.score is not None else 0
+    shift_by_nurse = defaultdict(lambda: {"D": {}, "E": {}, "N": {}, "O": {}})
+    for s in shift_q.all():
+        if (s.nurse_id, s.request_id) not in wanted_keys:
+            continue
+        shift_type = s.shift.upper()
+        day = str(int(str(s.shift_date).split("-")[-1]))  # 날짜만 추출 (문자열 키)
+        shift_data = shift_by_nurse[s.nurse_id]
+        if shift_type in shift_data:
+            shift_data[shift_type][day] = int(s.score) if s.score is not None else 0
 
-        # pair 요청들
-        pair_rows = (
-            db.query(NursePairRequest)
-            .filter(
-                NursePairRequest.nurse_id == nurse_id,
-                NursePairRequest.request_id == wr.request_id,
-            )
-            .all()
+    # 3️⃣ pair 요청 일괄 조회
+    pair_rows = (
+        db.query(NursePairRequest)
+        .filter(
+            NursePairRequest.nurse_id.in_(target_nurses),
+            NursePairRequest.request_id.in_(request_ids),
         )
-        pair_data = [
-            {"id": p.target_id, "weight": p.score}
-            for p in pair_rows
-        ]
-        # ✅ data JSON 구성
-        data_json = {
-            "request": wr.request,
-            "shift": {k: v for k, v in shift_data.items() if v},
-            "preference": pair_data,
-        }
+        .all()
+    )
+    pair_by_nurse = defaultdict(list)
+    for p in pair_rows:
+        if (p.nurse_id, p.request_id) in wanted_keys:
+            pair_by_nurse[p.nurse_id].append({"id": p.target_id, "weight": p.score})
+
+    # 4️⃣ 기존 ShiftPreference 포맷으로 조립
+    results = []
+    for nurse_id in nurse_ids:
+        wr = latest_wr_map.get(nurse_id)
+        if wr is None:
+            continue
+        shift_data = shift_by_nurse.get(nurse_id, {})
         results.append({
             "nurse_id": nurse_id,
             "year": year,
@@ -353,11 +363,36 @@ def get_all_preferences_service(year: int, month: int, current_user, db: Session
             "is_submitted": bool(wr.is_submitted),
             "created_at": wr.created_at,
             "submitted_at": wr.submitted_at,
-            "data": data_json,
+            "data": {
+                "request": wr.request,
+                "shift": {k: v for k, v in shift_data.items() if v},
+                "preference": pair_by_nurse.get(nurse_id, []),
+            },
         })
-
     return results
 
+
+def get_all_preferences_service(year: int, month: int, current_user, db: Session):
+    """
+    모든 간호사의 최신 선호도 데이터 조회 서비스 함수 (새 구조 기반)
+    - WantedRequest, NurseShiftRequest, NursePairRequest 조합 (load_wish_preferences_bulk 공용 로더)
+    - Output은 기존 ShiftPreference.data 구조와 동일하게 유지
+    """
+    if not current_user:
+        raise Exception("Not authenticated")
+
+    # ✅ 그룹 내 간호사 목록 (nurse_id 순)
+    nurse_ids = sorted(
+        n.nurse_id
+        for n in db.query(Nurse.nurse_id)
+        .filter(Nurse.group_id == current_user.group_id)
+        .all()
+    )
+    # ✅ 제출본만, 해당 월 날짜의 shift 요청만
+    return load_wish_preferences_bulk(
+        db, nurse_ids, year, month, include_drafts=False, month_dates_only=True
+    )
+
 # def get_all_preferences_service(year: int, month: int, current_user, db: Session):
 #     """
 #     모든 간호사의 최신 선호도 데이터 조회 서비스 함수
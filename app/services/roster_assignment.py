@@ -0,0 +1,39 @@
+"""
+근무표 배정 행렬 헬퍼 모듈
+- RosterSystem 의 기본 저장 형식: [간호사 × 일수] int8 교대 인덱스 행렬 (config.shift_types 순서, 미배정 -1)
+- 기존 [N, D, S] one-hot 텐서와의 변환, 교대별 bool 마스크 생성
+- one-hot 을 받던 평가 함수들이 두 형식을 모두 받을 수 있도록 as_assignment 로 정규화
+"""
+from typing import Sequence
+
+import numpy as np
+
+UNASSIGNED = -1
+ASSIGNMENT_DTYPE = np.int8
+
+
+def empty_assignment(num_nurses: int, num_days: int) -> np.ndarray:
+    """모든 셀이 미배정(-1)인 [N, D] 배정 행렬"""
+    return np.full((num_nurses, num_days), UNASSIGNED, dtype=ASSIGNMENT_DTYPE)
+
+
+def from_onehot(roster: np.ndarray) -> np.ndarray:
+    """[N, D, S] one-hot → [N, D] 교대 인덱스 (1 인 칸이 없으면 -1)"""
+    hit = roster == 1
+    return np.where(hit.any(axis=2), hit.argmax(axis=2), UNASSIGNED).astype(ASSIGNMENT_DTYPE)
+
+
+def to_onehot(assignment: np.ndarray, num_shifts: int, dtype=float) -> np.ndarray:
+    """[N, D] 교대 인덱스 → [N, D, S] one-hot (미배정 셀은 전부 0)"""
+    return (assignment[..., None] == np.arange(num_shifts)).astype(dtype)
+
+
+def as_assignment(roster: np.ndarray) -> np.ndarray:
+    """[N, D] 배정 행렬은 그대로, [N, D, S] one-hot 은 배정 행렬로 변환"""
+    roster = np.asarray(roster)
+    return from_onehot(roster) if roster.ndim == 3 else roster
+
+
+def shift_mask(assignment: np.ndarray, shift_idx: Sequence[int]) -> np.ndarray:
+    """[..., len(shift_idx)] bool: 각 셀이 shift_idx[k] 교대에 배정되었는지"""
+    return assignment[..., None] == np.asarray(shift_idx)
@@ -7,9 +7,12 @@ from sqlalchemy.orm import Session
 from db.models import Nurse, ShiftPreference, RosterConfig, ScheduleEntry, Shift, Group, RosterConfig, Wanted, IssuedRoster, ShiftManage, Schedule, NurseShiftRequest, NursePairRequest, WantedRequest, DailyShift
 from schemas.roster_schema import RosterRequest
 from routers.utils import get_days_in_month, Timer
-from datetime import date
+from services.preferences_service import load_wish_preferences_bulk
+from services import job_progress
+from services.roster_service import replace_schedule_entries
+from datetime import date, datetime
 import uuid
-from sqlalchemy import func
+from sqlalchemy import func, exists
 from collections import defaultdict
 from db.client import get_db
 # from db.client2 import _get_mssql_session
@@ -38,98 +41,16 @@ except ImportError as e:
 def _collect_nurses_and_preferences(db: Session, req, current_user):
     """그룹 내 간호사 목록과 선호도(제출본 우선)를 수집한다. (WantedRequest 기반)"""
     # 1️⃣ 그룹 내 간호사 목록
-    print(11)
     nurses_in_group = (
         db.query(Nurse)
         .filter(Nurse.group_id == current_user.group_id)
         .order_by(Nurse.experience.desc(), Nurse.nurse_id.asc())
         .all()
     )
-    print(12)
     nurse_ids = [n.nurse_id for n in nurses_in_group]
-    month_str = f"{req.year}-{req.month:02d}"
-    preferences = []
-    print(13)
-    # 2️⃣ 각 간호사별 submitted → draft 순으로 선호도 가져오기
-    for nurse_id in nurse_ids:
-        print(14)
-        try:
-            submitted_wr = (
-                db.query(WantedRequest)
-                .filter(
-                    WantedRequest.nurse_id == nurse_id,
-                    WantedRequest.month == month_str,
-                    WantedRequest.is_submitted == True
-                )
-                .order_by(WantedRequest.submitted_at.desc())
-                .first()
-            )
-        except Exception as e:
-            print(f"error: {e}")
-        print(15)
-        target_wr = submitted_wr or (
-            db.query(WantedRequest)
-            .filter(
-                WantedRequest.nurse_id == nurse_id,
-                WantedRequest.month == month_str,
-            )
-            .order_by(WantedRequest.created_at.asc())
-            .first()
-        )
-        print(16)
-        if not target_wr:
-            continue  # 기록이 없는 간호사는 건너뜀
-
-        # 3️⃣ shift 데이터 수집
-        shift_rows = (
-            db.query(NurseShiftRequest)
-            .filter(
-                NurseShiftRequest.nurse_id == nurse_id,
-                NurseShiftRequest.request_id == target_wr.request_id,
-                # cast(NurseShiftRequest.shift_date, String).like(f"{month_str}-%"),
-            )
-            .all()
-        )
-        print(17)
-        shift_data = {"D": {}, "E": {}, "N": {}, "O": {}}
-        for s in shift_rows:
-            shift_type = s.shift.upper()
-            day = str(int(str(s.shift_date).split("-")[-1]))
-            if shift_type in shift_data:
-                shift_data[shift_type][day] = int(s.score) if s.score is not None else 0
-        print(18)
-        # 4️⃣ pair 데이터 수집
-        pair_rows = (
-            db.query(NursePairRequest)
-            .filter(
-                NursePairRequest.nurse_id == nurse_id,
-                NursePairRequest.request_id == target_wr.request_id,
-            )
-            .all()
-        )
-        print(19)
-        pair_data = [{"id": p.target_id, "weight": p.score} for p in pair_rows]
-
-        # 5️⃣ data JSON 구성
-        data_json = {
-            "request": target_wr.request,
-            "shift": {k: v for k, v in shift_data.items() if v},
-            "preference": pair_data,
-        }
-        print(20)
-        # 6️⃣ 기존 ShiftPreference 포맷으로 append
-        preferences.append({
-            "nurse_id": nurse_id,
-            "year": req.year,
-            "month": req.month,
-            "is_submitted": bool(target_wr.is_submitted),
-            "created_at": target_wr.created_at,
-            "submitted_at": target_wr.submitted_at,
-            "data": data_json,
-        })
-    print(21)
-    # 7️⃣ 기존 함수와 동일하게 반환
-    print("preferences", nurses_in_group, preferences)
+    # 2️⃣ submitted → draft 순 최신 요청 + shift/pair 행을 일괄 조회 (쿼리 3회)
+    preferences = load_wish_preferences_bulk(db, nurse_ids, req.year, req.month, include_drafts=True)
+    print(f"선호도 수집 완료: 간호사 {len(nurse_ids)}명, 요청 {len(preferences)}건")
     return nurses_in_group, preferences
 
 
@@ -264,7 +185,8 @@ def _query_prev_month_schedule_id(db: Session, group_id: str, year: int, month:
     # 2) 없으면 해당 월의 최신 Schedule
     latest = (
         db.query(Schedule)
-        .filter(Schedule.group_id == group_id, Schedule.year == py, Schedule.month == pm)
+        .filter(Schedule.group_id == group_id, Schedule.year == py, Schedule.month == pm,
+                Schedule.dropped == False)
         .order_by(Schedule.version.desc())
         .first()
     )
@@ -295,6 +217,43 @@ def _get_last_days_map(db: Session, schedule_id: str, days: int, code2main: dict
         result[nurse_id] = seq
     return result
 
+def _load_warm_start(db: Session, group_id: str, year: int, month: int, shift_manage_data) -> dict:
+    """같은 그룹/년/월의 최신 근무표(엔트리가 있는 버전)를 메인코드로 정규화해 반환한다.
+    반환: { nurse_id: ['D','E','O',...] } (1일..말일, 미배정은 '-') — CP-SAT 힌트용
+    """
+    latest = (
+        db.query(Schedule)
+        .filter(
+            Schedule.group_id == group_id,
+            Schedule.year == year,
+            Schedule.month == month,
+            Schedule.dropped == False,
+            exists().where(ScheduleEntry.schedule_id == Schedule.schedule_id),
+        )
+        .order_by(Schedule.version.desc())
+        .first()
+    )
+    if not latest:
+        return {}
+    code2main = {}
+    for r in (shift_manage_data or []):
+        for c in (r.get('codes') or []):
+            code2main[str(c).upper()] = r.get('main_code')
+    days = get_days_in_month(year, month)
+    rows = (
+        db.query(ScheduleEntry.nurse_id, ScheduleEntry.work_date, ScheduleEntry.shift_id)
+        .filter(ScheduleEntry.schedule_id == latest.schedule_id)
+        .all()
+    )
+    result: dict[str, list[str]] = {}
+    for nurse_id, work_date, shift_id in rows:
+        seq = result.setdefault(nurse_id, ['-'] * days)
+        d = int(work_date.day)
+        if 1 <= d <= days:
+            seq[d - 1] = _normalize_to_main(shift_id, code2main)
+    print(f"warm-start: 이전 버전 v{latest.version}({latest.schedule_id}) 간호사 {len(result)}명 로딩")
+    return result
+
 def _calc_tail_metrics(seq: list[str]) -> dict:
     """꼬리 시퀀스(길이<=6)로부터 연속성 메트릭을 계산한다."""
     if not seq:
@@ -428,6 +387,14 @@ def _run_cp_sat_basic(db: Session, current_user, nurses_in_group, preferences, l
         config_dict['initial_constraints'] = initial_constraints
     except Exception as e:
         print(f"이전 월 경계 제약 생성 실패: {e}")
+    # 같은 월 직전 버전 근무표를 힌트로 사용 (재생성 warm-start)
+    try:
+        if config_dict.get('warm_start_enable', True):
+            config_dict['warm_start'] = _load_warm_start(
+                db, current_user.group_id, req.year, req.month, shift_manage_data
+            )
+    except Exception as e:
+        print(f"warm-start 로딩 실패: {e}")
     try:
         print("cp_sat_basic 엔진 호출 준비 완료")
         cp_sat_result = generate_roster_cp_sat(
@@ -452,21 +419,8 @@ def _run_cp_sat_basic(db: Session, current_user, nurses_in_group, preferences, l
 
 
 def _persist_entries(db: Session, schedule, generated, req):
-    """생성된 근무표를 ScheduleEntry로 저장한다."""
-    db.query(ScheduleEntry).filter(ScheduleEntry.schedule_id == schedule.schedule_id).delete()
-    for nurse_id, shifts in generated.items():
-        for day_index, shift_id in enumerate(shifts):
-            if shift_id != '-':
-                work_date = date(req.year, req.month, day_index + 1)
-                entry = ScheduleEntry(
-                    entry_id=str(uuid.uuid4().hex)[:16],
-                    schedule_id=schedule.schedule_id,
-                    nurse_id=nurse_id,
-                    work_date=work_date,
-                    shift_id=shift_id.upper(),
-                )
-                db.add(entry)
-    db.commit()
+    """생성된 근무표를 ScheduleEntry로 저장한다. (bulk delete + 다중 VALUES insert)"""
+    replace_schedule_entries(db, schedule.schedule_id, req.year, req.month, generated)
 
 
 def _build_roster_response(db: Session, schedule, req, nurses_in_group):
@@ -540,6 +494,20 @@ def _apply_preceptor_gauge(config_dict: dict, gauge: int | None) -> None:
     # print(f"[프리셉터 게이지] g={g} → strength={strength}x, top_k={top_k}, min_w={min_w}, focus={config_dict['preceptor_focus_shifts']}")
     print(f"[프리셉터 게이지] g={g} → strength={strength}x, top_k={top_k}, min_w={min_w}")
 
+def _raise_if_cancelled_dropping(db: Session, schedule):
+    """작업 취소 시 solve 전에 커밋된 빈 스케줄 버전을 dropped 로 마킹한 뒤 JobCancelled 를 다시 발생시킨다."""
+    try:
+        job_progress.raise_if_cancelled()
+    except job_progress.JobCancelled:
+        if isinstance(schedule, Schedule):
+            db.rollback()
+            schedule.dropped = True
+            schedule.updated_at = datetime.now()
+            db.add(schedule)
+            db.commit()
+            print(f"작업 취소 → 빈 스케줄 버전 드롭: {schedule.schedule_id} (VER {schedule.version})")
+        raise
+
 # ───────────────────────────── 서비스 함수 ─────────────────────────────
 
 def generate_roster_service(req: RosterRequest, current_user, db: Session):
@@ -585,6 +553,12 @@ def generate_roster_service(req: RosterRequest, current_user, db: Session):
     # ── 프리셉터 게이지(0~10) → 파라미터 매핑 ──
     
     _apply_preceptor_gauge(config_dict, config_dict['preceptor_gauge'])
+    # 병렬 LNS 이웃 수 (요청에 지정된 경우만)
+    if getattr(req, 'lns_parallelism', None):
+        config_dict['lns_parallelism'] = req.lns_parallelism
+    # 근무 순서 규칙 인코딩 방식 (요청에 지정된 경우만)
+    if getattr(req, 'sequence_encoding', None):
+        config_dict['sequence_encoding'] = req.sequence_encoding
     # 경계 제약 기능 기본값
     config_dict.setdefault('cross_month_hard_rules_enable', True)
     config_dict.setdefault('cross_month_lookback_days', 6)
@@ -602,6 +576,9 @@ def generate_roster_service(req: RosterRequest, current_user, db: Session):
         time_limit_seconds=60,
         config_override=config_dict,
     )
+    # 작업 취소 요청 시 결과를 저장하지 않는다 (비동기 작업 실행 중에만 유효)
+    _raise_if_cancelled_dropping(db, schedule)
+    job_progress.report_progress(0.95, None, "근무표 저장 중")
     _persist_entries(db, schedule, generated, req)
     roster_data = _build_roster_response(db, schedule, req, nurses_in_group)
     return roster_data
@@ -662,6 +639,9 @@ def generate_roster_service_with_fixed_cells(req, current_user, db: Session):
         config_override=config_dict,
     )
 
+    # 작업 취소 요청 시 결과를 저장하지 않는다 (비동기 작업 실행 중에만 유효)
+    _raise_if_cancelled_dropping(db, schedule)
+    job_progress.report_progress(0.95, None, "근무표 저장 중")
     _persist_entries(db, schedule, generated, req)
     roster_data = _build_roster_response(db, schedule, req, nurses_in_group)
 
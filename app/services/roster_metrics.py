@@ -0,0 +1,245 @@
+"""
+근무표 만족도/요청 분석 벡터화 모듈
+- RosterSystem 의 [N, D] 교대 인덱스 배정 행렬(assignment)과 preference_matrix / pair_matrix 를 NumPy 연산으로 집계
+- 휴무·근무 요청(선호 점수 4 이상)과 페어 요청(함께/따로)의 요청 수, 만족 수, 요청별 만족 여부 계산
+- RosterSystem.calculate_individual_satisfaction / _calculate_pair_preference_satisfaction /
+  calculate_detailed_request_analysis 가 기존과 같은 dict 포맷으로 반환하도록 사용
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.roster_assignment import UNASSIGNED, as_assignment, shift_mask
+
+REQUEST_SCORE_THRESHOLD = 4  # 선호 점수가 이 값 이상이면 요청으로 간주
+
+
+def _pct(satisfied, total) -> float:
+    return (satisfied / total * 100) if total > 0 else 100.0
+
+
+def _dense_pair(mat, n: int) -> Optional[np.ndarray]:
+    """pair_matrix 항목(ndarray 또는 {(i, j): w} dict)을 [N, N] 배열로 변환"""
+    if mat is None:
+        return None
+    if isinstance(mat, np.ndarray):
+        out = np.zeros((n, n), dtype=mat.dtype)
+        h, w = min(n, mat.shape[0]), min(n, mat.shape[1])
+        out[:h, :w] = mat[:h, :w]
+        return out
+    if isinstance(mat, dict):
+        out = np.zeros((n, n), dtype=float)
+        for (i, j), v in mat.items():
+            if 0 <= i < n and 0 <= j < n:
+                out[i, j] = v
+        return out
+    return None
+
+
+def _pair_index(pairs, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    arr = np.asarray(sorted(p for p in pairs if 0 <= p[0] < n and 0 <= p[1] < n), dtype=np.int64).reshape(-1, 2)
+    return arr[:, 0], arr[:, 1]
+
+
+def together_days(assignment: np.ndarray, n1: np.ndarray, n2: np.ndarray) -> np.ndarray:
+    """[P, D] bool: 쌍 (n1[k], n2[k]) 이 그날 같은 교대(OFF 포함)에 배정되었는지 (_are_nurses_working_together 벡터판)"""
+    if n1.size == 0:
+        return np.zeros((0, assignment.shape[1]), dtype=bool)
+    return (assignment[n1] == assignment[n2]) & (assignment[n1] != UNASSIGNED)
+
+
+def request_masks(roster: np.ndarray, preference: np.ndarray, shift_types: List[str]):
+    """휴무/근무 요청 마스크와 충족 마스크 ([N, D] / [N, D, S]). roster 는 배정 행렬 또는 one-hot"""
+    off_idx = shift_types.index('O')
+    assignment = as_assignment(roster)
+    off_req = preference[:, :, off_idx] >= REQUEST_SCORE_THRESHOLD
+    off_ok = off_req & (assignment == off_idx)
+    shift_req = preference >= REQUEST_SCORE_THRESHOLD
+    shift_req[:, :, off_idx] = False
+    shift_ok = shift_req & shift_mask(assignment, range(preference.shape[2]))
+    return off_req, off_ok, shift_req, shift_ok
+
+
+def pair_request_counts(rs, assignment: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """간호사별 (페어 요청 수, 충족 수). 요청자(방향성) 정보가 있으면 그것만, 없으면 행렬 기반."""
+    N, D = assignment.shape[:2]
+    total = np.zeros(N, dtype=np.int64)
+    satisfied = np.zeros(N, dtype=np.int64)
+    pair_matrix = getattr(rs, 'pair_matrix', None)
+    if pair_matrix is None:
+        return total, satisfied
+
+    pair_requests = getattr(rs, 'pair_requests', None)
+    if isinstance(pair_requests, dict):
+        together_set = {p for p in pair_requests.get("together", set()) if p[0] != p[1]}
+        # together 요청이 우선 (같은 쌍의 apart 요청은 무시)
+        apart_set = {p for p in pair_requests.get("apart", set()) if p[0] != p[1]} - together_set
+        groups = [(together_set, True), (apart_set, False)]
+    else:
+        together = _dense_pair(pair_matrix.get("together") if isinstance(pair_matrix, dict) else None, N)
+        apart = _dense_pair(pair_matrix.get("apart") if isinstance(pair_matrix, dict) else None, N)
+        has_t = together > 0 if together is not None else np.zeros((N, N), dtype=bool)
+        has_a = (apart > 0 if apart is not None else np.zeros((N, N), dtype=bool)) & ~has_t
+        np.fill_diagonal(has_t, False); np.fill_diagonal(has_a, False)
+        groups = [(set(zip(*np.nonzero(has_t))), True), (set(zip(*np.nonzero(has_a))), False)]
+
+    for pairs, want_together in groups:
+        n1, n2 = _pair_index(pairs, N)
+        if n1.size == 0:
+            continue
+        tog = together_days(assignment, n1, n2)
+        ok = tog.sum(axis=1) if want_together else (~tog).sum(axis=1)
+        np.add.at(total, n1, D)
+        np.add.at(satisfied, n1, ok)
+    return total, satisfied
+
+
+def individual_satisfaction(rs) -> Dict[str, Dict]:
+    """간호사별 휴무/근무/페어 만족도 (RosterSystem.calculate_individual_satisfaction 과 같은 포맷)"""
+    assignment, shift_types = rs.assignment, rs.config.shift_types
+    off_req, off_ok, shift_req, shift_ok = request_masks(assignment, rs.preference_matrix, shift_types)
+    off_total, off_sat = off_req.sum(axis=1), off_ok.sum(axis=1)
+    shift_total, shift_sat = shift_req.sum(axis=(1, 2)), shift_ok.sum(axis=(1, 2))
+    pair_total, pair_sat = pair_request_counts(rs, assignment)
+
+    result = {}
+    for n, nurse in enumerate(rs.nurses):
+        ot, os_, st, ss, pt, ps = (int(off_total[n]), int(off_sat[n]), int(shift_total[n]),
+                                   int(shift_sat[n]), int(pair_total[n]), int(pair_sat[n]))
+        total, sat = ot + st + pt, os_ + ss + ps
+        result[nurse.db_id] = {
+            "nurse_id": nurse.db_id,
+            "name": nurse.name,
+            "off_satisfaction": _pct(os_, ot),
+            "shift_satisfaction": _pct(ss, st),
+            "pair_satisfaction": _pct(ps, pt),
+            "total_requests": total,
+            "satisfied_requests": sat,
+            "overall_satisfaction": _pct(sat, total),
+            "off_request_count": ot,
+            "shift_request_count": st,
+            "pair_request_count": pt,
+        }
+    return result
+
+
+def pair_preference_satisfaction(rs) -> Dict[str, float]:
+    """그룹 전체 페어 만족도 (RosterSystem._calculate_pair_preference_satisfaction 과 같은 포맷)"""
+    N, D = len(rs.nurses), rs.num_days
+    assignment = rs.assignment
+
+    pair_requests = getattr(rs, 'pair_requests', None)
+    if isinstance(pair_requests, dict):
+        counts = {}
+        for key, want_together in (("together", True), ("apart", False)):
+            n1, n2 = _pair_index(pair_requests.get(key, set()), N)
+            tog = together_days(assignment, n1, n2)
+            counts[key] = (n1.size * D, int(tog.sum() if want_together else (~tog).sum()))
+        (t_total, t_sat), (a_total, a_sat) = counts["together"], counts["apart"]
+    else:
+        # 후방 호환: 대칭 행렬 방식 (요구 교대 기준, 기존 집계 규칙 유지)
+        cfg = rs.config
+        req_idx = [cfg.shift_types.index(s) for s in cfg.daily_shift_requirements.keys()]
+        M = shift_mask(assignment, req_idx).astype(np.int64)       # [N, D, K]
+        T = _dense_pair(rs.pair_matrix.get("together"), N) > 0
+        A = _dense_pair(rs.pair_matrix.get("apart"), N) > 0
+        # together 쌍 (i<j): 같은 교대 (날, 교대) 수 → 충족, 같은 교대가 하나도 없는 날 → 불충족
+        t1, t2 = np.nonzero(np.triu(T, 1))
+        same = M[t1] * M[t2]                                          # [P, D, K]
+        t_sat = int(same.sum())
+        t_total = t_sat + int((same.sum(axis=2) == 0).sum())
+        # apart 순서쌍: 서로 다른 교대 조합 → 충족 / (i<j) 같은 교대 → 불충족
+        a1, a2 = np.nonzero(A)
+        work1, work2 = M[a1].sum(axis=2), M[a2].sum(axis=2)
+        a_sat = int((work1 * work2).sum() - (M[a1] * M[a2]).sum())
+        upper = a1 < a2
+        a_total = a_sat + int((M[a1[upper]] * M[a2[upper]]).sum())
+
+    total, sat = t_total + a_total, t_sat + a_sat
+    return {
+        "together": _pct(t_sat, t_total),
+        "apart": _pct(a_sat, a_total),
+        "overall": _pct(sat, total),
+    }
+
+
+def detailed_request_analysis(rs) -> Dict:
+    """요청별 상세 분석 (RosterSystem.calculate_detailed_request_analysis 와 같은 포맷/순서)"""
+    assignment, P, shift_types = rs.assignment, rs.preference_matrix, rs.config.shift_types
+    nurses = rs.nurses
+    off_idx = shift_types.index('O')
+    off_req, off_ok, shift_req, shift_ok = request_masks(assignment, P, shift_types)
+    details = []
+
+    # 휴무 요청 (간호사 → 일자 순)
+    n_idx, d_idx = np.nonzero(off_req)
+    ok = off_ok[n_idx, d_idx].tolist()
+    scores = P[n_idx, d_idx, off_idx]
+    for k, (n, d) in enumerate(zip(n_idx.tolist(), d_idx.tolist())):
+        details.append({
+            "nurse_id": nurses[n].db_id,
+            "nurse_name": nurses[n].name,
+            "day": d + 1,
+            "request_type": "off",
+            "satisfied": ok[k],
+            "preference_score": scores[k],
+        })
+
+    # 근무 유형 요청 (간호사 → 일자 → 교대 순)
+    n_idx, d_idx, s_idx = np.nonzero(shift_req)
+    ok = shift_ok[n_idx, d_idx, s_idx].tolist()
+    scores = P[n_idx, d_idx, s_idx]
+    for k, (n, d, s) in enumerate(zip(n_idx.tolist(), d_idx.tolist(), s_idx.tolist())):
+        details.append({
+            "nurse_id": nurses[n].db_id,
+            "nurse_name": nurses[n].name,
+            "day": d + 1,
+            "request_type": "shift",
+            "shift_type": shift_types[s],
+            "satisfied": ok[k],
+            "preference_score": scores[k],
+        })
+
+    # 페어 요청 (n1 < n2 쌍 × 일자, together 우선)
+    pair_total = pair_sat = 0
+    pair_matrix = getattr(rs, 'pair_matrix', None)
+    if pair_matrix is not None:
+        N, D = len(nurses), rs.num_days
+        together = _dense_pair(pair_matrix.get("together") if isinstance(pair_matrix, dict) else None, N)
+        apart = _dense_pair(pair_matrix.get("apart") if isinstance(pair_matrix, dict) else None, N)
+        together = together if together is not None else np.zeros((N, N))
+        apart = apart if apart is not None else np.zeros((N, N))
+        upper = np.triu(np.ones((N, N), dtype=bool), 1)
+        n1, n2 = np.nonzero(upper & ((together > 0) | (apart > 0)))
+        if n1.size:
+            want_together = together[n1, n2] > 0
+            tog = together_days(assignment, n1, n2)
+            sat = np.where(want_together[:, None], tog, ~tog)
+            score = np.maximum(together[n1, n2], apart[n1, n2])
+            pair_total, pair_sat = int(sat.size), int(sat.sum())
+            sat_list = sat.tolist()
+            for k, (a, b) in enumerate(zip(n1.tolist(), n2.tolist())):
+                pair_type = "work_together" if want_together[k] else "work_apart"
+                for d in range(D):
+                    details.append({
+                        "nurse_1_id": nurses[a].db_id,
+                        "nurse_1_name": nurses[a].name,
+                        "nurse_2_id": nurses[b].db_id,
+                        "nurse_2_name": nurses[b].name,
+                        "day": d + 1,
+                        "request_type": "pair",
+                        "pair_type": pair_type,
+                        "satisfied": sat_list[k][d],
+                        "preference_score": score[k],
+                    })
+
+    total_requests = {"off": int(off_req.sum()), "shift": int(shift_req.sum()), "pair": pair_total}
+    satisfied_requests = {"off": int(off_ok.sum()), "shift": int(shift_ok.sum()), "pair": pair_sat}
+    rate = {k: _pct(satisfied_requests[k], total_requests[k]) for k in ("off", "shift", "pair")}
+    rate["overall"] = _pct(sum(satisfied_requests.values()), sum(total_requests.values()))
+    return {
+        "total_requests": total_requests,
+        "satisfied_requests": satisfied_requests,
+        "satisfaction_rate": rate,
+        "request_details": details,
+    }
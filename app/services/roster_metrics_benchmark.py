@@ -0,0 +1,473 @@
+"""
+근무표 만족도 지표 벤치마크 (기존 루프 구현 vs roster_metrics 벡터화 구현)
+- 20/50/100명 병동 크기로 임의의 근무표·선호 행렬·페어 요청을 만들어 결과 일치 여부와 소요 시간을 비교
+- 실행: app 디렉터리에서 `python -m services.roster_metrics_benchmark`
+- _legacy_* 함수는 벡터화 이전 RosterSystem 메서드를 그대로 옮긴 참조 구현 (비교용으로만 사용)
+"""
+import time
+from datetime import date
+from typing import Dict
+
+import numpy as np
+
+from db.nurse_config import Nurse
+from services.roster_system import RosterSystem
+from services import roster_metrics
+
+WARD_SIZES = (20, 50, 100)
+REPEAT = 3
+
+
+def _legacy_pair_preference_satisfaction(rs):
+    """간호사 페어링 선호도 만족도를 계산합니다."""
+    if not hasattr(rs, 'pair_matrix'):
+        return {"together": 100.0, "apart": 100.0, "overall": 100.0}
+
+    # 요청자 기준 계산이 가능하면 해당 방식 사용 (방향성, '-'는 모수 제외)
+    if hasattr(rs, 'pair_requests') and isinstance(rs.pair_requests, dict):
+        together_reqs = rs.pair_requests.get("together", set())
+        apart_reqs = rs.pair_requests.get("apart", set())
+
+        total_together_prefs = 0
+        satisfied_together_prefs = 0
+        total_apart_prefs = 0
+        satisfied_apart_prefs = 0
+
+        # together 요청자 기준 집계
+        for n1, n2 in together_reqs:
+            for day in range(rs.num_days):
+                total_together_prefs += 1
+                if _are_nurses_working_together(rs, n1, n2, day):
+                    satisfied_together_prefs += 1
+
+        # apart 요청자 기준 집계
+        for n1, n2 in apart_reqs:
+            for day in range(rs.num_days):
+                total_apart_prefs += 1
+                if not _are_nurses_working_together(rs, n1, n2, day):
+                    satisfied_apart_prefs += 1
+
+        together_satisfaction = 100.0 if total_together_prefs == 0 else (satisfied_together_prefs / total_together_prefs) * 100.0
+        apart_satisfaction = 100.0 if total_apart_prefs == 0 else (satisfied_apart_prefs / total_apart_prefs) * 100.0
+
+        total_prefs = total_together_prefs + total_apart_prefs
+        satisfied_prefs = satisfied_together_prefs + satisfied_apart_prefs
+        overall_satisfaction = 100.0 if total_prefs == 0 else (satisfied_prefs / total_prefs) * 100.0
+
+        return {
+            "together": together_satisfaction,
+            "apart": apart_satisfaction,
+            "overall": overall_satisfaction
+        }
+
+    # 후방 호환: 기존 대칭 행렬 방식
+    # 함께 일하기 선호도 만족도
+    total_together_prefs = 0
+    satisfied_together_prefs = 0
+
+    # 따로 일하기 선호도 만족도
+    total_apart_prefs = 0
+    satisfied_apart_prefs = 0
+
+    # 각 날짜에 대해
+    for day in range(rs.num_days):
+        # 각 근무 유형에 대해
+        for shift in rs.config.daily_shift_requirements.keys():
+            shift_idx = rs.config.shift_types.index(shift)
+
+            # 이 근무 유형에 배정된 간호사 찾기
+            assigned_nurses = [i for i in range(len(rs.nurses))
+                             if rs.roster[i, day, shift_idx] == 1]
+
+            # 함께 일하는 선호도 계산
+            for i in range(len(assigned_nurses)):
+                for j in range(i+1, len(assigned_nurses)):
+                    n1 = assigned_nurses[i]
+                    n2 = assigned_nurses[j]
+
+                    # 함께 일하기 원하는 쌍인 경우
+                    if rs.pair_matrix["together"][n1, n2] > 0:
+                        total_together_prefs += 1
+                        satisfied_together_prefs += 1
+
+            # 다른 교대에 배정된 간호사들과의 관계 확인
+            for other_shift in rs.config.daily_shift_requirements.keys():
+                if shift == other_shift:
+                    continue
+                other_shift_idx = rs.config.shift_types.index(other_shift)
+                other_assigned = [i for i in range(len(rs.nurses))
+                                 if rs.roster[i, day, other_shift_idx] == 1]
+
+                # 두 교대 간의 간호사 쌍 확인
+                for n1 in assigned_nurses:
+                    for n2 in other_assigned:
+                        # 따로 일하기 원하는 쌍인 경우
+                        if rs.pair_matrix["apart"][n1, n2] > 0:
+                            total_apart_prefs += 1
+                            satisfied_apart_prefs += 1
+
+    # 불만족 케이스 확인
+    for n1 in range(len(rs.nurses)):
+        for n2 in range(n1+1, len(rs.nurses)):
+            # 함께 일하기 원하는 쌍인 경우
+            if rs.pair_matrix["together"][n1, n2] > 0:
+                # 각 날짜에 대해 함께 근무했는지 확인
+                for day in range(rs.num_days):
+                    together_today = False
+                    # 각 근무 유형에 대해
+                    for shift in rs.config.daily_shift_requirements.keys():
+                        shift_idx = rs.config.shift_types.index(shift)
+                        # 둘 다 같은 교대에 배정된 경우
+                        if (rs.roster[n1, day, shift_idx] == 1 and
+                            rs.roster[n2, day, shift_idx] == 1):
+                            together_today = True
+                            break
+                    # 이날 함께 근무하지 않았으면 총 선호도 카운트만 추가
+                    if not together_today:
+                        total_together_prefs += 1
+
+            # 따로 일하기 원하는 쌍인 경우
+            if rs.pair_matrix["apart"][n1, n2] > 0:
+                # 각 날짜에 대해 같은 근무에 배정되었는지 확인
+                for day in range(rs.num_days):
+                    for shift in rs.config.daily_shift_requirements.keys():
+                        shift_idx = rs.config.shift_types.index(shift)
+                        # 둘 다 같은 교대에 배정된 경우 (선호도 불만족)
+                        if (rs.roster[n1, day, shift_idx] == 1 and
+                            rs.roster[n2, day, shift_idx] == 1):
+                            total_apart_prefs += 1
+
+    # 종합 만족도 계산
+    together_satisfaction = 100.0 if total_together_prefs == 0 else (satisfied_together_prefs / total_together_prefs) * 100.0
+    apart_satisfaction = 100.0 if total_apart_prefs == 0 else (satisfied_apart_prefs / total_apart_prefs) * 100.0
+
+    # 종합 선호도 점수
+    total_prefs = total_together_prefs + total_apart_prefs
+    satisfied_prefs = satisfied_together_prefs + satisfied_apart_prefs
+    overall_satisfaction = 100.0 if total_prefs == 0 else (satisfied_prefs / total_prefs) * 100.0
+
+    return {
+        "together": together_satisfaction,
+        "apart": apart_satisfaction,
+        "overall": overall_satisfaction
+    }
+
+
+def _legacy_individual_satisfaction(rs) -> Dict[str, Dict]:
+    """개개인의 만족도를 계산합니다."""
+    individual_satisfaction = {}
+
+    for n_idx, nurse in enumerate(rs.nurses):
+        nurse_id = nurse.db_id
+        satisfaction = {
+            "nurse_id": nurse_id,
+            "name": nurse.name,
+            "off_satisfaction": 0.0,
+            "shift_satisfaction": 0.0,
+            "pair_satisfaction": 0.0,
+            "total_requests": 0,
+            "satisfied_requests": 0,
+            "overall_satisfaction": 0.0
+        }
+
+        # 휴무 선호도 만족도 계산
+        off_idx = rs.config.shift_types.index('O')
+        total_off_requests = 0
+        satisfied_off_requests = 0
+
+        for day in range(rs.num_days):
+            if rs.preference_matrix[n_idx, day, off_idx] >= 4:
+                total_off_requests += 1
+                if rs.roster[n_idx, day, off_idx] == 1:
+                    satisfied_off_requests += 1
+
+        satisfaction["off_satisfaction"] = (satisfied_off_requests / total_off_requests * 100) if total_off_requests > 0 else 100.0
+        satisfaction["off_request_count"] = total_off_requests
+
+        # 근무 유형 선호도 만족도 계산
+        total_shift_requests = 0
+        satisfied_shift_requests = 0
+
+        for day in range(rs.num_days):
+            for shift_idx, shift_type in enumerate(rs.config.shift_types):
+                if shift_type != 'O' and rs.preference_matrix[n_idx, day, shift_idx] >= 4:
+                    total_shift_requests += 1
+                    if rs.roster[n_idx, day, shift_idx] == 1:
+                        satisfied_shift_requests += 1
+
+        satisfaction["shift_satisfaction"] = (satisfied_shift_requests / total_shift_requests * 100) if total_shift_requests > 0 else 100.0
+        satisfaction["shift_request_count"] = total_shift_requests
+
+        # 페어링 선호도 만족도 계산
+        total_pair_requests = 0
+        satisfied_pair_requests = 0
+
+        if hasattr(rs, 'pair_matrix') and rs.pair_matrix is not None:
+            # 요청자(방향성) 기준 계산만 사용: 사용자 입력 요청만 카운트
+            has_directional = hasattr(rs, 'pair_requests') and isinstance(rs.pair_requests, dict)
+            if has_directional:
+                together_reqs = rs.pair_requests.get("together", set())
+                apart_reqs = rs.pair_requests.get("apart", set())
+                for other_n_idx in range(len(rs.nurses)):
+                    if other_n_idx == n_idx:
+                        continue
+                    req_together = (n_idx, other_n_idx) in together_reqs
+                    req_apart = (n_idx, other_n_idx) in apart_reqs
+                    if not (req_together or req_apart):
+                        continue
+                    for day in range(rs.num_days):
+                        total_pair_requests += 1
+                        if req_together:
+                            if _are_nurses_working_together(rs, n_idx, other_n_idx, day):
+                                satisfied_pair_requests += 1
+                        elif req_apart:
+                            if not _are_nurses_working_together(rs, n_idx, other_n_idx, day):
+                                satisfied_pair_requests += 1
+            else:
+                # 방향성 정보가 전혀 없는 경우에만 후방 호환(행렬 기반) 사용
+                together_mat = rs.pair_matrix.get("together") if isinstance(rs.pair_matrix, dict) else None
+                apart_mat = rs.pair_matrix.get("apart") if isinstance(rs.pair_matrix, dict) else None
+                def _has_pref(mat, i, j):
+                    if mat is None:
+                        return False
+                    if isinstance(mat, np.ndarray):
+                        try:
+                            return mat[i, j] > 0
+                        except Exception:
+                            return False
+                    if isinstance(mat, dict):
+                        return mat.get((i, j), 0) > 0
+                    return False
+                for other_n_idx in range(len(rs.nurses)):
+                    if other_n_idx != n_idx:
+                        for day in range(rs.num_days):
+                            has_together = _has_pref(together_mat, n_idx, other_n_idx)
+                            has_apart = _has_pref(apart_mat, n_idx, other_n_idx)
+                            if has_together or has_apart:
+                                total_pair_requests += 1
+                                if has_together:
+                                    if _are_nurses_working_together(rs, n_idx, other_n_idx, day):
+                                        satisfied_pair_requests += 1
+                                elif has_apart:
+                                    if not _are_nurses_working_together(rs, n_idx, other_n_idx, day):
+                                        satisfied_pair_requests += 1
+        satisfaction["pair_satisfaction"] = (satisfied_pair_requests / total_pair_requests * 100) if total_pair_requests > 0 else 100.0
+        satisfaction["pair_request_count"] = total_pair_requests
+
+        # 전체 요청 수와 만족한 요청 수 계산
+        satisfaction["total_requests"] = total_off_requests + total_shift_requests + total_pair_requests
+        satisfaction["satisfied_requests"] = satisfied_off_requests + satisfied_shift_requests + satisfied_pair_requests
+
+        # 전체 만족도 계산
+        if satisfaction["total_requests"] > 0:
+            satisfaction["overall_satisfaction"] = (satisfaction["satisfied_requests"] / satisfaction["total_requests"]) * 100
+        else:
+            satisfaction["overall_satisfaction"] = 100.0
+
+        individual_satisfaction[nurse_id] = satisfaction
+
+    return individual_satisfaction
+
+
+def _legacy_detailed_request_analysis(rs) -> Dict:
+    """요청별 상세 분석을 계산합니다."""
+    analysis = {
+        "total_requests": {
+            "off": 0,
+            "shift": 0,
+            "pair": 0
+        },
+        "satisfied_requests": {
+            "off": 0,
+            "shift": 0,
+            "pair": 0
+        },
+        "satisfaction_rate": {
+            "off": 0.0,
+            "shift": 0.0,
+            "pair": 0.0,
+            "overall": 0.0
+        },
+        "request_details": []
+    }
+
+    # 휴무 요청 분석
+    off_idx = rs.config.shift_types.index('O')
+    for n_idx in range(len(rs.nurses)):
+        for day in range(rs.num_days):
+            if rs.preference_matrix[n_idx, day, off_idx] >= 4:
+                analysis["total_requests"]["off"] += 1
+                if rs.roster[n_idx, day, off_idx] == 1:
+                    analysis["satisfied_requests"]["off"] += 1
+                    analysis["request_details"].append({
+                        "nurse_id": rs.nurses[n_idx].db_id,
+                        "nurse_name": rs.nurses[n_idx].name,
+                        "day": day + 1,
+                        "request_type": "off",
+                        "satisfied": True,
+                        "preference_score": rs.preference_matrix[n_idx, day, off_idx]
+                    })
+                else:
+                    analysis["request_details"].append({
+                        "nurse_id": rs.nurses[n_idx].db_id,
+                        "nurse_name": rs.nurses[n_idx].name,
+                        "day": day + 1,
+                        "request_type": "off",
+                        "satisfied": False,
+                        "preference_score": rs.preference_matrix[n_idx, day, off_idx]
+                    })
+
+    # 근무 유형 요청 분석
+    for n_idx in range(len(rs.nurses)):
+        for day in range(rs.num_days):
+            for shift_idx, shift_type in enumerate(rs.config.shift_types):
+                if shift_type != 'O' and rs.preference_matrix[n_idx, day, shift_idx] >= 4:
+                    analysis["total_requests"]["shift"] += 1
+                    if rs.roster[n_idx, day, shift_idx] == 1:
+                        analysis["satisfied_requests"]["shift"] += 1
+                        analysis["request_details"].append({
+                            "nurse_id": rs.nurses[n_idx].db_id,
+                            "nurse_name": rs.nurses[n_idx].name,
+                            "day": day + 1,
+                            "request_type": "shift",
+                            "shift_type": shift_type,
+                            "satisfied": True,
+                            "preference_score": rs.preference_matrix[n_idx, day, shift_idx]
+                        })
+                    else:
+                        analysis["request_details"].append({
+                            "nurse_id": rs.nurses[n_idx].db_id,
+                            "nurse_name": rs.nurses[n_idx].name,
+                            "day": day + 1,
+                            "request_type": "shift",
+                            "shift_type": shift_type,
+                            "satisfied": False,
+                            "preference_score": rs.preference_matrix[n_idx, day, shift_idx]
+                        })
+
+    # 페어링 요청 분석
+    if hasattr(rs, 'pair_matrix') and rs.pair_matrix is not None:
+        together_mat = rs.pair_matrix.get("together") if isinstance(rs.pair_matrix, dict) else None
+        apart_mat = rs.pair_matrix.get("apart") if isinstance(rs.pair_matrix, dict) else None
+
+        def _get_weight(mat, i, j):
+            if mat is None:
+                return 0
+            if isinstance(mat, np.ndarray):
+                try:
+                    return mat[i, j]
+                except Exception:
+                    return 0
+            if isinstance(mat, dict):
+                return mat.get((i, j), 0)
+            return 0
+
+        for n1 in range(len(rs.nurses)):
+            for n2 in range(n1 + 1, len(rs.nurses)):
+                for day in range(rs.num_days):
+                    together_pref = _get_weight(together_mat, n1, n2)
+                    apart_pref = _get_weight(apart_mat, n1, n2)
+
+                    if together_pref > 0 or apart_pref > 0:
+                        analysis["total_requests"]["pair"] += 1
+                        request_type = "work_together" if together_pref > 0 else "work_apart"
+                        satisfied = False
+
+                        if together_pref > 0:
+                            satisfied = _are_nurses_working_together(rs, n1, n2, day)
+                        else:
+                            satisfied = not _are_nurses_working_together(rs, n1, n2, day)
+
+                        if satisfied:
+                            analysis["satisfied_requests"]["pair"] += 1
+
+                        analysis["request_details"].append({
+                            "nurse_1_id": rs.nurses[n1].db_id,
+                            "nurse_1_name": rs.nurses[n1].name,
+                            "nurse_2_id": rs.nurses[n2].db_id if n2 < len(rs.nurses) else None,
+                            "nurse_2_name": rs.nurses[n2].name if n2 < len(rs.nurses) else None,
+                            "day": day + 1,
+                            "request_type": "pair",
+                            "pair_type": request_type,
+                            "satisfied": satisfied,
+                            "preference_score": max(together_pref, apart_pref)
+                        })
+
+    # 만족도 계산
+    for request_type in ["off", "shift", "pair"]:
+        total = analysis["total_requests"][request_type]
+        satisfied = analysis["satisfied_requests"][request_type]
+        analysis["satisfaction_rate"][request_type] = (satisfied / total * 100) if total > 0 else 100.0
+
+    total_requests = sum(analysis["total_requests"].values())
+    total_satisfied = sum(analysis["satisfied_requests"].values())
+    analysis["satisfaction_rate"]["overall"] = (total_satisfied / total_requests * 100) if total_requests > 0 else 100.0
+
+    return analysis
+
+
+def _are_nurses_working_together(rs, n1: int, n2: int, day: int) -> bool:
+    """두 간호사가 같은 날 같은 근무에 배정되었는지 확인합니다."""
+    for shift_idx in range(len(rs.config.shift_types)):
+        if (rs.roster[n1, day, shift_idx] == 1 and
+            rs.roster[n2, day, shift_idx] == 1):
+            return True
+    return False
+
+
+def _make_system(num_nurses: int, directional: bool, seed: int = 0) -> RosterSystem:
+    """임의 근무표(one-hot)·선호 행렬(0~5)·페어 요청을 가진 RosterSystem 생성"""
+    rng = np.random.default_rng(seed)
+    nurses = [Nurse(id=i, name=f"간호사{i}", experience_years=float(i % 10), db_id=f"N{i:03d}")
+              for i in range(num_nurses)]
+    rs = RosterSystem(nurses, target_month=date(2025, 3, 1), preference_matrix=np.zeros((num_nurses, 31, 4)))
+    S = len(rs.config.shift_types)
+    rs.preference_matrix = rng.integers(0, 6, size=(num_nurses, rs.num_days, S)).astype(float)
+    rs.roster = np.eye(S)[rng.integers(0, S, size=(num_nurses, rs.num_days))]
+
+    together = np.zeros((num_nurses, num_nurses))
+    apart = np.zeros((num_nurses, num_nurses))
+    pairs = rng.integers(0, num_nurses, size=(num_nurses, 2))
+    for i, (a, b) in enumerate(pairs):
+        if a != b:
+            (together if i % 2 == 0 else apart)[a, b] = 1 + i % 3
+    rs.pair_matrix = {"together": together, "apart": apart}
+    if directional:
+        rs.pair_requests = {
+            "together": {tuple(map(int, p)) for p in zip(*np.nonzero(together))},
+            "apart": {tuple(map(int, p)) for p in zip(*np.nonzero(apart))},
+        }
+    elif hasattr(rs, 'pair_requests'):
+        del rs.pair_requests
+    return rs
+
+
+def _timed(fn, rs):
+    best = float('inf')
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        out = fn(rs)
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def run_benchmark():
+    cases = [
+        ("individual", _legacy_individual_satisfaction, roster_metrics.individual_satisfaction),
+        ("pair", _legacy_pair_preference_satisfaction, roster_metrics.pair_preference_satisfaction),
+        ("detailed", _legacy_detailed_request_analysis, roster_metrics.detailed_request_analysis),
+    ]
+    print(f"\n{'nurses':>6} {'pair_mode':>11} {'metric':>10} {'legacy(ms)':>11} {'numpy(ms)':>10} {'speedup':>8} match")
+    for size in WARD_SIZES:
+        for directional in (True, False):
+            rs = _make_system(size, directional, seed=size)
+            for label, legacy_fn, fast_fn in cases:
+                old, t_old = _timed(legacy_fn, rs)
+                new, t_new = _timed(fast_fn, rs)
+                mode = "directional" if directional else "matrix"
+                print(f"{size:>6} {mode:>11} {label:>10} {t_old * 1000:>11.2f} {t_new * 1000:>10.2f} "
+                      f"{t_old / max(t_new, 1e-9):>7.1f}x {old == new}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -4,15 +4,23 @@
 - 모든 함수는 한글 docstring, 한글 print/logging, PEP8 스타일 적용
 """
 from sqlalchemy.orm import Session
-from db.models import RosterConfig as RosterConfigModel, Schedule, ShiftPreference, Nurse, ScheduleEntry, Shift, Group, RosterConfig, Wanted, IssuedRoster, ShiftManage
+from db.models import RosterConfig as RosterConfigModel, Schedule, ShiftPreference, Nurse, ScheduleEntry, ScheduleRow, Shift, Group, RosterConfig, Wanted, IssuedRoster, ShiftManage
 from schemas.roster_schema import RosterConfigCreate, PublishRequest, RosterRequest
 from db.roster_config import NurseRosterConfig
 from db.nurse_config import Nurse as NurseEngine
 from services.roster_system import RosterSystem
 from datetime import date, datetime
-from sqlalchemy import func
+from sqlalchemy import func, insert, delete
+import calendar
+import os
 import uuid
 
+# executemany 1회당 행 수 (SQLAlchemy insertmanyvalues 가 다중 VALUES INSERT 로 묶어 전송)
+ENTRY_INSERT_CHUNK = 1000
+# 압축 행 포맷(schedule_rows) 동시 기록 여부 기본값
+COMPACT_ROWS_DEFAULT = os.getenv("ROSTER_COMPACT_ROWS", "0") == "1"
+_schedule_rows_ready = False
+
 
 def save_roster_config_service(config_data: RosterConfigCreate, user, db: Session):
     """
@@ -172,4 +180,68 @@ def get_schedule_status_service(year: int, month: int, current_user, db: Session
         "submitted_at": None
     }
 
-# ... (다른 서비스 함수도 동일하게 분리하여 추가 예정) ... 
\ No newline at end of file
+# ... (다른 서비스 함수도 동일하게 분리하여 추가 예정) ... 
+
+
+def _ensure_schedule_rows_table(db: Session):
+    """schedule_rows 테이블이 없으면 생성한다 (프로세스당 1회)."""
+    global _schedule_rows_ready
+    if not _schedule_rows_ready:
+        ScheduleRow.__table__.create(bind=db.get_bind(), checkfirst=True)
+        _schedule_rows_ready = True
+
+
+def replace_schedule_entries(db: Session, schedule_id: str, year: int, month: int, roster: dict,
+                             skip_codes=('-',), compact: bool | None = None,
+                             chunk_size: int = ENTRY_INSERT_CHUNK, commit: bool = True) -> int:
+    """
+    스케줄의 근무 배정을 통째로 교체하는 bulk 저장 함수
+    - roster: {nurse_id: [교대코드(일자 순)]}
+    - 기존 행은 DELETE 1회, 새 행은 chunk_size 단위 executemany(insert) 로 기록 (ORM 객체/flush 미사용)
+      → 컴파일된 INSERT 를 재사용하고 드라이버에는 다중 VALUES 문으로 전달된다
+    - compact=True 이면 간호사당 1행(schedule_rows)도 함께 기록 (None 이면 ROSTER_COMPACT_ROWS 환경변수)
+    - 반환: 저장한 schedule_entries 행 수
+    """
+    days_in_month = calendar.monthrange(year, month)[1]
+    work_dates = [date(year, month, d + 1) for d in range(days_in_month)]
+    # entry_id: 저장 1회당 랜덤 prefix 10자 + 6자리 16진 일련번호 (행마다 uuid4 생성 생략)
+    prefix = uuid.uuid4().hex[:10]
+    rows, compact_rows = [], []
+    for nurse_id, shifts in roster.items():
+        codes = []
+        for day_index, shift_id in enumerate(shifts[:days_in_month]):
+            code = str(shift_id).strip().upper() if shift_id else ''
+            codes.append(code or '-')
+            if not code or code in skip_codes:
+                continue
+            rows.append({
+                "entry_id": f"{prefix}{len(rows):06x}",
+                "schedule_id": schedule_id,
+                "nurse_id": nurse_id,
+                "work_date": work_dates[day_index],
+                "shift_id": code,
+            })
+        compact_rows.append({"schedule_id": schedule_id, "nurse_id": nurse_id,
+                             "year": year, "month": month, "shifts": codes})
+
+    db.execute(delete(ScheduleEntry).where(ScheduleEntry.schedule_id == schedule_id))
+    for i in range(0, len(rows), chunk_size):
+        db.execute(insert(ScheduleEntry), rows[i:i + chunk_size])
+
+    if COMPACT_ROWS_DEFAULT if compact is None else compact:
+        _ensure_schedule_rows_table(db)
+        db.execute(delete(ScheduleRow).where(ScheduleRow.schedule_id == schedule_id))
+        for i in range(0, len(compact_rows), chunk_size):
+            db.execute(insert(ScheduleRow), compact_rows[i:i + chunk_size])
+
+    if commit:
+        db.commit()
+    print(f"근무표 저장: schedule_id={schedule_id}, entries={len(rows)}, 간호사={len(roster)}")
+    return len(rows)
+
+
+def load_compact_schedule(db: Session, schedule_id: str) -> dict:
+    """schedule_rows 압축 포맷 조회 → {nurse_id: [교대코드...]} (기록되지 않았으면 빈 dict)"""
+    _ensure_schedule_rows_table(db)
+    rows = db.query(ScheduleRow.nurse_id, ScheduleRow.shifts).filter(ScheduleRow.schedule_id == schedule_id).all()
+    return {r.nurse_id: list(r.shifts or []) for r in rows}
@@ -8,6 +8,10 @@ import logging
 from db.roster_config import NurseRosterConfig, DEFAULT_CONFIG
 from db.nurse_config import Nurse
 from services.holiday_pack import get_weekends   # ← 주말 헬퍼
+from services.roster_violations import ViolationReport, IncrementalViolationScorer, evaluate_hard_violations
+from services.roster_assignment import UNASSIGNED, as_assignment, empty_assignment, from_onehot, to_onehot
+from services import roster_metrics
+from services import preference_builder
 
 def _weekend_set(year: int, month: int) -> set[int]:
     """해당 월의 주말 날짜(1‑based)를 {0‑based day_idx} 로 반환."""
@@ -45,8 +49,10 @@ class RosterSystem:
             
         self.num_days = calendar.monthrange(self.target_month.year, self.target_month.month)[1]
         
-        # 근무표 행렬 초기화: [간호사 × 일수 × 교대]
-        self.roster = np.zeros((len(nurses), self.num_days, config.num_shifts))
+        # 근무표 행렬 초기화: [간호사 × 일수] int8 교대 인덱스 (미배정 -1)
+        # 기존 [간호사 × 일수 × 교대] one-hot 은 roster 속성으로 필요할 때만 만든다
+        self._assignment = empty_assignment(len(nurses), self.num_days)
+        self._onehot = None
         
         # 선호도 데이터 저장
         self.shift_preferences = shift_preferences or {}
@@ -55,13 +61,16 @@ class RosterSystem:
         
         # 고정된 셀 정보
         self.fixed_cells = []
+
+        # DB nurse_id → 내부 index (요청 적용 시 간호사 탐색용)
+        self.nurse_index = preference_builder.nurse_index_map(nurses)
         
         # 선호도 행렬 설정
         if preference_matrix is not None:
             self.preference_matrix = preference_matrix
             print("외부 제공 선호도 행렬 사용.")
         else:
-            self.preference_matrix = np.zeros_like(self.roster)
+            self.preference_matrix = np.zeros((len(nurses), self.num_days, config.num_shifts))
             # 선호도 행렬 초기화
             self._initialize_preferences()
 
@@ -83,18 +92,54 @@ class RosterSystem:
         
         print(f"초기화 완료: {time.time() - start_time:.4f}초 소요")
         
+    # ───────── 0. 근무표 저장 형식 (배정 행렬 ↔ one-hot 뷰) ─────────
+    @property
+    def assignment(self) -> np.ndarray:
+        """[N, D] int8 교대 인덱스 행렬 (config.shift_types 순서, 미배정 -1). 근무표의 기본 저장소"""
+        if self._onehot is not None:
+            # one-hot 뷰로 값을 바꿨을 수 있으므로 반영 후 뷰를 버린다
+            self._assignment = from_onehot(self._onehot)
+            self._onehot = None
+        return self._assignment
+
+    @assignment.setter
+    def assignment(self, value: np.ndarray):
+        self._assignment = np.array(as_assignment(value), dtype=self._assignment.dtype)
+        self._onehot = None
+
+    @property
+    def roster(self) -> np.ndarray:
+        """기존 코드 호환용 [N, D, S] float one-hot 뷰
+
+        Notes:
+            뷰를 만든 뒤 assignment 를 다시 읽기 전까지는 뷰가 기준이므로 roster[n, d, s] = 1 같은 기존 쓰기도 반영된다.
+        """
+        if self._onehot is None:
+            self._onehot = to_onehot(self._assignment, self.config.num_shifts)
+        return self._onehot
+
+    @roster.setter
+    def roster(self, value: np.ndarray):
+        self.assignment = value
+
+    def __getstate__(self):
+        # LNS 워커로 보낼 때는 배정 행렬만 직렬화 (one-hot 뷰는 S 배 크기)
+        state = self.__dict__.copy()
+        if state.get('_onehot') is not None:
+            state['_assignment'] = from_onehot(state['_onehot'])
+        state['_onehot'] = None
+        return state
+
     def _initialize_preferences(self):
         """모든 간호사와 날짜에 대한 선호도 행렬을 초기화합니다."""
         print("선호도 행렬 계산 중...")
         start_time = time.time()
         
         weekend_days = _weekend_set(self.target_month.year, self.target_month.month)
-
-        for n_idx, nurse in enumerate(self.nurses):
-            for day in range(self.num_days):
-                self.preference_matrix[n_idx, day] = nurse.get_shift_preferences(
-                    day, self.num_days, self.config, weekend_days
-                )
+        # 간호사·날짜별 get_shift_preferences 호출 대신 [N, D, S] 를 브로드캐스팅으로 한 번에 생성
+        self.preference_matrix[:] = preference_builder.build_base_preferences(
+            self.nurses, self.num_days, self.config, weekend_days
+        )
                 
         print(f"선호도 행렬 계산 완료: {time.time() - start_time:.4f}초 소요")
        
@@ -106,7 +151,7 @@ class RosterSystem:
         
         if day < L:               # 검사할 이력이 부족
             return True
-        return not np.all(self.roster[nurse_idx, day-L:day, night_idx] == 1)
+        return not np.all(self.assignment[nurse_idx, day-L:day] == night_idx)
 
     def _check_day_after_night(self, nurse_idx: int, day: int) -> bool:
         """전날 Night 근무 후 Day 근무 여부(N→D 금지)"""
@@ -114,13 +159,14 @@ class RosterSystem:
             return True
         night_idx = self.config.shift_types.index('N')
         day_idx   = self.config.shift_types.index('D')
-        return not (self.roster[nurse_idx, day-1, night_idx] == 1 and
-                    self.roster[nurse_idx, day,   day_idx]   == 1)
+        A = self.assignment
+        return not (A[nurse_idx, day-1] == night_idx and
+                    A[nurse_idx, day]   == day_idx)
 
     def _check_monthly_night_limit(self, nurse_idx: int, day: int) -> bool:
         """월 누적 야간 근무 제한 초과 여부"""
         night_idx = self.config.shift_types.index('N')
-        total_nights = np.sum(self.roster[nurse_idx, :day+1, night_idx])
+        total_nights = np.sum(self.assignment[nurse_idx, :day+1] == night_idx)
         return total_nights <= self.config.max_night_shifts_per_month
 
     # ───────── 3. 연속 근무일 함수 리네이밍·정돈 🔄 ─────────
@@ -135,7 +181,7 @@ class RosterSystem:
         for d in range(day, day-max_work-1, -1):
             if d < 0:
                 break
-            is_working = np.sum(self.roster[nurse_idx, d, :off_idx]) > 0
+            is_working = 0 <= self.assignment[nurse_idx, d] < off_idx
             if is_working:
                 consecutive += 1
                 if consecutive > max_work:
@@ -152,7 +198,7 @@ class RosterSystem:
             shift_idx = self.config.shift_types.index(shift)
             exp_count = sum(
                 1 for n_idx, nurse in enumerate(experienced_nurses)
-                if self.roster[n_idx, day, shift_idx] == 1
+                if self.assignment[n_idx, day] == shift_idx
             )
             if exp_count < self.config.required_experienced_nurses:
                 return False
@@ -173,24 +219,14 @@ class RosterSystem:
         """
         off_idx     = self.config.shift_types.index("O")
         base_weight = self.config.shift_preference_weights.get("O", 10.0)
-        for target_nurse_id, day_map in off_requests.items():
-
-            valid_days = []
-            for day_str, delta in day_map.items():
-                d = int(day_str)
-                if 1 <= d <= self.num_days:
-                    valid_days.append(d)
-            
-            if not valid_days:
-                continue
-            nurse = next((n for n in self.nurses if n.db_id == target_nurse_id), None)
+        rows, days, deltas, missing = preference_builder.collect_day_weights(
+            self.nurse_index, off_requests, self.num_days
+        )
+        for target_nurse_id in missing:
+            print(f"경고: ID {target_nurse_id}인 간호사를 찾을 수 없습니다.")
 
-
-            # ★ 가중치 반영
-            for d in valid_days:
-                day_idx = d-1
-                delta   = day_map[str(d)]
-                self.preference_matrix[nurse.id, day_idx, off_idx] = base_weight + delta
+        # ★ 가중치 반영
+        self.preference_matrix[rows, days, off_idx] = base_weight + deltas
             
     def apply_shift_preferences(self, shift_preferences: Dict[str, Dict[str, Dict[str, float]]]):
         """
@@ -205,9 +241,11 @@ class RosterSystem:
         }
         """
         print("근무 유형 선호도 적용 중...")
+        # 근무 유형별로 {nurse_id: {일: delta}} 로 모은 뒤 유형마다 한 번에 기록
+        by_shift: Dict[str, Dict[str, Dict[str, float]]] = {}
         for target_nurse_id, shifts in shift_preferences.items():
             
-            if target_nurse_id is None:
+            if target_nurse_id is None or target_nurse_id not in self.nurse_index:
                 print(f"경고: ID {target_nurse_id}인 간호사를 찾을 수 없습니다.")
                 continue
             
@@ -215,15 +253,13 @@ class RosterSystem:
                 if shift_type not in self.config.shift_types:
                     print(f"경고: 유효하지 않은 근무 유형: {shift_type}")
                     continue
-                
-                shift_idx = self.config.shift_types.index(shift_type)
-                default_weight = self.config.shift_preference_weights.get(shift_type, 5.0)
-                nurse = next((n for n in self.nurses if n.db_id == target_nurse_id), None)
-                for day_str, delta in day_weight_map.items():
-                    day = int(day_str)
-                    if 1 <= day <= self.num_days:
-                        day_idx = day - 1
-                        self.preference_matrix[nurse.id, day_idx, shift_idx] = default_weight + delta
+                by_shift.setdefault(shift_type, {})[target_nurse_id] = day_weight_map
+
+        for shift_type, day_maps in by_shift.items():
+            shift_idx = self.config.shift_types.index(shift_type)
+            default_weight = self.config.shift_preference_weights.get(shift_type, 5.0)
+            rows, days, deltas, _ = preference_builder.collect_day_weights(self.nurse_index, day_maps, self.num_days)
+            self.preference_matrix[rows, days, shift_idx] = default_weight + deltas
         print("근무 유형 선호도 적용 완료")
         
     def apply_pair_preferences(self, pair_preferences: Dict[str, List[Dict[str, Union[int, float]]]]):
@@ -250,85 +286,52 @@ class RosterSystem:
             "apart": set()
         }
         
-        # together (함께 일하기 원하는 쌍) 처리
-        if "work_together" in pair_preferences:
-            for pair in pair_preferences["work_together"]:
-                nurse_1_id = pair["nurse_1"]
-                nurse_2_id = pair["nurse_2"]
-                weight = pair.get("weight", self.config.pair_preference_weight)
-                source = pair.get("source")
-                nurse_1_idx = next((n.id for n in self.nurses if n.db_id == nurse_1_id), None)
-                nurse_2_idx = next((n.id for n in self.nurses if n.db_id == nurse_2_id), None)
-                
-                if nurse_1_idx is not None and nurse_2_idx is not None:
-                    self.pair_matrix["together"][nurse_1_idx, nurse_2_idx] = weight
-                    self.pair_matrix["together"][nurse_2_idx, nurse_1_idx] = weight  # 대칭적으로 설정
-                    # 요청자 기준 저장 (대칭 저장하지 않음) — 사용자 요청만 기록
-                    if source != 'preceptor':
-                        self.pair_requests["together"].add((nurse_1_idx, nurse_2_idx))
-                else:
-                    if nurse_1_idx is None:
-                        print(f"경고: ID {nurse_1_id}인 간호사를 찾을 수 없습니다.")
-                    if nurse_2_idx is None:
-                        print(f"경고: ID {nurse_2_id}인 간호사를 찾을 수 없습니다.")
-        
-        # apart (따로 일하기 원하는 쌍) 처리
-        if "work_apart" in pair_preferences:
-            for pair in pair_preferences["work_apart"]:
-                nurse_1_id = pair["nurse_1"]
-                nurse_2_id = pair["nurse_2"]
-                weight = pair.get("weight", self.config.pair_preference_weight)
-                nurse_1_idx = next((n.id for n in self.nurses if n.db_id == nurse_1_id), None)
-                nurse_2_idx = next((n.id for n in self.nurses if n.db_id == nurse_2_id), None)
-                
-                if nurse_1_idx is not None and nurse_2_idx is not None:
-                    self.pair_matrix["apart"][nurse_1_idx, nurse_2_idx] = weight
-                    self.pair_matrix["apart"][nurse_2_idx, nurse_1_idx] = weight  # 대칭적으로 설정
-                    # 요청자 기준 저장 (대칭 저장하지 않음)
-                    self.pair_requests["apart"].add((nurse_1_idx, nurse_2_idx))
-                else:
-                    if nurse_1_idx is None:
-                        print(f"경고: ID {nurse_1_id}인 간호사를 찾을 수 없습니다.")
-                    if nurse_2_idx is None:
-                        print(f"경고: ID {nurse_2_id}인 간호사를 찾을 수 없습니다.")
+        for key, kind in (("work_together", "together"), ("work_apart", "apart")):
+            n1, n2, weights, valid, missing = preference_builder.collect_pairs(
+                self.nurse_index, pair_preferences.get(key) or [], self.config.pair_preference_weight
+            )
+            for nurse_id in missing:
+                print(f"경고: ID {nurse_id}인 간호사를 찾을 수 없습니다.")
+            # 대칭적으로 설정
+            preference_builder.scatter_pair_weights(self.pair_matrix[kind], n1, n2, weights)
+            # 요청자 기준 저장 (대칭 저장하지 않음) — 사용자 요청만 기록 (프리셉터 자동 페어 제외)
+            self.pair_requests[kind].update(
+                (int(a), int(b)) for a, b, pair in zip(n1, n2, valid)
+                if kind == "apart" or pair.get("source") != 'preceptor'
+            )
+        
         print("간호사 페어링 선호도 초기화 완료")
     
-    # ───────── 1. find_violations 수정 ─────────
+    # ───────── 1. find_violations (벡터화 엔진 기반) ─────────
+    def evaluate_violations(self) -> ViolationReport:
+        """하드 위반을 NumPy 로 한 번에 평가해 카운트/셀 마스크를 반환합니다."""
+        return evaluate_hard_violations(self.assignment, self.config)
+
     def _find_violations(self) -> List[dict]:
-        violations = []
+        """하드 위반 목록(dict 리스트). 커버리지 부족은 일·교대당 1건으로 보고합니다."""
+        return self.evaluate_violations().to_list()
 
-        # (1) 일별 ‑ 병동 요구·경력 체크 (변경 없음) ...
+    # ───────── 1-1. 증분(delta) 위반 평가 + undo 로그 (LNS 수락 판정용) ─────────
+    def begin_incremental_scoring(self) -> int:
+        """현재 roster 를 전체 평가해 증분 평가 상태를 초기화하고 하드 위반 총합을 반환합니다."""
+        self._scorer = IncrementalViolationScorer(self.assignment, self.config)
+        return self._scorer.total
 
-        # (2) 간호사별 제약
-        for n_idx, nurse in enumerate(self.nurses):
-            for day in range(self.num_days):
-                # ── 2‑A. 야간 제약 3종 🔄
+    def mark_cells(self, n_set, d_set):
+        """n_set × d_set 셀을 바꾸기 전에 호출: 기존 값을 undo 로그에 기록합니다."""
+        self._scorer.mark(self.assignment, n_set, d_set)
 
-                # Check shift requirements
-                for shift, required in self.config.daily_shift_requirements.items():
-                    shift_idx = self.config.shift_types.index(shift)
-                    actual = np.sum(self.roster[:, day, shift_idx])
-                    if actual < required:  # 필요 인원보다 적을 때만 위반으로 처리
-                        violations.append({
-                            'type': 'shift_requirement',
-                            'day': day,
-                            'shift': shift,
-                            'required': required,
-                            'actual': actual
-                        })
-                    violations.append({'type': 'shift_requirements', 'nurse_idx': n_idx, 'day': day})
-                if not self._check_consecutive_night_limit(n_idx, day):
-                    violations.append({'type': 'night_consecutive', 'nurse_idx': n_idx, 'day': day})
-                if not self._check_day_after_night(n_idx, day):
-                    violations.append({'type': 'night_nd', 'nurse_idx': n_idx, 'day': day})
-                if not self._check_monthly_night_limit(n_idx, day):
-                    violations.append({'type': 'night_month_limit', 'nurse_idx': n_idx, 'day': day})
+    def rescore_cells(self) -> int:
+        """마지막 mark_cells 구간만 재평가해 갱신된 하드 위반 총합을 반환합니다."""
+        return self._scorer.rescore(self.assignment)
 
-                # ── 2‑B. 연속 근무일 🔄
-                if not self._check_max_consecutive_work_days(n_idx, day):
-                    violations.append({'type': 'consecutive_work', 'nurse_idx': n_idx, 'day': day})
+    def undo_cells(self) -> int:
+        """마지막 mark_cells 이후의 변경을 되돌리고 하드 위반 총합을 반환합니다."""
+        return self._scorer.undo(self.assignment)
 
-        return violations
+    def commit_cells(self):
+        """undo 로그를 비워 현재 상태를 확정합니다."""
+        self._scorer.commit()
 
 
     def calculate_metrics(self) -> Dict:
@@ -347,12 +350,13 @@ class RosterSystem:
         unassigned_slots = 0
         staffing_violations = 0
         experience_violations = 0
+        A = self.assignment
         
         for day in range(self.num_days):
             # Check staffing requirements
             for shift in ['D', 'E', 'N']:
                 shift_idx = self.config.shift_types.index(shift)
-                assigned = np.sum(self.roster[:, day, shift_idx])
+                assigned = np.sum(A[:, day] == shift_idx)
                 required = self.config.daily_shift_requirements[shift]
                 
                 if assigned < required:
@@ -365,7 +369,7 @@ class RosterSystem:
                 exp_nurses = sum(
                     1 for n_idx, nurse in enumerate(self.nurses)
                     if (nurse.experience_years >= self.config.min_experience_per_shift and
-                        self.roster[n_idx, day, shift_idx] == 1)
+                        A[n_idx, day] == shift_idx)
                 )
                 if exp_nurses < self.config.required_experienced_nurses:
                     exp_violations += 1
@@ -373,22 +377,20 @@ class RosterSystem:
             
             # Count shifts per nurse
             for n_idx, nurse in enumerate(self.nurses):
-                assigned = False
-                for shift in self.config.shift_types:
-                    shift_idx = self.config.shift_types.index(shift)
-                    if self.roster[n_idx, day, shift_idx] == 1:
-                        shift_counts[shift] += 1
-                        nurse_shift_counts[nurse.name][shift] += 1
-                        assigned = True
-                if not assigned:
+                shift_idx = A[n_idx, day]
+                if shift_idx == UNASSIGNED:
                     unassigned_slots += 1
+                    continue
+                shift = self.config.shift_types[shift_idx]
+                shift_counts[shift] += 1
+                nurse_shift_counts[nurse.name][shift] += 1
                     
         # Calculate weekend distribution
         weekend_shifts = {nurse.name: 0 for nurse in self.nurses}
         for day in range(self.num_days):
             if self._is_weekend(day):
                 for n_idx, nurse in enumerate(self.nurses):
-                    if np.any(self.roster[n_idx, day, :-1]):  # Exclude OFF shifts
+                    if 0 <= A[n_idx, day] < self.config.num_shifts - 1:  # Exclude OFF shifts
                         weekend_shifts[nurse.name] += 1
                         
         # Calculate consecutive work days violations
@@ -446,13 +448,15 @@ class RosterSystem:
     def _analyze_workload_distribution(self) -> Dict:
         """Analyze the distribution of workload among nurses."""
         workloads = {}
+        A = self.assignment
         for n_idx, nurse in enumerate(self.nurses):
+            row = A[n_idx]
             shifts = {
-                'total': np.sum(self.roster[n_idx, :, :-1]),  # Exclude OFF
-                'day': np.sum(self.roster[n_idx, :, self.config.shift_types.index('D')]),
-                'evening': np.sum(self.roster[n_idx, :, self.config.shift_types.index('E')]),
-                'night': np.sum(self.roster[n_idx, :, self.config.shift_types.index('N')]),
-                'off': np.sum(self.roster[n_idx, :, self.config.shift_types.index('O')])
+                'total': np.sum((row >= 0) & (row < self.config.num_shifts - 1)),  # Exclude OFF
+                'day': np.sum(row == self.config.shift_types.index('D')),
+                'evening': np.sum(row == self.config.shift_types.index('E')),
+                'night': np.sum(row == self.config.shift_types.index('N')),
+                'off': np.sum(row == self.config.shift_types.index('O'))
             }
             workloads[nurse.name] = shifts
             
@@ -682,7 +686,9 @@ class RosterSystem:
         for n_idx in range(len(self.nurses)):
             for day in range(self.num_days):
                 try:
-                    assigned_shift = np.where(self.roster[n_idx, day] == 1)[0][0]
+                    assigned_shift = self.assignment[n_idx, day]
+                    if assigned_shift == UNASSIGNED:
+                        raise IndexError(assigned_shift)
                     for s_idx in range(len(self.config.shift_types)):
                         if s_idx == assigned_shift:
                             model.AddHint(x[n_idx, day, s_idx], 1)
@@ -993,14 +999,15 @@ class RosterSystem:
         
         if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
             # Extract the solution
+            assignment = self.assignment
             for n_idx in range(len(self.nurses)):
                 for day in range(self.num_days):
                     # Clear current assignments
-                    self.roster[n_idx, day] = 0
+                    assignment[n_idx, day] = UNASSIGNED
                     # Set new assignment
                     for s_idx in range(len(self.config.shift_types)):
                         if solver.Value(x[n_idx, day, s_idx]) == 1:
-                            self.roster[n_idx, day, s_idx] = 1
+                            assignment[n_idx, day] = s_idx
                             break
             
             print(f"Optimization completed in {time.time() - start_time:.2f} seconds")
@@ -1024,7 +1031,7 @@ class RosterSystem:
                 for shift in self.config.daily_shift_requirements.keys():
                     s_idx = self.config.shift_types.index(shift)
                     required = self.config.daily_shift_requirements[shift]
-                    assigned = sum(self.roster[n_idx, day, s_idx] for n_idx in range(len(self.nurses)))
+                    assigned = int(np.sum(self.assignment[:, day] == s_idx))
                     
                     if assigned != required:
                         print(f"날짜 {day+1}, {shift} 근무: {assigned}명 배정됨 (요구: {required}명)")
@@ -1043,7 +1050,7 @@ class RosterSystem:
                     if self.preference_matrix[n_idx, day, off_idx] >= 4:
                         nurse_prefs += 1
                         # 실제로 OFF를 받았는지 확인
-                        if self.roster[n_idx, day, off_idx] == 1:
+                        if self.assignment[n_idx, day] == off_idx:
                             nurse_satisfied += 1
                 
                 if nurse_prefs > 0:
@@ -1068,7 +1075,7 @@ class RosterSystem:
         print("\nStarting optimization with Large Neighborhood Search...")
         start_time = time.time()
         
-        best_roster = self.roster.copy()
+        best_roster = self.assignment.copy()
         best_violations = len(self._find_violations())
         best_off_satisfaction = self._calculate_off_preference_satisfaction()
         print(f"초기 선호 휴무일 만족도: {best_off_satisfaction:.2f}%")
@@ -1092,7 +1099,7 @@ class RosterSystem:
             print(f"\nLNS Iteration {iteration+1}/{max_iterations}")
             
             # Keep a copy of the current roster
-            current_roster = self.roster.copy()
+            current_roster = self.assignment.copy()
             
             # 이전 최적화에서 선호 휴무일 만족도를 계산
             current_off_satisfaction = self._calculate_off_preference_satisfaction()
@@ -1133,7 +1140,7 @@ class RosterSystem:
                 unsatisfied_days = []
                 for n_idx, days in preferred_off_days.items():
                     for day in days:
-                        if self.roster[n_idx, day, off_idx] == 0:  # OFF가 할당되지 않은 날
+                        if self.assignment[n_idx, day] != off_idx:  # OFF가 할당되지 않은 날
                             unsatisfied_days.append((n_idx, day))
                 
                 # 가장 많이 불만족된 날짜 선택
@@ -1180,12 +1187,12 @@ class RosterSystem:
             for n_idx in range(len(self.nurses)):
                 if n_idx not in nurses_to_optimize:
                     for day in range(self.num_days):
-                        shift_idx = np.where(self.roster[n_idx, day] == 1)[0][0]
+                        shift_idx = int(self.assignment[n_idx, day])
                         fixed_assignments.append((n_idx, day, shift_idx))
                 else:
                     for day in range(self.num_days):
                         if day not in days_to_optimize:
-                            shift_idx = np.where(self.roster[n_idx, day] == 1)[0][0]
+                            shift_idx = int(self.assignment[n_idx, day])
                             fixed_assignments.append((n_idx, day, shift_idx))
             
             # Run CP-SAT on this neighborhood
@@ -1203,19 +1210,19 @@ class RosterSystem:
                 if (new_violations < best_violations) or (new_violations == best_violations and new_off_satisfaction > best_off_satisfaction):
                     best_violations = new_violations
                     best_off_satisfaction = new_off_satisfaction
-                    best_roster = self.roster.copy()
+                    best_roster = self.assignment.copy()
                     print("개선된 해결책 발견!")
                 else:
                     # Rollback if no improvement
-                    self.roster = current_roster
+                    self.assignment = current_roster
                     print("개선 없음, 변경 취소")
             else:
                 # Rollback if optimization failed
-                self.roster = current_roster
+                self.assignment = current_roster
                 print("최적화 실패, 변경 취소")
         
         # Always use the best roster found
-        self.roster = best_roster
+        self.assignment = best_roster
         
         print(f"LNS 완료: {time.time() - start_time:.2f}초 소요")
         print(f"최종 제약위반: {best_violations}")
@@ -1235,7 +1242,7 @@ class RosterSystem:
                 if self.preference_matrix[n_idx, day, off_idx] >= 4:
                     total_preferences += 1
                     # 실제로 OFF를 받았는지 확인
-                    if self.roster[n_idx, day, off_idx] == 1:
+                    if self.assignment[n_idx, day] == off_idx:
                         satisfied_preferences += 1
         
         if total_preferences == 0:
@@ -1260,7 +1267,7 @@ class RosterSystem:
                     if self.preference_matrix[n_idx, day, s_idx] >= weight:
                         total_preferences += 1
                         # 실제로 해당 근무 유형이 배정된 경우
-                        if self.roster[n_idx, day, s_idx] == 1:
+                        if self.assignment[n_idx, day] == s_idx:
                             satisfied_preferences += 1
         
         if total_preferences == 0:
@@ -1272,394 +1279,21 @@ class RosterSystem:
         """간호사 페어링 선호도 만족도를 계산합니다."""
         if not hasattr(self, 'pair_matrix'):
             return {"together": 100.0, "apart": 100.0, "overall": 100.0}
-        
-        # 요청자 기준 계산이 가능하면 해당 방식 사용 (방향성, '-'는 모수 제외)
-        if hasattr(self, 'pair_requests') and isinstance(self.pair_requests, dict):
-            together_reqs = self.pair_requests.get("together", set())
-            apart_reqs = self.pair_requests.get("apart", set())
-            
-            total_together_prefs = 0
-            satisfied_together_prefs = 0
-            total_apart_prefs = 0
-            satisfied_apart_prefs = 0
-            
-            # together 요청자 기준 집계
-            for n1, n2 in together_reqs:
-                for day in range(self.num_days):
-                    total_together_prefs += 1
-                    if self._are_nurses_working_together(n1, n2, day):
-                        satisfied_together_prefs += 1
-            
-            # apart 요청자 기준 집계
-            for n1, n2 in apart_reqs:
-                for day in range(self.num_days):
-                    total_apart_prefs += 1
-                    if not self._are_nurses_working_together(n1, n2, day):
-                        satisfied_apart_prefs += 1
-            
-            together_satisfaction = 100.0 if total_together_prefs == 0 else (satisfied_together_prefs / total_together_prefs) * 100.0
-            apart_satisfaction = 100.0 if total_apart_prefs == 0 else (satisfied_apart_prefs / total_apart_prefs) * 100.0
-            
-            total_prefs = total_together_prefs + total_apart_prefs
-            satisfied_prefs = satisfied_together_prefs + satisfied_apart_prefs
-            overall_satisfaction = 100.0 if total_prefs == 0 else (satisfied_prefs / total_prefs) * 100.0
-            
-            return {
-                "together": together_satisfaction,
-                "apart": apart_satisfaction,
-                "overall": overall_satisfaction
-            }
-        
-        # 후방 호환: 기존 대칭 행렬 방식
-        # 함께 일하기 선호도 만족도
-        total_together_prefs = 0
-        satisfied_together_prefs = 0
-        
-        # 따로 일하기 선호도 만족도
-        total_apart_prefs = 0
-        satisfied_apart_prefs = 0
-        
-        # 각 날짜에 대해
-        for day in range(self.num_days):
-            # 각 근무 유형에 대해
-            for shift in self.config.daily_shift_requirements.keys():
-                shift_idx = self.config.shift_types.index(shift)
-                
-                # 이 근무 유형에 배정된 간호사 찾기
-                assigned_nurses = [i for i in range(len(self.nurses)) 
-                                 if self.roster[i, day, shift_idx] == 1]
-                
-                # 함께 일하는 선호도 계산
-                for i in range(len(assigned_nurses)):
-                    for j in range(i+1, len(assigned_nurses)):
-                        n1 = assigned_nurses[i]
-                        n2 = assigned_nurses[j]
-                        
-                        # 함께 일하기 원하는 쌍인 경우
-                        if self.pair_matrix["together"][n1, n2] > 0:
-                            total_together_prefs += 1
-                            satisfied_together_prefs += 1
-                
-                # 다른 교대에 배정된 간호사들과의 관계 확인
-                for other_shift in self.config.daily_shift_requirements.keys():
-                    if shift == other_shift:
-                        continue
-                    other_shift_idx = self.config.shift_types.index(other_shift)
-                    other_assigned = [i for i in range(len(self.nurses)) 
-                                     if self.roster[i, day, other_shift_idx] == 1]
-                    
-                    # 두 교대 간의 간호사 쌍 확인
-                    for n1 in assigned_nurses:
-                        for n2 in other_assigned:
-                            # 따로 일하기 원하는 쌍인 경우
-                            if self.pair_matrix["apart"][n1, n2] > 0:
-                                total_apart_prefs += 1
-                                satisfied_apart_prefs += 1
-        
-        # 불만족 케이스 확인
-        for n1 in range(len(self.nurses)):
-            for n2 in range(n1+1, len(self.nurses)):
-                # 함께 일하기 원하는 쌍인 경우
-                if self.pair_matrix["together"][n1, n2] > 0:
-                    # 각 날짜에 대해 함께 근무했는지 확인
-                    for day in range(self.num_days):
-                        together_today = False
-                        # 각 근무 유형에 대해
-                        for shift in self.config.daily_shift_requirements.keys():
-                            shift_idx = self.config.shift_types.index(shift)
-                            # 둘 다 같은 교대에 배정된 경우
-                            if (self.roster[n1, day, shift_idx] == 1 and 
-                                self.roster[n2, day, shift_idx] == 1):
-                                together_today = True
-                                break
-                        # 이날 함께 근무하지 않았으면 총 선호도 카운트만 추가
-                        if not together_today:
-                            total_together_prefs += 1
-                
-                # 따로 일하기 원하는 쌍인 경우
-                if self.pair_matrix["apart"][n1, n2] > 0:
-                    # 각 날짜에 대해 같은 근무에 배정되었는지 확인
-                    for day in range(self.num_days):
-                        for shift in self.config.daily_shift_requirements.keys():
-                            shift_idx = self.config.shift_types.index(shift)
-                            # 둘 다 같은 교대에 배정된 경우 (선호도 불만족)
-                            if (self.roster[n1, day, shift_idx] == 1 and 
-                                self.roster[n2, day, shift_idx] == 1):
-                                total_apart_prefs += 1
-        
-        # 종합 만족도 계산
-        together_satisfaction = 100.0 if total_together_prefs == 0 else (satisfied_together_prefs / total_together_prefs) * 100.0
-        apart_satisfaction = 100.0 if total_apart_prefs == 0 else (satisfied_apart_prefs / total_apart_prefs) * 100.0
-        
-        # 종합 선호도 점수
-        total_prefs = total_together_prefs + total_apart_prefs
-        satisfied_prefs = satisfied_together_prefs + satisfied_apart_prefs
-        overall_satisfaction = 100.0 if total_prefs == 0 else (satisfied_prefs / total_prefs) * 100.0
-        
-        return {
-            "together": together_satisfaction,
-            "apart": apart_satisfaction,
-            "overall": overall_satisfaction
-        }
+        # 요청자(방향성) 기준 또는 후방 호환 대칭 행렬 방식 → roster_metrics 에서 배열 연산으로 집계
+        return roster_metrics.pair_preference_satisfaction(self)
 
     def calculate_individual_satisfaction(self) -> Dict[str, Dict]:
         """개개인의 만족도를 계산합니다."""
-        individual_satisfaction = {}
-        
-        for n_idx, nurse in enumerate(self.nurses):
-            nurse_id = nurse.db_id
-            satisfaction = {
-                "nurse_id": nurse_id,
-                "name": nurse.name,
-                "off_satisfaction": 0.0,
-                "shift_satisfaction": 0.0,
-                "pair_satisfaction": 0.0,
-                "total_requests": 0,
-                "satisfied_requests": 0,
-                "overall_satisfaction": 0.0
-            }
-            
-            # 휴무 선호도 만족도 계산
-            off_idx = self.config.shift_types.index('O')
-            total_off_requests = 0
-            satisfied_off_requests = 0
-            
-            for day in range(self.num_days):
-                if self.preference_matrix[n_idx, day, off_idx] >= 4:
-                    total_off_requests += 1
-                    if self.roster[n_idx, day, off_idx] == 1:
-                        satisfied_off_requests += 1
-            
-            satisfaction["off_satisfaction"] = (satisfied_off_requests / total_off_requests * 100) if total_off_requests > 0 else 100.0
-            satisfaction["off_request_count"] = total_off_requests
-            
-            # 근무 유형 선호도 만족도 계산
-            total_shift_requests = 0
-            satisfied_shift_requests = 0
-            
-            for day in range(self.num_days):
-                for shift_idx, shift_type in enumerate(self.config.shift_types):
-                    if shift_type != 'O' and self.preference_matrix[n_idx, day, shift_idx] >= 4:
-                        total_shift_requests += 1
-                        if self.roster[n_idx, day, shift_idx] == 1:
-                            satisfied_shift_requests += 1
-            
-            satisfaction["shift_satisfaction"] = (satisfied_shift_requests / total_shift_requests * 100) if total_shift_requests > 0 else 100.0
-            satisfaction["shift_request_count"] = total_shift_requests
-            
-            # 페어링 선호도 만족도 계산
-            total_pair_requests = 0
-            satisfied_pair_requests = 0
-            
-            if hasattr(self, 'pair_matrix') and self.pair_matrix is not None:
-                # 요청자(방향성) 기준 계산만 사용: 사용자 입력 요청만 카운트
-                has_directional = hasattr(self, 'pair_requests') and isinstance(self.pair_requests, dict)
-                if has_directional:
-                    together_reqs = self.pair_requests.get("together", set())
-                    apart_reqs = self.pair_requests.get("apart", set())
-                    for other_n_idx in range(len(self.nurses)):
-                        if other_n_idx == n_idx:
-                            continue
-                        req_together = (n_idx, other_n_idx) in together_reqs
-                        req_apart = (n_idx, other_n_idx) in apart_reqs
-                        if not (req_together or req_apart):
-                            continue
-                        for day in range(self.num_days):
-                            total_pair_requests += 1
-                            if req_together:
-                                if self._are_nurses_working_together(n_idx, other_n_idx, day):
-                                    satisfied_pair_requests += 1
-                            elif req_apart:
-                                if not self._are_nurses_working_together(n_idx, other_n_idx, day):
-                                    satisfied_pair_requests += 1
-                else:
-                    # 방향성 정보가 전혀 없는 경우에만 후방 호환(행렬 기반) 사용
-                    together_mat = self.pair_matrix.get("together") if isinstance(self.pair_matrix, dict) else None
-                    apart_mat = self.pair_matrix.get("apart") if isinstance(self.pair_matrix, dict) else None
-                    def _has_pref(mat, i, j):
-                        if mat is None:
-                            return False
-                        if isinstance(mat, np.ndarray):
-                            try:
-                                return mat[i, j] > 0
-                            except Exception:
-                                return False
-                        if isinstance(mat, dict):
-                            return mat.get((i, j), 0) > 0
-                        return False
-                    for other_n_idx in range(len(self.nurses)):
-                        if other_n_idx != n_idx:
-                            for day in range(self.num_days):
-                                has_together = _has_pref(together_mat, n_idx, other_n_idx)
-                                has_apart = _has_pref(apart_mat, n_idx, other_n_idx)
-                                if has_together or has_apart:
-                                    total_pair_requests += 1
-                                    if has_together:
-                                        if self._are_nurses_working_together(n_idx, other_n_idx, day):
-                                            satisfied_pair_requests += 1
-                                    elif has_apart:
-                                        if not self._are_nurses_working_together(n_idx, other_n_idx, day):
-                                            satisfied_pair_requests += 1
-            satisfaction["pair_satisfaction"] = (satisfied_pair_requests / total_pair_requests * 100) if total_pair_requests > 0 else 100.0
-            satisfaction["pair_request_count"] = total_pair_requests
-            
-            # 전체 요청 수와 만족한 요청 수 계산
-            satisfaction["total_requests"] = total_off_requests + total_shift_requests + total_pair_requests
-            satisfaction["satisfied_requests"] = satisfied_off_requests + satisfied_shift_requests + satisfied_pair_requests
-            
-            # 전체 만족도 계산
-            if satisfaction["total_requests"] > 0:
-                satisfaction["overall_satisfaction"] = (satisfaction["satisfied_requests"] / satisfaction["total_requests"]) * 100
-            else:
-                satisfaction["overall_satisfaction"] = 100.0
-            
-            individual_satisfaction[nurse_id] = satisfaction
-        
-        return individual_satisfaction
+        return roster_metrics.individual_satisfaction(self)
 
     def calculate_detailed_request_analysis(self) -> Dict:
         """요청별 상세 분석을 계산합니다."""
-        analysis = {
-            "total_requests": {
-                "off": 0,
-                "shift": 0,
-                "pair": 0
-            },
-            "satisfied_requests": {
-                "off": 0,
-                "shift": 0,
-                "pair": 0
-            },
-            "satisfaction_rate": {
-                "off": 0.0,
-                "shift": 0.0,
-                "pair": 0.0,
-                "overall": 0.0
-            },
-            "request_details": []
-        }
-        
-        # 휴무 요청 분석
-        off_idx = self.config.shift_types.index('O')
-        for n_idx in range(len(self.nurses)):
-            for day in range(self.num_days):
-                if self.preference_matrix[n_idx, day, off_idx] >= 4:
-                    analysis["total_requests"]["off"] += 1
-                    if self.roster[n_idx, day, off_idx] == 1:
-                        analysis["satisfied_requests"]["off"] += 1
-                        analysis["request_details"].append({
-                            "nurse_id": self.nurses[n_idx].db_id,
-                            "nurse_name": self.nurses[n_idx].name,
-                            "day": day + 1,
-                            "request_type": "off",
-                            "satisfied": True,
-                            "preference_score": self.preference_matrix[n_idx, day, off_idx]
-                        })
-                    else:
-                        analysis["request_details"].append({
-                            "nurse_id": self.nurses[n_idx].db_id,
-                            "nurse_name": self.nurses[n_idx].name,
-                            "day": day + 1,
-                            "request_type": "off",
-                            "satisfied": False,
-                            "preference_score": self.preference_matrix[n_idx, day, off_idx]
-                        })
-        
-        # 근무 유형 요청 분석
-        for n_idx in range(len(self.nurses)):
-            for day in range(self.num_days):
-                for shift_idx, shift_type in enumerate(self.config.shift_types):
-                    if shift_type != 'O' and self.preference_matrix[n_idx, day, shift_idx] >= 4:
-                        analysis["total_requests"]["shift"] += 1
-                        if self.roster[n_idx, day, shift_idx] == 1:
-                            analysis["satisfied_requests"]["shift"] += 1
-                            analysis["request_details"].append({
-                                "nurse_id": self.nurses[n_idx].db_id,
-                                "nurse_name": self.nurses[n_idx].name,
-                                "day": day + 1,
-                                "request_type": "shift",
-                                "shift_type": shift_type,
-                                "satisfied": True,
-                                "preference_score": self.preference_matrix[n_idx, day, shift_idx]
-                            })
-                        else:
-                            analysis["request_details"].append({
-                                "nurse_id": self.nurses[n_idx].db_id,
-                                "nurse_name": self.nurses[n_idx].name,
-                                "day": day + 1,
-                                "request_type": "shift",
-                                "shift_type": shift_type,
-                                "satisfied": False,
-                                "preference_score": self.preference_matrix[n_idx, day, shift_idx]
-                            })
-        
-        # 페어링 요청 분석
-        if hasattr(self, 'pair_matrix') and self.pair_matrix is not None:
-            together_mat = self.pair_matrix.get("together") if isinstance(self.pair_matrix, dict) else None
-            apart_mat = self.pair_matrix.get("apart") if isinstance(self.pair_matrix, dict) else None
-            
-            def _get_weight(mat, i, j):
-                if mat is None:
-                    return 0
-                if isinstance(mat, np.ndarray):
-                    try:
-                        return mat[i, j]
-                    except Exception:
-                        return 0
-                if isinstance(mat, dict):
-                    return mat.get((i, j), 0)
-                return 0
-            
-            for n1 in range(len(self.nurses)):
-                for n2 in range(n1 + 1, len(self.nurses)):
-                    for day in range(self.num_days):
-                        together_pref = _get_weight(together_mat, n1, n2)
-                        apart_pref = _get_weight(apart_mat, n1, n2)
-                        
-                        if together_pref > 0 or apart_pref > 0:
-                            analysis["total_requests"]["pair"] += 1
-                            request_type = "work_together" if together_pref > 0 else "work_apart"
-                            satisfied = False
-                            
-                            if together_pref > 0:
-                                satisfied = self._are_nurses_working_together(n1, n2, day)
-                            else:
-                                satisfied = not self._are_nurses_working_together(n1, n2, day)
-                            
-                            if satisfied:
-                                analysis["satisfied_requests"]["pair"] += 1
-                            
-                            analysis["request_details"].append({
-                                "nurse_1_id": self.nurses[n1].db_id,
-                                "nurse_1_name": self.nurses[n1].name,
-                                "nurse_2_id": self.nurses[n2].db_id if n2 < len(self.nurses) else None,
-                                "nurse_2_name": self.nurses[n2].name if n2 < len(self.nurses) else None,
-                                "day": day + 1,
-                                "request_type": "pair",
-                                "pair_type": request_type,
-                                "satisfied": satisfied,
-                                "preference_score": max(together_pref, apart_pref)
-                            })
-        
-        # 만족도 계산
-        for request_type in ["off", "shift", "pair"]:
-            total = analysis["total_requests"][request_type]
-            satisfied = analysis["satisfied_requests"][request_type]
-            analysis["satisfaction_rate"][request_type] = (satisfied / total * 100) if total > 0 else 100.0
-        
-        total_requests = sum(analysis["total_requests"].values())
-        total_satisfied = sum(analysis["satisfied_requests"].values())
-        analysis["satisfaction_rate"]["overall"] = (total_satisfied / total_requests * 100) if total_requests > 0 else 100.0
-        
-        return analysis
+        return roster_metrics.detailed_request_analysis(self)
 
     def _are_nurses_working_together(self, n1: int, n2: int, day: int) -> bool:
         """두 간호사가 같은 날 같은 근무에 배정되었는지 확인합니다."""
-        for shift_idx in range(len(self.config.shift_types)):
-            if (self.roster[n1, day, shift_idx] == 1 and 
-                self.roster[n2, day, shift_idx] == 1):
-                return True
-        return False
+        A = self.assignment
+        return bool(A[n1, day] == A[n2, day] and A[n1, day] != UNASSIGNED)
         
     def _optimize_neighborhood(self, fixed_assignments, time_limit_seconds):
         """Optimize a neighborhood of the roster with some assignments fixed."""
@@ -1690,7 +1324,9 @@ class RosterSystem:
                     # Skip if this is a fixed assignment
                     is_fixed = any((n_idx, day, _) in fixed_assignments for _ in range(len(self.config.shift_types)))
                     if not is_fixed:
-                        assigned_shift = np.where(self.roster[n_idx, day] == 1)[0][0]
+                        assigned_shift = self.assignment[n_idx, day]
+                        if assigned_shift == UNASSIGNED:
+                            raise IndexError(assigned_shift)
                         for s_idx in range(len(self.config.shift_types)):
                             if s_idx == assigned_shift:
                                 model.AddHint(x[n_idx, day, s_idx], 1)
@@ -1858,14 +1494,15 @@ class RosterSystem:
         
         if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
             # Extract the solution
+            assignment = self.assignment
             for n_idx in range(len(self.nurses)):
                 for day in range(self.num_days):
                     # Clear current assignments
-                    self.roster[n_idx, day] = 0
+                    assignment[n_idx, day] = UNASSIGNED
                     # Set new assignment
                     for s_idx in range(len(self.config.shift_types)):
                         if solver.Value(x[n_idx, day, s_idx]) == 1:
-                            self.roster[n_idx, day, s_idx] = 1
+                            assignment[n_idx, day] = s_idx
                             break
             
             # 제약 위반 통계
@@ -1900,10 +1537,11 @@ class RosterSystem:
             'O': 'off'
         }
         
+        A = self.assignment
         for n_idx in range(len(self.nurses)):
             for shift in self.config.shift_types:
                 shift_idx = self.config.shift_types.index(shift)
-                assignments = self.roster[n_idx, :, shift_idx]
+                assignments = A[n_idx] == shift_idx
                 
                 # Count consecutive assignments
                 count = 0
@@ -1936,10 +1574,12 @@ class RosterSystem:
         }
         
         try:
+            A = self.assignment
+            working = (A >= 0) & (A < self.config.num_shifts - 1)  # Exclude OFF shifts
             for n_idx, nurse in enumerate(self.nurses):
                 weekend_count = 0
                 for day in range(self.num_days):
-                    if self._is_weekend(day) and np.any(self.roster[n_idx, day, :-1]):
+                    if self._is_weekend(day) and working[n_idx, day]:
                         weekend_count += 1
                 weekend_stats['per_nurse'][nurse.name] = weekend_count
                 
@@ -1949,7 +1589,7 @@ class RosterSystem:
                     weekend_stats['overall']['total_weekends'] += 1
                     nurses_working = sum(
                         1 for n_idx in range(len(self.nurses))
-                        if np.any(self.roster[n_idx, day, :-1])
+                        if working[n_idx, day]
                     )
                     weekend_stats['overall']['nurses_per_weekend'].append(nurses_working)
         except Exception as e:
@@ -1970,35 +1610,31 @@ class RosterSystem:
             for s2 in self.config.shift_types
         }
         
+        A = self.assignment
         for n_idx in range(len(self.nurses)):
             for day in range(self.num_days - 1):
-                try:
-                    # Find which shift is assigned for current day
-                    current_shifts = np.where(self.roster[n_idx, day] == 1)[0]
-                    next_shifts = np.where(self.roster[n_idx, day + 1] == 1)[0]
-                    
-                    if len(current_shifts) > 0 and len(next_shifts) > 0:
-                        current = current_shifts[0]
-                        next_day = next_shifts[0]
-                        
-                        transition = f"{self.config.shift_types[current]}->{self.config.shift_types[next_day]}"
-                        transitions[transition] += 1
-                except IndexError:
-                    # Skip if there's any missing assignment
+                current, next_day = A[n_idx, day], A[n_idx, day + 1]
+                # Skip if there's any missing assignment
+                if current == UNASSIGNED or next_day == UNASSIGNED:
                     continue
+                transition = f"{self.config.shift_types[current]}->{self.config.shift_types[next_day]}"
+                transitions[transition] += 1
                     
         return transitions
         
     def _estimate_nurse_satisfaction(self) -> Dict:
         """Estimate nurse satisfaction based on preferences and assignments."""
         satisfaction = {}
+        A = self.assignment
         
         for n_idx, nurse in enumerate(self.nurses):
             matches = 0
             total = 0
             
             for day in range(self.num_days):
-                assigned_shift = np.where(self.roster[n_idx, day] == 1)[0][0]
+                assigned_shift = A[n_idx, day]
+                if assigned_shift == UNASSIGNED:
+                    continue
                 pref_score = self.preference_matrix[n_idx, day, assigned_shift]
                 matches += pref_score
                 total += 1
@@ -2019,13 +1655,14 @@ class RosterSystem:
             'daily': {},
             'overall': {}
         }
+        A = self.assignment
         
         for day in range(self.num_days):
             coverage['daily'][day] = {}
             for shift in self.config.shift_types[:-1]:  # Exclude OFF
                 shift_idx = self.config.shift_types.index(shift)
                 required = self.config.daily_shift_requirements[shift]
-                actual = np.sum(self.roster[:, day, shift_idx])
+                actual = np.sum(A[:, day] == shift_idx)
                 coverage['daily'][day][shift] = {
                     'required': required,
                     'actual': actual,
@@ -2036,7 +1673,7 @@ class RosterSystem:
         for shift in self.config.shift_types[:-1]:
             shift_idx = self.config.shift_types.index(shift)
             required_total = self.config.daily_shift_requirements[shift] * self.num_days
-            actual_total = np.sum(self.roster[:, :, shift_idx])
+            actual_total = np.sum(A == shift_idx)
             coverage['overall'][shift] = {
                 'required_total': required_total,
                 'actual_total': actual_total,
@@ -2056,10 +1693,7 @@ class RosterSystem:
         # Analyze shift type distribution
         for shift in self.config.shift_types[:-1]:
             shift_idx = self.config.shift_types.index(shift)
-            assignments = [
-                np.sum(self.roster[n_idx, :, shift_idx])
-                for n_idx in range(len(self.nurses))
-            ]
+            assignments = list(np.sum(self.assignment == shift_idx, axis=1).astype(float))
             fairness['shift_distribution'][shift] = {
                 'gini_coefficient': self._calculate_gini(assignments),
                 'coefficient_of_variation': np.std(assignments) / np.mean(assignments) if np.mean(assignments) > 0 else 0
@@ -2115,8 +1749,7 @@ class RosterSystem:
                 continue
                 
             # 고정된 셀 적용
-            self.roster[nurse_idx, day_idx, :] = 0  # 모든 근무 타입 초기화
-            self.roster[nurse_idx, day_idx, shift_idx] = 1  # 지정된 근무 타입 설정
+            self.assignment[nurse_idx, day_idx] = shift_idx  # 지정된 근무 타입으로 덮어쓰기
             
             print(f"고정 셀 적용: 간호사 {nurse_idx}, 날짜 {day_idx+1}, 근무 {shift}")
             
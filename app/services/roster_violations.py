@@ -0,0 +1,247 @@
+"""
+근무표 하드 위반 벡터화 평가 모듈
+- RosterSystem 의 [N, D] 교대 인덱스 배정 행렬(또는 기존 [N, D, S] one-hot 텐서)을 NumPy 연산으로 한 번에 평가
+- 커버리지 부족 / 연속 야간 / N→D / 월 야간 상한 / 연속 근무 위반을 계산
+- 결과는 유형별 카운트와 셀 단위 비트마스크로 반환 (기존 dict 리스트 포맷 변환 지원)
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from services.roster_assignment import shift_mask
+
+# 셀 단위 위반 비트 플래그 (cell_mask[n, d])
+V_NIGHT_CONSECUTIVE = 1 << 0   # 연속 야간 상한 초과 (연속 구간의 마지막 날)
+V_NIGHT_ND = 1 << 1            # 전날 N → 당일 D
+V_NIGHT_MONTH_LIMIT = 1 << 2   # 월 누적 야간 상한 초과 (초과 시점 이후 매일)
+V_CONSECUTIVE_WORK = 1 << 3    # 연속 근무일 상한 초과 (연속 구간의 마지막 날)
+
+# 비트 → 기존 _find_violations 의 type 문자열
+CELL_VIOLATION_TYPES = {
+    V_NIGHT_CONSECUTIVE: 'night_consecutive',
+    V_NIGHT_ND: 'night_nd',
+    V_NIGHT_MONTH_LIMIT: 'night_month_limit',
+    V_CONSECUTIVE_WORK: 'consecutive_work',
+}
+
+
+@dataclass
+class ViolationReport:
+    """하드 위반 평가 결과."""
+    shift_codes: List[str]              # 커버리지 평가 대상 교대 코드 (coverage_* 의 열 순서)
+    coverage_required: np.ndarray       # [D, len(shift_codes)] 요구 인원
+    coverage_actual: np.ndarray         # [D, len(shift_codes)] 배정 인원
+    cell_mask: np.ndarray               # [N, D] 위반 비트마스크 (V_* 플래그 OR)
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def coverage_shortage(self) -> np.ndarray:
+        """[D, len(shift_codes)] 부족 인원 (0 이상)"""
+        return np.maximum(self.coverage_required - self.coverage_actual, 0)
+
+    @property
+    def total(self) -> int:
+        """하드 위반 총 건수 (커버리지 부족 일·교대 수 + 셀 위반 수)"""
+        return int(sum(self.counts.values()))
+
+    def to_list(self) -> List[dict]:
+        """기존 RosterSystem._find_violations() 와 같은 dict 리스트로 변환한다."""
+        violations = []
+        short_d, short_s = np.nonzero(self.coverage_actual < self.coverage_required)
+        for d, k in zip(short_d.tolist(), short_s.tolist()):
+            violations.append({
+                'type': 'shift_requirement',
+                'day': d,
+                'shift': self.shift_codes[k],
+                'required': int(self.coverage_required[d, k]),
+                'actual': int(self.coverage_actual[d, k]),
+            })
+        for bit, v_type in CELL_VIOLATION_TYPES.items():
+            for n, d in zip(*np.nonzero(self.cell_mask & bit)):
+                violations.append({'type': v_type, 'nurse_idx': int(n), 'day': int(d)})
+        return violations
+
+
+def _assigned_cells(roster: np.ndarray, num_shifts: int) -> np.ndarray:
+    """[.., D] 배정 행렬 또는 [.., D, S] one-hot → [.., D, S] bool 배정 여부"""
+    return roster == 1 if roster.ndim == 3 else shift_mask(roster, range(num_shifts))
+
+
+def _run_length(flags: np.ndarray) -> np.ndarray:
+    """[N, D] bool 배열에서 각 셀로 끝나는 연속 True 길이를 반환한다."""
+    D = flags.shape[1]
+    idx = np.arange(D)
+    last_false = np.maximum.accumulate(np.where(flags, -1, idx), axis=1)
+    return np.where(flags, idx - last_false, 0)
+
+
+def _required_matrix(config, shift_codes: List[str], num_days: int) -> np.ndarray:
+    """[D, len(shift_codes)] 요구 인원 행렬. 일자별 요구치가 있으면 우선 사용."""
+    by_day = getattr(config, 'daily_shift_requirements_by_day', None)
+    base = config.daily_shift_requirements
+    req = np.empty((num_days, len(shift_codes)), dtype=np.int64)
+    for d in range(num_days):
+        need_map = by_day[d] if isinstance(by_day, list) and d < len(by_day) else base
+        for k, code in enumerate(shift_codes):
+            req[d, k] = int(need_map.get(code, base.get(code, 0)) or 0)
+    return req
+
+
+def _pattern_flags(assigned: np.ndarray, shift_types: List[str], config) -> np.ndarray:
+    """[n, w, S] bool 블록의 연속 야간 / N→D / 연속 근무 비트를 계산한다 (월 누적 제외)."""
+    n, w, _ = assigned.shape
+    mask = np.zeros((n, w), dtype=np.uint8)
+    off_idx = shift_types.index('O')
+    if 'N' in shift_types:
+        nights = assigned[:, :, shift_types.index('N')]
+        # 연속 야간: max_consecutive_nights 초과 구간
+        mask[_run_length(nights) > config.max_consecutive_nights] |= V_NIGHT_CONSECUTIVE
+        # N→D
+        if 'D' in shift_types:
+            nd = np.zeros((n, w), dtype=bool)
+            nd[:, 1:] = nights[:, :-1] & assigned[:, 1:, shift_types.index('D')]
+            mask[nd] |= V_NIGHT_ND
+    # 연속 근무일: OFF 앞쪽 교대(D/E/N) 중 하나라도 배정된 날을 근무일로 본다
+    working = assigned[:, :, :off_idx].any(axis=2)
+    mask[_run_length(working) > config.max_consecutive_work_days] |= V_CONSECUTIVE_WORK
+    return mask
+
+
+def _month_night_flags(assigned: np.ndarray, shift_types: List[str], config) -> np.ndarray:
+    """[n, D, S] bool 전체 행의 월 누적 야간 상한 초과 비트를 계산한다."""
+    mask = np.zeros(assigned.shape[:2], dtype=np.uint8)
+    if 'N' in shift_types:
+        nights = assigned[:, :, shift_types.index('N')]
+        mask[np.cumsum(nights, axis=1) > config.max_night_shifts_per_month] = V_NIGHT_MONTH_LIMIT
+    return mask
+
+
+def evaluate_hard_violations(
+    roster: np.ndarray,
+    config,
+    required: Optional[np.ndarray] = None,
+) -> ViolationReport:
+    """[N, D] 배정 행렬(또는 [N, D, S] one-hot) roster 의 하드 위반을 한 번에 계산한다.
+
+    Args:
+        roster: [간호사 × 일수] 교대 인덱스 행렬 (RosterSystem.assignment) 또는 one-hot 텐서 (RosterSystem.roster)
+        config: NurseRosterConfig
+        required: 미리 계산한 [D, len(daily_shift_requirements)] 요구 인원 (없으면 config 에서 생성)
+
+    Returns:
+        ViolationReport
+    """
+    shift_types = config.shift_types
+    shift_codes = list(config.daily_shift_requirements.keys())
+    D = roster.shape[1]
+    assigned = _assigned_cells(roster, len(shift_types))
+
+    # 일·교대 커버리지
+    code_idx = [shift_types.index(c) for c in shift_codes]
+    actual = assigned[:, :, code_idx].sum(axis=0)
+    if required is None:
+        required = _required_matrix(config, shift_codes, D)
+
+    # 간호사별 패턴 위반
+    cell_mask = _pattern_flags(assigned, shift_types, config) | _month_night_flags(assigned, shift_types, config)
+
+    counts = {'shift_requirement': int((actual < required).sum())}
+    for bit, v_type in CELL_VIOLATION_TYPES.items():
+        counts[v_type] = int(np.count_nonzero(cell_mask & bit))
+    return ViolationReport(
+        shift_codes=shift_codes,
+        coverage_required=required,
+        coverage_actual=actual,
+        cell_mask=cell_mask,
+        counts=counts,
+    )
+
+
+class IncrementalViolationScorer:
+    """LNS 수락 판정용 증분 위반 평가기.
+
+    시작 시 한 번 전체 평가한 뒤, 바뀐 간호사 × (변경 일자 ± 최대 패턴 길이) 구간만 다시
+    평가해 카운트를 갱신한다. 변경 전 셀/상태는 undo 로그에 쌓아 전체 배열 복사 없이 되돌린다.
+
+    사용 순서: mark(n_set, d_set) → (roster 셀 변경) → rescore() → commit() 또는 undo()
+    """
+
+    def __init__(self, roster: np.ndarray, config):
+        self.config = config
+        self.shift_types = config.shift_types
+        self.report = evaluate_hard_violations(roster, config)
+        self._code_idx = [self.shift_types.index(c) for c in self.report.shift_codes]
+        # 패턴 위반이 전파될 수 있는 최대 거리 (연속근무 K, 연속야간 L)
+        self._pad = max(config.max_consecutive_work_days, config.max_consecutive_nights) + 1
+        self._undo: List[dict] = []
+
+    @property
+    def total(self) -> int:
+        return self.report.total
+
+    def mark(self, roster: np.ndarray, n_set, d_set):
+        """변경 예정 셀 블록을 undo 로그에 기록한다."""
+        rows = np.unique(np.asarray(list(n_set), dtype=np.int64))
+        days = np.unique(np.asarray(list(d_set), dtype=np.int64))
+        self._undo.append({
+            'rows': rows,
+            'days': days,
+            'cells': roster[np.ix_(rows, days)].copy(),
+        })
+
+    def rescore(self, roster: np.ndarray) -> int:
+        """마지막으로 mark 한 블록 기준으로 위반 카운트를 갱신하고 총합을 반환한다."""
+        entry = self._undo[-1]
+        rows, days = entry['rows'], entry['days']
+        rep = self.report
+        if rows.size == 0 or days.size == 0:
+            entry['state'] = None
+            return self.total
+        D = roster.shape[1]
+
+        # (1) 커버리지: 바뀐 셀의 전/후 차이만 반영
+        S = len(self.shift_types)
+        old_assigned = _assigned_cells(entry['cells'], S)
+        new_assigned = _assigned_cells(roster[np.ix_(rows, days)], S)
+        old_actual = rep.coverage_actual[days].copy()
+        delta = (new_assigned[:, :, self._code_idx].sum(axis=0)
+                 - old_assigned[:, :, self._code_idx].sum(axis=0))
+        rep.coverage_actual[days] = old_actual + delta
+        req = rep.coverage_required[days]
+        short_delta = int((rep.coverage_actual[days] < req).sum()) - int((old_actual < req).sum())
+
+        # (2) 간호사 패턴: 바뀐 간호사 × 패딩된 일자 구간만 재평가
+        lo, hi = int(days[0]), int(days[-1])
+        a, b = max(0, lo - self._pad), min(D, hi + self._pad + 1)
+        old_mask = rep.cell_mask[rows].copy()
+        new_mask = old_mask.copy()
+        pat = _pattern_flags(_assigned_cells(roster[rows, a:b], S), self.shift_types, self.config)
+        new_mask[:, lo:b] = (new_mask[:, lo:b] & V_NIGHT_MONTH_LIMIT) | pat[:, lo - a:]
+        # 월 누적 야간은 변경 일 이후 전체에 영향 → 해당 간호사 행만 재계산
+        new_mask = (new_mask & ~np.uint8(V_NIGHT_MONTH_LIMIT)) | _month_night_flags(
+            _assigned_cells(roster[rows], S), self.shift_types, self.config)
+        rep.cell_mask[rows] = new_mask
+
+        entry['state'] = (old_actual, old_mask, dict(rep.counts))
+        rep.counts['shift_requirement'] += short_delta
+        for bit, v_type in CELL_VIOLATION_TYPES.items():
+            rep.counts[v_type] += int(np.count_nonzero(new_mask & bit)) - int(np.count_nonzero(old_mask & bit))
+        return self.total
+
+    def undo(self, roster: np.ndarray) -> int:
+        """마지막 변경을 되돌린다 (roster 셀과 카운트 상태 모두)."""
+        entry = self._undo.pop()
+        rows, days = entry['rows'], entry['days']
+        roster[np.ix_(rows, days)] = entry['cells']
+        state = entry.get('state')
+        if state is not None:
+            old_actual, old_mask, old_counts = state
+            self.report.coverage_actual[days] = old_actual
+            self.report.cell_mask[rows] = old_mask
+            self.report.counts = old_counts
+        return self.total
+
+    def commit(self):
+        """쌓인 undo 로그를 비운다 (현재 상태 확정)."""
+        self._undo.clear()
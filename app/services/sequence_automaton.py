@@ -0,0 +1,156 @@
+"""
+근무 순서 규칙 오토마톤 인코딩 모듈
+- NurseRosterConfig 의 순서 규칙을 간호사별 결정적 유한 오토마톤(DFA)으로 컴파일해 CP-SAT AddAutomaton 으로 건다
+  · 하드: N→D 금지, (banned_day_after_eve) E→D·N→E 금지, 연속 근무 ≤ max_consecutive_work_days,
+          연속 야간 ≤ max_consecutive_nights, (two_offs_after_three/two_nig) N3/N2 이후 이틀 안에 OFF
+  · 소프트: N-O-D/E 패턴(nod_noe), 고립 OFF → 패턴이 완성되는 날의 라벨에 패널티 비트를 실어 오토마톤이 강제
+- 라벨 = 교대 index + S × (패턴 비트 + 2 × 고립 OFF 비트), 날짜별 라벨 IntVar 는 X(n,d,s) ⇒ lab == s + S·pat + 2S·iso 로 연결
+  (단일 선형 등식 Σ s·X 로 묶으면 presolve 가 값-리터럴 대응을 못 찾아 첫 가능해가 4배 이상 늦어짐)
+- 상태는 시작 상태에서 도달 가능한 것만 만들고 Moore 분할로 최소화 (규칙 조합별로 1회 컴파일 후 캐시)
+- 경계 의미는 기존 슬라이딩 윈도우 인코딩(_compile_full_model 의 linear 모드)과 동일:
+  근무 구간 [join, leave] 밖은 미배정, 구간 끝에서 미완료 의무(OFF 대기)는 허용
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+SEQUENCE_ENCODINGS = ('linear', 'automaton')
+
+_START = -1     # 근무 구간 시작 전 (OFF/N 이 아닌 것으로 취급)
+
+
+@dataclass(frozen=True)
+class SequenceRules:
+    """오토마톤으로 컴파일할 순서 규칙 (NurseRosterConfig 에서 추출)"""
+    num_shifts: int
+    day: int
+    eve: int
+    night: int
+    off: int
+    max_work: int
+    max_nights: int
+    ban_after_eve: bool
+    off_after_nights: Tuple[int, ...]   # 이 길이 이상 연속 N 이면 이틀 안에 OFF 필요
+    nod_noe: bool
+
+    @classmethod
+    def from_config(cls, cfg) -> "SequenceRules":
+        idx = {c: cfg.shift_types.index(c) for c in ('D', 'E', 'N', 'O')}
+        thresholds = tuple(t for t, on in ((3, cfg.two_offs_after_three_nig), (2, cfg.two_offs_after_two_nig)) if on)
+        return cls(
+            num_shifts=cfg.num_shifts, day=idx['D'], eve=idx['E'], night=idx['N'], off=idx['O'],
+            max_work=cfg.max_consecutive_work_days, max_nights=cfg.max_consecutive_nights,
+            ban_after_eve=bool(cfg.banned_day_after_eve), off_after_nights=thresholds,
+            nod_noe=bool(getattr(cfg, 'nod_noe', True)),
+        )
+
+
+@dataclass
+class SequenceAutomaton:
+    """컴파일된 DFA (상태 0 이 시작 상태, 모든 상태가 수락 상태)"""
+    rules: SequenceRules
+    num_states: int
+    transitions: List[Tuple[int, int, int]]     # (tail, label, head)
+    raw_states: int                              # 최소화 전 도달 가능 상태 수
+
+    @property
+    def final_states(self) -> List[int]:
+        return list(range(self.num_states))
+
+
+def _step(rules: SequenceRules, state, s: int) -> Optional[Tuple[tuple, bool, bool]]:
+    """state 에서 교대 s 를 읽었을 때 (다음 상태, 패턴 비트, 고립 OFF 비트). 하드 규칙 위반이면 None"""
+    p2, p1, work, nights, deadline = state
+    if s == rules.day and p1 == rules.night:
+        return None
+    if rules.ban_after_eve and ((s == rules.day and p1 == rules.eve) or (s == rules.eve and p1 == rules.night)):
+        return None
+
+    work = 0 if s == rules.off else work + 1
+    if work > rules.max_work:
+        return None
+    nights = nights + 1 if s == rules.night else 0
+    if nights > rules.max_nights:
+        return None
+
+    if deadline:
+        if s == rules.off:
+            deadline = 0
+        elif deadline == 1:
+            return None
+        else:
+            deadline -= 1
+    if s == rules.night and any(nights >= t for t in rules.off_after_nights):
+        deadline = min(deadline, 2) if deadline else 2
+
+    pattern = rules.nod_noe and p2 == rules.night and p1 == rules.off and s in (rules.day, rules.eve)
+    isolated_off = p1 == rules.off and p2 != rules.off and s != rules.off
+    return (p1, s, work, nights, deadline), pattern, isolated_off
+
+
+def _minimize(num_states: int, delta: Dict[Tuple[int, int], int], labels: List[int]) -> Tuple[List[int], int]:
+    """Moore 분할 정련: 상태 → 블록 번호 (블록 0 은 시작 상태 0 이 속한 블록)"""
+    block = [0] * num_states
+    count = 1
+    while True:
+        signatures: Dict[tuple, int] = {}
+        new_block = []
+        for q in range(num_states):
+            sig = (block[q],) + tuple(block[delta[q, a]] if (q, a) in delta else -1 for a in labels)
+            new_block.append(signatures.setdefault(sig, len(signatures)))
+        if len(signatures) == count:
+            return new_block, count
+        block, count = new_block, len(signatures)
+
+
+@lru_cache(maxsize=32)
+def compile_sequence_automaton(rules: SequenceRules) -> SequenceAutomaton:
+    """규칙 → 최소 DFA"""
+    start = (_START, _START, 0, 0, 0)
+    index = {start: 0}
+    queue = [start]
+    delta: Dict[Tuple[int, int], int] = {}
+    i = 0
+    while i < len(queue):
+        state = queue[i]; i += 1
+        q = index[state]
+        for s in range(rules.num_shifts):
+            step = _step(rules, state, s)
+            if step is None:
+                continue
+            nxt, pattern, isolated_off = step
+            if nxt not in index:
+                index[nxt] = len(queue); queue.append(nxt)
+            label = s + rules.num_shifts * (int(pattern) + 2 * int(isolated_off))
+            delta[q, label] = index[nxt]
+
+    labels = sorted({a for _, a in delta})
+    block, num_blocks = _minimize(len(queue), delta, labels)
+    transitions = sorted({(block[q], a, block[h]) for (q, a), h in delta.items()})
+    return SequenceAutomaton(rules=rules, num_states=num_blocks, transitions=transitions, raw_states=len(queue))
+
+
+def add_sequence_automaton(m, X, n: int, T0: int, T1: int, automaton: SequenceAutomaton):
+    """간호사 n 의 [T0, T1] 구간에 오토마톤 제약을 걸고 (패턴 비트 목록, 고립 OFF 비트 목록)을 반환
+
+    반환 목록의 k 번째 원소는 T0 + k 일에 완성된 패턴의 패널티 비트 (목적식 반영은 호출자가 결정)
+    """
+    if T1 < T0:
+        return [], []
+    rules = automaton.rules
+    S = rules.num_shifts
+    labels, patterns, isolated = [], [], []
+    for d in range(T0, T1 + 1):
+        pat = m.NewBoolVar(f'seqPat_{n}_{d}')
+        iso = m.NewBoolVar(f'seqIso_{n}_{d}')
+        lab = m.NewIntVar(0, 4 * S - 1, f'seqLab_{n}_{d}')
+        for s in range(S):
+            x = X(n, d, s)
+            if isinstance(x, int):
+                if x:   # 고정/단일 허용 셀
+                    m.Add(lab == s + S * pat + 2 * S * iso)
+                continue
+            m.Add(lab == s + S * pat + 2 * S * iso).OnlyEnforceIf(x)
+        labels.append(lab); patterns.append(pat); isolated.append(iso)
+    m.AddAutomaton(labels, 0, automaton.final_states, automaton.transitions)
+    return patterns, isolated
@@ -0,0 +1,108 @@
+"""
+근무 순서 규칙 인코딩 벤치마크 (linear 슬라이딩 윈도우 vs automaton)
+- 20/50/100명 병동을 임의 선호 행렬로 만들고, 같은 입력으로 두 인코딩의 전체 모델을 컴파일해
+  모델 크기(변수/제약/프로토 바이트), 컴파일 시간, presolve 시간, 첫 가능해까지 시간을 비교
+- 실행: app 디렉터리에서 `python -m services.sequence_encoding_benchmark [첫가능해 제한초]`
+"""
+import os
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from datetime import date
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from db.nurse_config import Nurse
+from db.roster_config import NurseRosterConfig
+from services.roster_system import RosterSystem
+from services.cp_sat_basic import _compile_full_model
+from services.sequence_automaton import SEQUENCE_ENCODINGS, SequenceRules, compile_sequence_automaton
+
+WARD_SIZES = (20, 50, 100)
+NUM_WORKERS = 8
+
+
+class _FirstSolution(cp_model.CpSolverSolutionCallback):
+    """첫 해를 받은 시각을 기록하고 탐색 중단"""
+
+    def __init__(self):
+        super().__init__()
+        self.wall = None
+
+    def on_solution_callback(self):
+        if self.wall is None:
+            self.wall = self.WallTime()
+        self.StopSearch()
+
+    OnSolutionCallback = on_solution_callback
+
+
+def _make_system(num_nurses: int, encoding: str, seed: int = 0) -> RosterSystem:
+    """인원에 비례한 요구치, 야간 전담/수간호사 일부, 임의 휴무·근무 선호를 가진 RosterSystem"""
+    rng = np.random.default_rng(seed)
+    config = NurseRosterConfig(
+        daily_shift_requirements={'D': max(2, num_nurses // 6), 'E': max(2, num_nurses // 6), 'N': max(1, num_nurses // 8)},
+        two_offs_after_three_nig=True, sequence_encoding=encoding,
+    )
+    nurses = [Nurse(id=i, name=f"간호사{i}", experience_years=float(i % 12), db_id=f"N{i:03d}",
+                    is_night_nurse=3 if i % 15 == 14 else 0, is_head_nurse=(i == 0))
+              for i in range(num_nurses)]
+    rs = RosterSystem(nurses, target_month=date(2025, 3, 1), config=config)
+    off_idx = config.shift_types.index('O')
+    wishes = rng.random((num_nurses, rs.num_days)) < 0.12
+    rs.preference_matrix[wishes, off_idx] = 10.0 + rng.random(int(wishes.sum())) * 3
+    return rs
+
+
+def _model_size(m: cp_model.CpModel) -> dict:
+    proto = m.Proto()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "model.pb")
+        m.ExportToFile(path)
+        size = os.path.getsize(path)
+    return {"vars": len(proto.variables), "constraints": len(proto.constraints), "bytes": size}
+
+
+def _presolve_seconds(m: cp_model.CpModel) -> float:
+    solver = cp_model.CpSolver()
+    solver.parameters.stop_after_presolve = True
+    solver.parameters.num_search_workers = NUM_WORKERS
+    t0 = time.perf_counter()
+    solver.Solve(m)
+    return time.perf_counter() - t0
+
+
+def _first_feasible_seconds(m: cp_model.CpModel, time_limit: float):
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    solver.parameters.num_search_workers = NUM_WORKERS
+    solver.parameters.random_seed = 7
+    callback = _FirstSolution()
+    solver.Solve(m, callback)
+    return callback.wall
+
+
+def run_benchmark(time_limit: float = 60.0):
+    rules = SequenceRules.from_config(replace(NurseRosterConfig(), two_offs_after_three_nig=True))
+    automaton = compile_sequence_automaton(rules)
+    print(f"오토마톤: 도달 상태 {automaton.raw_states} → 최소화 {automaton.num_states}, 전이 {len(automaton.transitions)}")
+    print(f"\n{'nurses':>6} {'encoding':>10} {'vars':>7} {'cons':>7} {'KB':>8} "
+          f"{'build(s)':>9} {'presolve(s)':>12} {'first(s)':>9}")
+    for size in WARD_SIZES:
+        for encoding in SEQUENCE_ENCODINGS:
+            rs = _make_system(size, encoding, seed=size)
+            t0 = time.perf_counter()
+            m = _compile_full_model(rs, grouped=None)[0]
+            build = time.perf_counter() - t0
+            info = _model_size(m)
+            presolve = _presolve_seconds(m)
+            first = _first_feasible_seconds(m, time_limit)
+            first_txt = f"{first:>9.2f}" if first is not None else f"{'>' + str(int(time_limit)):>9}"
+            print(f"{size:>6} {encoding:>10} {info['vars']:>7} {info['constraints']:>7} {info['bytes'] / 1024:>8.1f} "
+                  f"{build:>9.2f} {presolve:>12.2f} {first_txt}")
+
+
+if __name__ == "__main__":
+    run_benchmark(*[float(a) for a in sys.argv[1:2]])
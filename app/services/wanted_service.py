@@ -3,14 +3,22 @@ Wanted(근무 희망 요청) 관련 서비스 로직 모듈
 - DB 쿼리, 데이터 가공 등 라우터에서 분리
 - 모든 함수는 한글 docstring, 한글 print/logging, PEP8 스타일 적용
 """
+import asyncio
+import time
+from sqlalchemy import insert, select, func, literal, tuple_
 from sqlalchemy.orm import Session
 from db.models import Wanted, Nurse, ShiftPreference
-from schemas.roster_schema import WantedInvokeRequest, WantedDeadlineRequest
+from schemas.roster_schema import WantedInvokeRequest, WantedDeadlineRequest, NurseProfile
 from schemas.auth_schema import User as UserSchema
 from datetime import datetime, date
 from typing import Dict, Any, List, Tuple
 from db.models import WantedRequest, NurseShiftRequest, NursePairRequest
 from services.graph_service import graph_service
+from agents.llm_cache import normalize_request_text
+
+BATCH_ANALYZE_CONCURRENCY = 8       # 일괄 분석 시 동시에 실행할 그래프 수
+BATCH_INSERT_CHUNK = 1000           # executemany 한 번에 넣을 행 수
+_PLACEHOLDER_REQUESTS = {'캘린더 선택', '기존 데이터 업데이트', '기존 데이터에서 로드됨'}
 
 
 def _yyyymm(year: int, month: int) -> str:
@@ -106,32 +114,44 @@ def _persist_wanted_request(db: Session, nurse_id: str, month_str: str, request:
     return request_id
 
 
-def _next_detailed_request_id(db: Session, nurse_id: str, request_id: int, *, table: str) -> int:
-    """해당 (nurse_id, request_id) 범위에서 다음 detailed_request_id 를 생성합니다.
+_DETAIL_MODELS = {"shift": NurseShiftRequest, "pair": NursePairRequest}
+
+
+def _detail_model(table: str):
+    model = _DETAIL_MODELS.get(table)
+    if model is None:
+        raise ValueError("table 인자는 'shift' 또는 'pair' 여야 합니다.")
+    return model
+
+
+def _allocate_detailed_request_ids(db: Session, nurse_id: str, request_id: int, count: int, *, table: str) -> int:
+    """해당 (nurse_id, request_id) 범위에서 count 개의 연속된 detailed_request_id 를 한 번에 할당합니다.
 
     인자:
         db: DB 세션
         nurse_id: 간호사 ID (문자열)
         request_id: 상위 요청 식별자
+        count: 필요한 ID 개수
         table: 'shift' 또는 'pair'
 
     반환:
-        다음 detailed_request_id (최초면 1)
+        할당 범위의 시작 ID (기존 MAX + 1, 최초면 1) → [start, start + count) 사용
     """
-    if table == "shift":
-        q = db.query(NurseShiftRequest.detailed_request_id).filter(
-            NurseShiftRequest.nurse_id == nurse_id,
-            NurseShiftRequest.request_id == request_id,
-        )
-    elif table == "pair":
-        q = db.query(NursePairRequest.detailed_request_id).filter(
-            NursePairRequest.nurse_id == nurse_id,
-            NursePairRequest.request_id == request_id,
+    model = _detail_model(table)
+    current = db.execute(
+        select(func.max(model.detailed_request_id)).where(
+            model.nurse_id == nurse_id,
+            model.request_id == request_id,
         )
-    else:
-        raise ValueError("table 인자는 'shift' 또는 'pair' 여야 합니다.")
-    row = q.order_by((NurseShiftRequest.detailed_request_id if table == "shift" else NursePairRequest.detailed_request_id).desc()).first()
-    return (row[0] + 1) if row else 1
+    ).scalar()
+    return (current or 0) + 1
+
+
+def _bulk_insert(db: Session, model, rows: List[Dict[str, Any]], chunk_size: int = BATCH_INSERT_CHUNK) -> int:
+    """rows 를 chunk_size 단위 executemany INSERT 로 저장합니다 (커밋은 호출자가 수행)."""
+    for start in range(0, len(rows), chunk_size):
+        db.execute(insert(model), rows[start:start + chunk_size])
+    return len(rows)
 
 
 def _persist_shift_results(
@@ -152,32 +172,33 @@ def _persist_shift_results(
         shift_map: {'D': {12: {'score': 2.5, 'request': '...'}}, ...}
     
     Notes:
-        detailed_request_id는 기존 데이터 다음 순번부터 시작
+        detailed_request_id는 기존 데이터 다음 순번부터 한 번에 범위 할당 후 executemany 로 저장
     """
-    # detailed_request_id 는 (nurse_id, request_id) 내에서 기존 데이터 다음부터 증가
-    detailed_id = _next_detailed_request_id(db, nurse_id, request_id, table="shift")
-    rows = 0
-    print(f'shift_map (저장 시작, detailed_id={detailed_id}): {shift_map}')
+    items = [
+        (shift_code, day, info)
+        for shift_code, by_day in (shift_map or {}).items()
+        for day, info in (by_day or {}).items()
+    ]
+    print(f'shift_map (저장 시작, {len(items)}건): {shift_map}')
+    if not items:
+        return
     try:
-        for shift_code, by_day in (shift_map or {}).items():
-            for day, info in (by_day or {}).items():
-                score = info.get("score")
-                partial_request = info.get("request")
-                row = NurseShiftRequest(
-                    nurse_id=nurse_id,
-                    request_id=request_id,
-                    detailed_request_id=detailed_id,
-                    shift_date=_ymd(year, month, int(day)),
-                    shift=shift_code,
-                    score=float(score),
-                    partial_request=partial_request,
-                )
-                db.merge(row)
-                rows += 1
-                detailed_id += 1
-        
+        start_id = _allocate_detailed_request_ids(db, nurse_id, request_id, len(items), table="shift")
+        rows = [
+            {
+                "nurse_id": nurse_id,
+                "request_id": request_id,
+                "detailed_request_id": start_id + i,
+                "shift_date": _ymd(year, month, int(day)),
+                "shift": shift_code,
+                "score": float(info.get("score")),
+                "partial_request": info.get("request"),
+            }
+            for i, (shift_code, day, info) in enumerate(items)
+        ]
+        _bulk_insert(db, NurseShiftRequest, rows)
         db.commit()
-        print(f"nurse_shift_requests 저장 완료: 시작 detailed_request_id={detailed_id - rows}, 종료={detailed_id - 1}, 저장 rows={rows}")
+        print(f"nurse_shift_requests 저장 완료: 시작 detailed_request_id={start_id}, 종료={start_id + len(rows) - 1}, 저장 rows={len(rows)}")
     except Exception as e:
         print(f"nurse_shift_requests 저장 오류: {e}")
         db.rollback()
@@ -198,10 +219,9 @@ def _persist_pair_results(
         pairs: [{"id": "12", "weight": -1.5, "request": "..."}, ...]
     
     Notes:
-        detailed_request_id는 기존 데이터 다음 순번부터 시작
+        detailed_request_id는 기존 데이터 다음 순번부터 한 번에 범위 할당 후 executemany 로 저장
     """
-    detailed_id = _next_detailed_request_id(db, nurse_id, request_id, table="pair")
-    rows = 0
+    items = []
     for item in pairs or []:
         try:
             target_id = item.get("id") if item.get("id") is not None else None
@@ -212,20 +232,23 @@ def _persist_pair_results(
             continue
         if target_id is None or weight is None:
             continue
-        row = NursePairRequest(
-            nurse_id=nurse_id,
-            request_id=request_id,
-            detailed_request_id=detailed_id,
-            target_id=target_id,
-            score=weight,
-            partial_request=request,
-        )
-        db.merge(row)
-        rows += 1
-        detailed_id += 1
-    
+        items.append((target_id, weight, request))
+    if not items:
+        return
+    start_id = _allocate_detailed_request_ids(db, nurse_id, request_id, len(items), table="pair")
+    _bulk_insert(db, NursePairRequest, [
+        {
+            "nurse_id": nurse_id,
+            "request_id": request_id,
+            "detailed_request_id": start_id + i,
+            "target_id": target_id,
+            "score": weight,
+            "partial_request": request,
+        }
+        for i, (target_id, weight, request) in enumerate(items)
+    ])
     db.commit()
-    print(f"nurse_pair_requests 저장 완료: 시작 detailed_request_id={detailed_id - rows}, 종료={detailed_id - 1}, 저장 rows={rows}")
+    print(f"nurse_pair_requests 저장 완료: 시작 detailed_request_id={start_id}, 종료={start_id + len(items) - 1}, 저장 rows={len(items)}")
 
 
 def _parse_shift_results(
@@ -362,74 +385,58 @@ def _copy_existing_requests_to_new(
         
     Notes:
         case_filter가 있으면 해당 (day, shift)만 복사 (캘린더에서 지운 항목 제외)
+        shift/pair 각각 INSERT ... SELECT 한 문장으로 복사하고, detailed_request_id 는
+        ROW_NUMBER() 로 기존 순서대로 1부터 다시 부여
     """
-    # 1. 기존 shift 데이터 복사
-    old_shift_rows = (
-        db.query(NurseShiftRequest)
-        .filter(
+    shift_cols = ["nurse_id", "request_id", "detailed_request_id", "shift_date", "shift", "score", "partial_request"]
+    pair_cols = ["nurse_id", "request_id", "detailed_request_id", "target_id", "score", "partial_request"]
+    shift_count = pair_count = 0
+    try:
+        # 1. 기존 shift 데이터 복사 (case_filter 는 (shift_date, shift) IN (...) 로 DB 에서 필터링)
+        shift_src = select(
+            literal(nurse_id),
+            literal(new_request_id),
+            func.row_number().over(order_by=(NurseShiftRequest.detailed_request_id, NurseShiftRequest.shift_date)),
+            NurseShiftRequest.shift_date,
+            NurseShiftRequest.shift,
+            NurseShiftRequest.score,
+            NurseShiftRequest.partial_request,
+        ).where(
             NurseShiftRequest.nurse_id == nurse_id,
             NurseShiftRequest.request_id == old_request_id,
         )
-        .all()
-    )
-    
-    shift_count = 0
-    detailed_id = 1
-    for old_row in old_shift_rows:
-        # case_filter가 있으면 필터링
+        keep = None
         if case_filter is not None:
-            day = int(str(old_row.shift_date).split('-')[2])
-            shift = old_row.shift
-            if (day, shift) not in case_filter:
-                print(f"필터링됨: {day}일 {shift} (case에 없음)")
-                continue
-        
-        new_row = NurseShiftRequest(
-            nurse_id=nurse_id,
-            request_id=new_request_id,
-            detailed_request_id=detailed_id,
-            shift_date=old_row.shift_date,
-            shift=old_row.shift,
-            score=old_row.score,
-            partial_request=old_row.partial_request,
-        )
-        print(f'new_row', new_row.__dict__)
-        db.merge(new_row)
-        shift_count += 1
-        detailed_id += 1
-    
-    if shift_count > 0:
-        db.commit()
-        print(f"기존 shift 데이터 복사 완료: {shift_count}건")
-    
-    # 2. 기존 pair 데이터 복사
-    old_pair_rows = (
-        db.query(NursePairRequest)
-        .filter(
+            keep = set()
+            for day, shift in case_filter:
+                try:
+                    keep.add((_ymd(year, month, int(day)), shift))
+                except (TypeError, ValueError):
+                    print(f"잘못된 case 날짜 제외: {day}일 {shift}")
+            shift_src = shift_src.where(tuple_(NurseShiftRequest.shift_date, NurseShiftRequest.shift).in_(keep))
+        if keep is None or keep:
+            shift_count = db.execute(insert(NurseShiftRequest).from_select(shift_cols, shift_src)).rowcount or 0
+        print(f"기존 shift 데이터 복사: {shift_count}건")
+
+        # 2. 기존 pair 데이터 복사
+        pair_src = select(
+            literal(nurse_id),
+            literal(new_request_id),
+            func.row_number().over(order_by=(NursePairRequest.detailed_request_id, NursePairRequest.target_id)),
+            NursePairRequest.target_id,
+            NursePairRequest.score,
+            func.coalesce(func.nullif(NursePairRequest.partial_request, ''), '기존 데이터에서 로드됨'),
+        ).where(
             NursePairRequest.nurse_id == nurse_id,
             NursePairRequest.request_id == old_request_id,
         )
-        .all()
-    )
-    print(f'old_pair_rows',old_pair_rows)
-    pair_count = 0
-    detailed_id = 1
-    for old_row in old_pair_rows:
-        new_row = NursePairRequest(
-            nurse_id=nurse_id,
-            request_id=new_request_id,
-            detailed_request_id=detailed_id,
-            target_id=old_row.target_id,
-            score=old_row.score,
-            partial_request=old_row.partial_request or '기존 데이터에서 로드됨',
-        )
-        db.merge(new_row)
-        pair_count += 1
-        detailed_id += 1
-    print(f'pair_count',pair_count)
-    if pair_count > 0:
+        pair_count = db.execute(insert(NursePairRequest).from_select(pair_cols, pair_src)).rowcount or 0
+        print(f"기존 pair 데이터 복사: {pair_count}건")
         db.commit()
-        print(f"기존 pair 데이터 복사 완료: {pair_count}건")
+    except Exception as e:
+        print(f"기존 데이터 복사 오류: {e}")
+        db.rollback()
+        raise e
     return shift_count, pair_count
 
 
@@ -608,6 +615,149 @@ async def invoke_and_persist_wanted_service(
     return result
 
 
+def _pending_wanted_requests(db: Session, nurse_ids: List[str], month_str: str) -> List[WantedRequest]:
+    """간호사별 최신 wanted_request 중 아직 분석 결과(shift/pair 행)가 없는 것만 반환합니다.
+
+    Notes:
+        캘린더 선택/기존 데이터 복사처럼 문장이 없는 요청과 빈 요청은 제외
+    """
+    if not nurse_ids:
+        return []
+    latest: Dict[str, WantedRequest] = {}
+    rows = (
+        db.query(WantedRequest)
+        .filter(WantedRequest.nurse_id.in_(nurse_ids), WantedRequest.month == month_str)
+        .all()
+    )
+    for wr in rows:
+        if wr.nurse_id not in latest or wr.request_id > latest[wr.nurse_id].request_id:
+            latest[wr.nurse_id] = wr
+    candidates = [wr for wr in latest.values()
+                  if (wr.request or '').strip() and wr.request.strip() not in _PLACEHOLDER_REQUESTS]
+    if not candidates:
+        return []
+
+    # 분석 결과가 이미 있는 (nurse_id, request_id) 를 한 번에 조회
+    keys = {(wr.nurse_id, wr.request_id) for wr in candidates}
+    analyzed = set()
+    for model in (NurseShiftRequest, NursePairRequest):
+        analyzed.update(
+            db.query(model.nurse_id, model.request_id)
+            .filter(model.nurse_id.in_([k[0] for k in keys]), model.request_id.in_({k[1] for k in keys}))
+            .distinct()
+            .all()
+        )
+    return [wr for wr in candidates if (wr.nurse_id, wr.request_id) not in analyzed]
+
+
+async def analyze_pending_wishes_batch_service(
+    group_id: str,
+    year: int,
+    month: int,
+    db: Session,
+    concurrency: int = BATCH_ANALYZE_CONCURRENCY,
+) -> Dict[str, Any]:
+    """병동(group) 전체의 미분석 근무 희망 요청을 한 번에 분석하고 저장합니다.
+
+    인자:
+        group_id: 병동(그룹) ID
+        year, month: 대상 연/월
+        db: DB 세션
+        concurrency: 동시에 실행할 그래프 수 상한
+
+    반환:
+        처리 요약 (요청 수, 고유 문장 수, LLM/규칙 처리 수, 저장 행 수, 실패 목록, 소요 시간)
+
+    Notes:
+        - 정규화 후 같은 요청 문장은 그래프를 한 번만 실행하고 결과를 공유
+        - 규칙 파서 fast path 와 LLM 응답 캐시는 graph_service 에서 그대로 적용
+        - 미분석 요청은 shift/pair 행이 없으므로 detailed_request_id 는 1부터 부여
+    """
+    t0 = time.perf_counter()
+    month_str = _yyyymm(year, month)
+    nurses = (
+        db.query(Nurse)
+        .filter(Nurse.group_id == group_id)
+        .order_by(Nurse.active.desc(), Nurse.sequence.asc(), Nurse.experience.desc(), Nurse.nurse_id.asc())
+        .all()
+    )
+    # /wanted/invoke 에서 프론트가 보내는 스키마(/nurses 응답)와 같은 형태 → 캐시 키도 동일
+    schema = [NurseProfile.model_validate(n).model_dump(mode="json") for n in nurses]
+    pending = _pending_wanted_requests(db, [n.nurse_id for n in nurses], month_str)
+
+    by_text: Dict[str, List[WantedRequest]] = {}
+    originals: Dict[str, str] = {}
+    for wr in pending:
+        key = normalize_request_text(wr.request)
+        by_text.setdefault(key, []).append(wr)
+        originals.setdefault(key, wr.request)
+    print(f"[wanted batch] {month_str} 미분석 요청 {len(pending)}건 → 고유 문장 {len(by_text)}건")
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    llm_before = graph_service.llm_requests
+
+    async def _analyze(text: str):
+        async with semaphore:
+            return await graph_service.invoke(text, schema, None, year, month)
+
+    keys = list(by_text)
+    responses = await asyncio.gather(*(_analyze(originals[k]) for k in keys), return_exceptions=True)
+
+    shift_rows: List[Dict[str, Any]] = []
+    pair_rows: List[Dict[str, Any]] = []
+    failed: List[Dict[str, Any]] = []
+    for key, response in zip(keys, responses):
+        if isinstance(response, BaseException):
+            print(f"[wanted batch] 분석 실패: {originals[key]!r} - {response}")
+            failed.extend({"nurse_id": wr.nurse_id, "request_id": wr.request_id, "error": str(response)}
+                          for wr in by_text[key])
+            continue
+        shift_parsed = _parse_shift_results(response)
+        pref_parsed = _parse_preferences(response, schema)
+        for wr in by_text[key]:
+            detailed_id = 1
+            for shift_code, by_day in shift_parsed.items():
+                for day, info in by_day.items():
+                    try:
+                        shift_date = _ymd(year, month, int(day))
+                    except (TypeError, ValueError):
+                        print(f"[wanted batch] 잘못된 날짜 제외: nurse_id={wr.nurse_id}, day={day}")
+                        continue
+                    shift_rows.append({
+                        "nurse_id": wr.nurse_id, "request_id": wr.request_id, "detailed_request_id": detailed_id,
+                        "shift_date": shift_date, "shift": shift_code, "score": float(info.get("score")),
+                        "partial_request": info.get("request"),
+                    })
+                    detailed_id += 1
+            for detailed_id, item in enumerate(pref_parsed, start=1):
+                pair_rows.append({
+                    "nurse_id": wr.nurse_id, "request_id": wr.request_id, "detailed_request_id": detailed_id,
+                    "target_id": item["id"], "score": item["weight"], "partial_request": item.get("request"),
+                })
+
+    try:
+        _bulk_insert(db, NurseShiftRequest, shift_rows)
+        _bulk_insert(db, NursePairRequest, pair_rows)
+        db.commit()
+    except Exception as e:
+        print(f"[wanted batch] 일괄 저장 오류: {e}")
+        db.rollback()
+        raise e
+
+    summary = {
+        "month": month_str,
+        "requests": len(pending),
+        "unique_texts": len(by_text),
+        "llm_calls": graph_service.llm_requests - llm_before,
+        "failed": failed,
+        "shift_rows": len(shift_rows),
+        "pair_rows": len(pair_rows),
+        "elapsed_seconds": round(time.perf_counter() - t0, 3),
+    }
+    print(f"[wanted batch] 완료: {summary}")
+    return summary
+
+
 def request_wanted_shifts_service(req: WantedDeadlineRequest, current_user, db: Session):
     """
     Wanted 작성 요청 생성 서비스 함수
@@ -0,0 +1,181 @@
+"""
+근무 희망 규칙 기반 파서 (LLM 그래프 앞단 fast path)
+- "9/9: D", "9/16 OFF", "9/1~9/3: O", "12일 N(3)", "주말 O", "공휴일은 OFF", "매주 수요일 E" 처럼
+  날짜/기간 + 근무코드(+점수)만으로 이루어진 줄은 LLM 없이 shift_result 로 바로 변환
+- 한 줄이라도 규칙으로 처리되지 않으면("꼭", "그 외엔", 사람 이름 등) 요청 전체를 LLM 으로 넘김
+  ("5/5: N\n그 외엔 E" 의 둘째 줄은 앞 줄 날짜를 알아야 "5/5 제외 나머지는 E" 로 해석되므로 줄 단위로 나누지 않는다)
+- 캘린더 case 입력도 그래프를 거치지 않고 query_analyzer/create_shift_analyzer 와 같은 결과로 변환
+- 주말/공휴일 날짜는 holiday_pack 기준 (일요일은 공휴일에도 포함, shift_analyzer 와 동일)
+"""
+import calendar
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from services.holiday_pack import get_weekends, get_korean_public_holidays
+
+DEFAULT_RULE_SCORE = 1.0        # 점수 미기재 시 (case 경로의 '단순 희망' 과 동일)
+MAX_RULE_SCORE = 5.0
+
+_SHIFT_WORDS = {
+    "off": "O", "오프": "O", "휴무": "O", "o": "O",
+    "이브닝": "E", "이브": "E", "e": "E",
+    "나이트": "N", "n": "N",
+    "데이": "D", "d": "D",
+}
+_SHIFT = r"(?P<shift>off|오프|휴무|이브닝|이브|나이트|데이|[deno])(?![a-z])"
+_DATE = r"(?:\d{4}-\d{1,2}-\d{1,2}|(?:\d{1,2}\s*(?:/|월)\s*)?\d{1,2}\s*일?)"
+_DATES = rf"(?P<dates>{_DATE}(?:\s*(?:,|~|·|및|와|과)\s*{_DATE})*)"
+_DOW = r"[월화수목금토일]요일"
+_PERIOD = rf"(?P<period>(?:매주\s*)?(?:주말|공휴일|휴일|평일|{_DOW})(?:\s*(?:,|/|·|및|과|와|이랑)\s*(?:주말|공휴일|휴일|평일|{_DOW}))*)"
+_TAIL = (r"\s*(?P<score>\(\s*\d+(?:\.\d+)?\s*\)|[:=]\s*\d+(?:\.\d+)?(?![/월일\d]))?"
+         r"(?:\s*(?:으로|로))?(?:\s*(?:근무|희망|줘|주세요|부탁해요|부탁드려요|부탁합니다|원해요))?")
+_ITEM = re.compile(
+    rf"(?:{_DATES}|{_PERIOD})\s*(?:은|는|엔|에는|에)?\s*[:：]?\s*{_SHIFT}{_TAIL}",
+    re.IGNORECASE,
+)
+_SEPARATORS = re.compile(r"^[\s,，;.·、]*$")
+_DOW_INDEX = {c: i for i, c in enumerate("월화수목금토일")}
+
+
+def _holiday_days(year: int, month: int) -> set:
+    days = {d.day for d in get_korean_public_holidays(year, month)}
+    days |= {d.day for d in get_weekends(year, month) if d.weekday() == 6}
+    return days
+
+
+def _period_days(period: str, year: int, month: int) -> Optional[List[int]]:
+    num_days = calendar.monthrange(year, month)[1]
+    weekends = {d.day for d in get_weekends(year, month)}
+    result = set()
+    for token in re.findall(rf"주말|공휴일|휴일|평일|{_DOW}", period):
+        if token == "주말":
+            result |= weekends
+        elif token in ("공휴일", "휴일"):
+            result |= _holiday_days(year, month)
+        elif token == "평일":
+            result |= set(range(1, num_days + 1)) - weekends - _holiday_days(year, month)
+        else:
+            wd = _DOW_INDEX[token[0]]
+            result |= {d for d in range(1, num_days + 1) if date(year, month, d).weekday() == wd}
+    return sorted(result) if result else None
+
+
+def _single_day(token: str, year: int, month: int) -> Optional[int]:
+    token = token.strip()
+    m = re.fullmatch(r"(\d{4})-(\d{1,2})-(\d{1,2})", token)
+    if m:
+        y, mo, d = map(int, m.groups())
+        return d if (y, mo) == (year, month) else None
+    m = re.fullmatch(r"(?:(\d{1,2})\s*(?:/|월)\s*)?(\d{1,2})\s*일?", token)
+    if not m:
+        return None
+    if m.group(1) is not None and int(m.group(1)) != month:
+        return None
+    return int(m.group(2))
+
+
+def _date_days(dates: str, year: int, month: int) -> Optional[List[int]]:
+    num_days = calendar.monthrange(year, month)[1]
+    days: List[int] = []
+    for part in re.split(r"\s*(?:,|·|및|와|과)\s*", dates.strip()):
+        bounds = [_single_day(p, year, month) for p in part.split("~")]
+        if any(b is None for b in bounds) or len(bounds) > 2:
+            return None
+        lo, hi = bounds[0], bounds[-1]
+        if not (1 <= lo <= hi <= num_days):
+            return None
+        days.extend(d for d in range(lo, hi + 1) if d not in days)
+    return days
+
+
+def _score(raw: Optional[str]) -> Optional[float]:
+    if not raw:
+        return DEFAULT_RULE_SCORE
+    value = float(re.sub(r"[^\d.]", "", raw))
+    return value if 0 <= value <= MAX_RULE_SCORE else None
+
+
+def parse_line(line: str, year: int, month: int) -> Optional[List[Dict]]:
+    """줄 전체가 구조화된 항목들로만 이루어졌으면 shift_result 항목 목록, 아니면 None"""
+    text = line.strip()
+    if not text:
+        return []
+    items, last = [], 0
+    for m in _ITEM.finditer(text):
+        if not _SEPARATORS.match(text[last:m.start()]):
+            return None
+        last = m.end()
+        days = (_date_days(m.group("dates"), year, month) if m.group("dates")
+                else _period_days(m.group("period"), year, month))
+        score = _score(m.group("score"))
+        if not days or score is None:
+            return None
+        items.append({
+            "shift": _SHIFT_WORDS[m.group("shift").lower()],
+            "date": days,
+            "score": [score] * len(days),
+            "request": [m.group(0).strip()] * len(days),
+        })
+    if not items or not _SEPARATORS.match(text[last:]):
+        return None
+    return items
+
+
+def split_request(request, year: int, month: int) -> Tuple[List[Dict], List[str]]:
+    """요청(문자열 또는 문자열 목록)을 (규칙 파싱된 shift_result 항목, LLM 으로 넘길 줄) 로 분리"""
+    lines = request if isinstance(request, list) else str(request or "").splitlines()
+    parsed, remainder = [], []
+    for raw in lines:
+        for line in re.split(r"[;\n]", str(raw or "")):
+            if not line.strip():
+                continue
+            items = parse_line(line, year, month)
+            if items is None:
+                remainder.append(line.strip())
+            else:
+                parsed.extend(items)
+    return parsed, remainder
+
+
+def fast_path_results(request, year: int, month: int) -> Optional[List[Dict]]:
+    """모든 줄이 규칙으로 파싱되면 shift_result 항목 목록, 하나라도 남으면 None (요청 전체를 LLM 으로)"""
+    parsed, remainder = split_request(request, year, month)
+    return None if remainder else parsed
+
+
+def case_to_shift_results(case: List[Dict]) -> List[Dict]:
+    """캘린더 case → shift_results (query_analyzer + create_shift_analyzer 의 case 경로와 동일한 결과)"""
+    groups: Dict[str, Dict[str, list]] = {}
+    for content in case:
+        # '기존 데이터에서 로드됨' 케이스는 제외 (기존 데이터 복사는 wanted_service에서 처리)
+        if content.get('reason') == '기존 데이터에서 로드됨':
+            continue
+        date_str = content['date']
+        if isinstance(date_str, str) and '-' in date_str:
+            day = int(date_str.split('-')[2])
+        else:
+            day = int(date_str)
+        group = groups.setdefault(content['shift'], {'date': [], 'score': [], 'request': []})
+        group['date'].append(day)
+        group['score'].append(1.0)
+        group['request'].append('단순 희망')
+    return [{'shift_result': [{'shift': shift, **data} for shift, data in groups.items()]}]
+
+
+if __name__ == "__main__":
+    # 샘플 요청 점검: python -m services.wish_rule_parser
+    samples = [
+        ("9/9: D\n9/16 OFF", 2025, 9, True),
+        ("9/1~9/3: O; 12일 N(3)", 2025, 9, True),
+        ("주말 O\n매주 수요일 E", 2025, 9, True),
+        ("9/9 꼭 D 부탁해요", 2025, 9, False),
+        # 일부 줄만 파싱되는 요청: 상대 표현("그 외엔")이 앞 줄 날짜에 의존하므로 전체가 LLM 으로 가야 함
+        ("5/5: N\n그 외엔 E", 2025, 5, False),
+    ]
+    for text, y, mo, expect_fast in samples:
+        parsed, remainder = split_request(text, y, mo)
+        result = fast_path_results(text, y, mo)
+        ok = (result is not None) == expect_fast
+        print(f"{'OK  ' if ok else 'FAIL'} {text!r}: 파싱 {len(parsed)}건, 남은 줄 {remainder}, "
+              f"{'규칙 파서' if result is not None else '전체 LLM'}")
@@ -19,6 +19,11 @@ from db.models import Nurse, RosterConfig
 from schemas.roster_schema import RosterRequest
 from schemas.auth_schema import User as UserSchema
 from services.roster_create_service import generate_roster_service
+from services import job_progress
+from services.job_service import (
+    update_job_status, is_cancel_requested, JobProgressWriter,
+    JOB_RUNNING, JOB_DONE, JOB_FAILED, JOB_CANCELLED,
+)
 
 # =========================================================
 # 사용자 로딩 함수
@@ -48,39 +53,56 @@ def load_current_user_by_account_id(db: Session, account_id: str) -> UserSchema:
     )
 
 # =========================================================
-# 핵심 워커 실행
+# 작업 상태 기록 (jobs 테이블 갱신 실패는 생성 자체를 막지 않음)
 # =========================================================
-def main():
-    job_json = os.getenv("JOB_JSON")
-    if not job_json:
-        print("[worker] JOB_JSON 환경변수가 없습니다", file=sys.stderr)
-        sys.exit(2)
-
+def _set_job_status(db: Session, job_id, status=None, **fields):
+    if not job_id:
+        return
     try:
-        payload = json.loads(job_json)
-    except json.JSONDecodeError:
-        print("[worker] JOB_JSON JSON 파싱 실패", file=sys.stderr)
-        sys.exit(2)
+        update_job_status(db, job_id, status, **fields)
+    except Exception as e:
+        db.rollback()
+        print(f"[worker] 작업 상태 기록 실패 job_id={job_id}: {e}", file=sys.stderr)
+
 
+# =========================================================
+# 핵심 워커 실행
+# =========================================================
+def run_job(payload: dict) -> int:
+    """
+    작업 1건 실행 (SQS 워커 main / 로컬 프로세스 풀 공용)
+    - 반환값: 0=완료, 1=실패, 2=입력 오류, 3=취소
+    """
     job_id   = payload.get("job_id")
     nurse_id  = payload.get("nurse_id")  # ⬅ account_id 로 사용한다고 가정
     params   = payload.get("params", {})
 
+    db: Session = SessionLocal()
     if not nurse_id:
         print("[worker] nurse_id(account_id) 값이 필요합니다", file=sys.stderr)
-        sys.exit(2)
+        _set_job_status(db, job_id, JOB_FAILED, message="nurse_id(account_id) 누락")
+        db.close()
+        return 2
 
     # params로 RosterRequest 구성 (모델 필드: year, month, config_id, preceptor_gauge 등)
     try:
         req = RosterRequest(**params)
     except Exception as e:
         print(f"[worker] RosterRequest 생성 오류: {e}", file=sys.stderr)
-        sys.exit(2)
+        _set_job_status(db, job_id, JOB_FAILED, message=f"요청 파라미터 오류: {e}")
+        db.close()
+        return 2
 
-    db: Session = SessionLocal()
+    writer = None
     try:
+        # 대기 중 취소된 작업은 실행하지 않음
+        if job_id and is_cancel_requested(db, job_id):
+            _set_job_status(db, job_id, JOB_CANCELLED, message="시작 전 취소됨")
+            return 3
+
         current_user = load_current_user_by_account_id(db, nurse_id)
         print(f"[worker] 작업 시작 job_id={job_id}, account_id={nurse_id}, req={req}")
+        _set_job_status(db, job_id, JOB_RUNNING, progress=0.0, message="근무표 생성 시작")
 
         # 사전 검사: 설정 존재 여부 확인 (없으면 서비스 내부에서 충돌 가능)
         latest_config = None
@@ -96,25 +118,64 @@ def main():
             )
         if not latest_config:
             print("[worker] RosterConfig가 존재하지 않습니다. 먼저 설정을 등록하거나 config_id를 전달하세요.", file=sys.stderr)
-            sys.exit(2)
+            _set_job_status(db, job_id, JOB_FAILED, message="RosterConfig 없음")
+            return 2
+
+        # 엔진 진행률/취소 확인을 jobs 테이블에 연결
+        if job_id:
+            writer = JobProgressWriter(job_id)
+            job_progress.set_reporter(writer, writer.should_stop,
+                                      incumbent_listener=writer.on_incumbent,
+                                      accept_checker=writer.accept_requested)
 
         # 핵심: 엔드포인트가 하던 것을 그대로 서비스로 호출
         roster_data = generate_roster_service(req, current_user, db)
 
-        # 필요하면 jobs 테이블에 DONE/요약 기록 (선택)
-        # update_job_status(db, job_id, "DONE", meta=...)
-
+        done_msg = "현재 해 수락으로 조기 완료" if writer and writer.accept_requested() else "근무표 생성 완료"
+        if writer:
+            # 남은 incumbent 를 DONE 이전에 기록해 스트림이 마지막 해를 놓치지 않도록
+            writer.close(); writer = None
+        _set_job_status(db, job_id, JOB_DONE, progress=1.0,
+                        schedule_id=roster_data.get("schedule_id"), message=done_msg)
         print(f"[worker] 작업 완료 job_id={job_id}; roster_nurses={len(roster_data.get('nurses', []))}")
-        sys.exit(0)
+        return 0
+
+    except job_progress.JobCancelled:
+        db.rollback()
+        print(f"[worker] 작업 취소 job_id={job_id}")
+        _set_job_status(db, job_id, JOB_CANCELLED, message="실행 중 취소됨")
+        return 3
 
-    except Exception:
+    except Exception as e:
         traceback.print_exc()
-        # update_job_status(db, job_id, "FAILED")  # 선택
-        sys.exit(1)
+        db.rollback()
+        _set_job_status(db, job_id, JOB_FAILED, message=f"근무표 생성 실패: {e}")
+        return 1
 
     finally:
+        job_progress.set_reporter(None)
+        if writer:
+            try:
+                writer.close()
+            except Exception as e:
+                print(f"[worker] 진행률 기록 종료 실패 job_id={job_id}: {e}", file=sys.stderr)
         db.close()
 
 
+def main():
+    job_json = os.getenv("JOB_JSON")
+    if not job_json:
+        print("[worker] JOB_JSON 환경변수가 없습니다", file=sys.stderr)
+        sys.exit(2)
+
+    try:
+        payload = json.loads(job_json)
+    except json.JSONDecodeError:
+        print("[worker] JOB_JSON JSON 파싱 실패", file=sys.stderr)
+        sys.exit(2)
+
+    sys.exit(run_job(payload))
+
+
 if __name__ == "__main__":
     main()